@@ -0,0 +1,71 @@
+"""
+Rollups of a tracking cube built from 100,000 journals over two years.
+
+    python benchmarks/bench_cube.py
+"""
+
+import datetime
+import random
+import time
+
+from xero_accounting_py.engines import TrackingCube
+from xero_accounting_py.types import models
+
+JOURNALS = 100_000
+REGIONS = [f"region-{n}" for n in range(8)]
+DEPARTMENTS = [f"dept-{n}" for n in range(12)]
+
+
+def _date(day: datetime.date) -> str:
+    return f"/Date({(day - datetime.date(1970, 1, 1)).days * 86400000}+0000)/"
+
+
+def journal(number: int, rng: random.Random) -> dict:
+    day = datetime.date(2023, 7, 1) + datetime.timedelta(days=rng.randint(0, 729))
+    amount = round(rng.uniform(10, 5000), 2)
+    tracking = [
+        {"TrackingCategoryID": "region", "TrackingOptionID": rng.choice(REGIONS)}
+    ]
+    if rng.random() < 0.7:
+        tracking.append(
+            {"TrackingCategoryID": "dept", "TrackingOptionID": rng.choice(DEPARTMENTS)}
+        )
+    return {
+        "JournalNumber": number,
+        "JournalDate": _date(day),
+        "JournalLines": [
+            {
+                "AccountID": f"a-{rng.randint(0, 59)}",
+                "AccountCode": str(200 + rng.randint(0, 59)),
+                "NetAmount": amount,
+                "TrackingCategories": tracking,
+            },
+            {"AccountID": "a-bank", "AccountCode": "090", "NetAmount": -amount},
+        ],
+    }
+
+
+def main() -> None:
+    models.Journals.model_rebuild(_types_namespace=models._types_namespace)
+    rng = random.Random(7)
+    journals = models.Journals.model_validate(
+        {"Journals": [journal(n, rng) for n in range(1, JOURNALS + 1)]}
+    ).journals
+    cube = TrackingCube()
+    started = time.perf_counter()
+    cube.apply(journals or [])
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"apply                  {elapsed:8.1f} ms ({len(cube)} rows)")
+    for by in (["account"], ["account", "month"], ["region", "dept"]):
+        started = time.perf_counter()
+        cube.rollup(by)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"{'rollup ' + ' x '.join(by):23s}{elapsed:8.1f} ms")
+    started = time.perf_counter()
+    cube.rollup(["account", "dept"], where={"region": ["region-3"]}, start="2024-07")
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"rollup filtered        {elapsed:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+A 12-month forecast of 5,000 repeating invoice templates, grouped three ways.
+
+    python benchmarks/bench_forecast.py
+"""
+
+import datetime
+import random
+import time
+
+from xero_accounting_py.engines import RepeatingForecast
+from xero_accounting_py.types import models
+
+TEMPLATES = 5_000
+
+
+def _date(day: datetime.date) -> str:
+    return f"/Date({(day - datetime.date(1970, 1, 1)).days * 86400000}+0000)/"
+
+
+def template(i: int) -> dict:
+    rng = random.Random(i)
+    weekly = rng.random() < 0.3
+    start = datetime.date(2024, 1, 1) + datetime.timedelta(days=rng.randint(0, 180))
+    return {
+        "RepeatingInvoiceID": f"00000000-0000-0000-0000-{i:012d}",
+        "Type": "ACCREC",
+        "Status": "AUTHORISED",
+        "Contact": {"ContactID": f"c-{i % 250}", "Name": f"Customer {i % 250}"},
+        "CurrencyCode": "NZD",
+        "Schedule": {
+            "Unit": "WEEKLY" if weekly else "MONTHLY",
+            "Period": rng.choice((1, 2)) if weekly else rng.choice((1, 1, 3, 12)),
+            "StartDate": _date(start),
+            "NextScheduledDate": _date(start + datetime.timedelta(days=180)),
+            "DueDate": 20,
+            "DueDateType": "OFFOLLOWINGMONTH",
+        },
+        "LineItems": [
+            {
+                "AccountCode": rng.choice(("200", "260", "270")),
+                "LineAmount": round(rng.uniform(10, 2000), 2),
+                "Tracking": [
+                    {"Name": "Region", "Option": rng.choice(("North", "South"))}
+                ],
+            }
+            for _ in range(4)
+        ],
+        "Total": 0.0,
+    }
+
+
+def main() -> None:
+    models.RepeatingInvoices.model_rebuild(_types_namespace=models._types_namespace)
+    templates = models.RepeatingInvoices.model_validate(
+        {"RepeatingInvoices": [template(i) for i in range(TEMPLATES)]}
+    ).repeating_invoices
+    forecast = RepeatingForecast()
+    started = time.perf_counter()
+    forecast.update(templates)
+    print(f"update          {(time.perf_counter() - started) * 1000:8.1f} ms")
+    start = datetime.date(2024, 7, 1)
+    for by in ("contact", "account", "tracking"):
+        started = time.perf_counter()
+        forecast.forecast(start, months=12, by=by)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"{'forecast ' + by:16s}{elapsed:8.1f} ms")
+    started = time.perf_counter()
+    occurrences = forecast.occurrences(start, datetime.date(2025, 7, 1))
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"occurrences     {elapsed:8.1f} ms ({len(occurrences)} invoices)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Response decoding and request body encoding on realistic payloads.
+
+Decoding compares the upstream path (`response.json()` into a freshly built
+pydantic wrapper model per call) with validating the bytes directly through
+a cached TypeAdapter. Encoding compares the JSON codecs on a bulk
+`params.Invoices` body.
+
+    python benchmarks/bench_json_codec.py
+"""
+
+import json
+import timeit
+import typing
+
+import payloads
+from make_api_request import from_encodable, to_encodable
+from xero_accounting_py.core import get_codec
+from xero_accounting_py.core.response import from_json
+from xero_accounting_py.types import models, params
+
+REPEAT = 5
+
+
+def per_call(fn: typing.Callable[[], typing.Any]) -> float:
+    fn()
+    return min(timeit.repeat(fn, number=1, repeat=REPEAT)) * 1000
+
+
+def main() -> None:
+    cases = [
+        ("Journals", models.Journals, payloads.journals(100)),
+        ("Invoices", models.Invoices, payloads.invoices(1000)),
+        ("ReportWithRows", models.ReportWithRows, payloads.report_with_rows()),
+    ]
+    print("decode               upstream    from_json")
+    for label, model, data in cases:
+        model.model_rebuild(_types_namespace=models._types_namespace)
+        raw = json.dumps(data).encode()
+        upstream = per_call(
+            lambda: from_encodable(data=json.loads(raw), load_with=model)
+        )
+        direct = per_call(lambda: from_json(content=raw, load_with=model))
+        print(f"{label:<18} {upstream:8.1f} ms {direct:8.1f} ms")
+
+    params._SerializerInvoices.model_rebuild(_types_namespace=params._types_namespace)
+    body = to_encodable(
+        item={
+            "invoices": [
+                {
+                    "type_": "ACCREC",
+                    "contact": {"contact_id": invoice["Contact"]["ContactID"]},
+                    "line_items": [
+                        {
+                            "description": line["Description"],
+                            "quantity": line["Quantity"],
+                            "unit_amount": line["UnitAmount"],
+                            "account_code": line["AccountCode"],
+                        }
+                        for line in invoice["LineItems"]
+                    ],
+                    "reference": invoice["Reference"],
+                }
+                for invoice in payloads.invoices(1000)["Invoices"]
+            ]
+        },
+        dump_with=params._SerializerInvoices,
+    )
+    print("encode")
+    for name in ("json", "orjson", "msgspec"):
+        try:
+            codec = get_codec(name)  # type: ignore[arg-type]
+        except ImportError:
+            print(f"{name:<18} not installed")
+            continue
+        print(f"{name:<18} {per_call(lambda: codec.dumps(body)):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Trial balances answered locally from 20,000 applied journals.
+
+    python benchmarks/bench_ledger.py
+"""
+
+import datetime
+import json
+import time
+
+import payloads
+from xero_accounting_py.engines import Ledger
+from xero_accounting_py.types import models
+
+JOURNALS = 20_000
+
+
+def main() -> None:
+    models.Journals.model_rebuild(_types_namespace=models._types_namespace)
+    journals = models.Journals.model_validate_json(
+        json.dumps(payloads.journals(JOURNALS))
+    ).journals
+
+    ledger = Ledger()
+    started = time.perf_counter()
+    ledger.apply(journals)
+    print(f"apply           {(time.perf_counter() - started) * 1000:8.1f} ms")
+
+    dates = [
+        datetime.date(2024, 1, 1) + datetime.timedelta(days=d) for d in range(0, 830, 7)
+    ]
+    ledger.balances(dates[0])  # builds the running-total index
+    started = time.perf_counter()
+    for as_at in dates:
+        ledger.balances(as_at)
+    elapsed = (time.perf_counter() - started) / len(dates)
+    print(f"balances        {elapsed * 1000:8.3f} ms per date")
+
+    started = time.perf_counter()
+    ledger.trial_balance(dates[-1], year_start=datetime.date(2026, 1, 1))
+    print(f"trial_balance   {(time.perf_counter() - started) * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
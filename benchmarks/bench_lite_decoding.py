@@ -0,0 +1,43 @@
+"""
+Memory and time of decoding a 1,000 invoice page into `models.Invoices`
+versus lite records.
+
+    python benchmarks/bench_lite_decoding.py
+"""
+
+import gc
+import time
+import tracemalloc
+import typing
+
+import payloads
+from xero_accounting_py.core import decode_lite
+from xero_accounting_py.types import models
+
+
+def measure(
+    label: str, decode: typing.Callable[[], typing.Any]
+) -> typing.Tuple[float, int]:
+    decode()  # warm up caches and generated record types
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = decode()
+    elapsed = time.perf_counter() - started
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    print(f"{label:<8} {elapsed * 1000:8.1f} ms {retained / 1024 / 1024:8.2f} MiB")
+    return elapsed, retained
+
+
+def main() -> None:
+    data = payloads.invoices(1000)
+    models.Invoices.model_rebuild(_types_namespace=models._types_namespace)
+    _, model_bytes = measure("model", lambda: models.Invoices.model_validate(data))
+    _, lite_bytes = measure("lite", lambda: decode_lite(data, models.Invoices))
+    print(f"lite records retain {1 - lite_bytes / model_bytes:.0%} less memory")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Decode time and retained memory of a 1,000 invoice page with and without a
+field projection.
+
+    python benchmarks/bench_projection.py
+"""
+
+import json
+import time
+import tracemalloc
+import typing
+
+import payloads
+from xero_accounting_py.core import projected_model
+from xero_accounting_py.types import models
+
+FIELDS = ["invoice_id", "invoice_number", "amount_due", "updated_date_utc"]
+
+
+def measure(label: str, decode: typing.Callable[[], typing.Any]) -> None:
+    decode()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = decode()
+    elapsed = time.perf_counter() - started
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    print(f"{label:<10} {elapsed * 1000:8.1f} ms {retained / 1024 / 1024:8.2f} MiB")
+
+
+def main() -> None:
+    raw = json.dumps(payloads.invoices(1000)).encode()
+    models.Invoices.model_rebuild(_types_namespace=models._types_namespace)
+    projection = projected_model(models.Invoices, FIELDS)
+    measure("full", lambda: models.Invoices.model_validate(json.loads(raw)))
+    measure("projected", lambda: projection.model_validate_json(raw))
+
+
+if __name__ == "__main__":
+    main()
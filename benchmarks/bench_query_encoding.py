@@ -0,0 +1,52 @@
+"""
+Per-call overhead of `InvoicesClient.list` request building with the
+upstream `to_encodable` versus the compiled, cached encoders. The transport
+answers 204 so response decoding is excluded.
+
+    python benchmarks/bench_query_encoding.py
+"""
+
+import timeit
+
+import httpx
+import make_api_request
+from xero_accounting_py import Client
+from xero_accounting_py.core import request as core_request
+from xero_accounting_py.resources.accounting.invoices import client as invoices_module
+
+CALLS = 2000
+
+
+def main() -> None:
+    client = Client(
+        oauth_token="API_TOKEN",
+        httpx_client=httpx.Client(
+            transport=httpx.MockTransport(lambda request: httpx.Response(204))
+        ),
+    )
+
+    def call() -> None:
+        client.accounting.invoices.list(
+            xero_tenant_id="YOUR_XERO_TENANT_ID",
+            i_ds=["00000000-0000-0000-0000-000000000001"],
+            statuses=["AUTHORISED", "PAID"],
+            include_archived=True,
+            summary_only=False,
+            order="UpdatedDateUTC ASC",
+            page=1,
+            page_size=100,
+            unitdp=4,
+        )
+
+    for label, encoder in (
+        ("upstream", make_api_request.to_encodable),
+        ("compiled", core_request.to_encodable),
+    ):
+        invoices_module.to_encodable = encoder  # type: ignore[attr-defined]
+        call()
+        per_call = timeit.timeit(call, number=CALLS) / CALLS
+        print(f"{label:<9} {per_call * 1e6:8.1f} us/call")
+
+
+if __name__ == "__main__":
+    main()
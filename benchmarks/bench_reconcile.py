@@ -0,0 +1,53 @@
+"""
+Matching 100,000 statement lines against 100,000 unreconciled records.
+
+    python benchmarks/bench_reconcile.py
+"""
+
+import datetime
+import random
+import time
+
+from xero_accounting_py.engines import ReconciliationMatcher, StatementLine
+from xero_accounting_py.engines.reconcile import Candidate, tokens
+
+RECORDS = 100_000
+START = datetime.date(2024, 1, 1).toordinal()
+
+
+def main() -> None:
+    rng = random.Random(0)
+    matcher = ReconciliationMatcher()
+    lines = []
+    for i in range(RECORDS):
+        amount = rng.randint(1, 500) * 100 * rng.choice((1, -1))
+        day = START + rng.randint(0, 365)
+        payee = f"Customer {rng.randint(0, 2000)}"
+        matcher.candidates[("bank_transaction", str(i))] = Candidate(
+            kind="bank_transaction",
+            record_id=str(i),
+            date=day,
+            amount=amount,
+            contact_id="",
+            tokens=tokens(f"REF-{i}", payee),
+        )
+        lines.append(
+            StatementLine(
+                line_id=str(i),
+                date=datetime.date.fromordinal(day + rng.randint(-3, 3)),
+                amount=amount,
+                reference=f"REF {i}",
+                payee=payee.upper(),
+            )
+        )
+
+    started = time.perf_counter()
+    matches = matcher.propose(lines)
+    elapsed = time.perf_counter() - started
+    correct = sum(m.line.line_id == m.candidate.record_id for m in matches)
+    print(f"propose         {elapsed:8.2f} s for {len(lines)} lines")
+    print(f"matched         {len(matches):8d} ({correct} to the right record)")
+
+
+if __name__ == "__main__":
+    main()
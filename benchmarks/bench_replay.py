@@ -0,0 +1,71 @@
+"""
+End-to-end `invoices.list` over a replayed cassette, so SDK changes can be
+compared on the same responses without network access.
+
+    python benchmarks/bench_replay.py [CASSETTE]
+
+Without a cassette, one with five 1,000 invoice pages is recorded from
+synthetic payloads first. Record a real one by wrapping the default
+transport in `RecordingTransport`.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+import httpx
+import payloads
+from xero_accounting_py import Client
+from xero_accounting_py.core import RecordingTransport, ReplayTransport
+
+PAGES = 5
+ROUNDS = 5
+
+
+def record(path: str) -> None:
+    pages = {
+        str(page): json.dumps(payloads.invoices(1000)).encode()
+        for page in range(1, PAGES + 1)
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            content=pages[request.url.params["page"]],
+            headers={"content-type": "application/json"},
+        )
+
+    with httpx.Client(
+        transport=RecordingTransport(path, httpx.MockTransport(handler))
+    ) as http:
+        client = Client(oauth_token="TOKEN", httpx_client=http)
+        for page in range(1, PAGES + 1):
+            client.accounting.invoices.list(xero_tenant_id="TENANT", page=page)
+
+
+def main() -> None:
+    if len(sys.argv) > 1:
+        path = sys.argv[1]
+    else:
+        path = os.path.join(tempfile.mkdtemp(), "invoices.cassette.gz")
+        record(path)
+    print(f"cassette        {os.path.getsize(path) / 1024:8.1f} KiB")
+    client = Client(httpx_client=httpx.Client(transport=ReplayTransport(path)))
+    for decode in ("model", "lite"):
+        best = float("inf")
+        for _ in range(ROUNDS):
+            started = time.perf_counter()
+            for page in range(1, PAGES + 1):
+                client.accounting.invoices.list(
+                    xero_tenant_id="TENANT",
+                    page=page,
+                    request_options={"decode": decode},
+                )
+            best = min(best, time.perf_counter() - started)
+        print(f"list ({decode:<5})    {best * 1000 / PAGES:8.1f} ms per page")
+
+
+if __name__ == "__main__":
+    main()
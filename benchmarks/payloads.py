@@ -0,0 +1,196 @@
+"""
+Synthetic but realistically shaped Xero payloads shared by the benchmarks.
+"""
+
+import random
+import typing
+
+
+def invoice(i: int, *, line_items: int = 4) -> typing.Dict[str, typing.Any]:
+    rng = random.Random(i)
+    lines = [
+        {
+            "LineItemID": f"00000000-0000-0000-{i:04d}-{n:012d}",
+            "Description": f"Consulting services, block {n}",
+            "Quantity": float(rng.randint(1, 10)),
+            "UnitAmount": round(rng.uniform(10, 500), 2),
+            "AccountCode": "200",
+            "TaxType": "OUTPUT2",
+            "TaxAmount": round(rng.uniform(1, 50), 2),
+            "LineAmount": round(rng.uniform(10, 5000), 2),
+            "Tracking": [
+                {
+                    "TrackingCategoryID": "e2f2f732-e92a-4f3a-9c4d-ee4da0182a13",
+                    "Name": "Region",
+                    "Option": rng.choice(["North", "South", "East", "West"]),
+                }
+            ],
+        }
+        for n in range(line_items)
+    ]
+    total = round(sum(line["LineAmount"] for line in lines), 2)
+    return {
+        "Type": "ACCREC",
+        "InvoiceID": f"00000000-0000-0000-0000-{i:012d}",
+        "InvoiceNumber": f"INV-{i:06d}",
+        "Reference": f"PO-{rng.randint(1000, 9999)}",
+        "Contact": {
+            "ContactID": f"c0000000-0000-0000-0000-{i % 250:012d}",
+            "Name": f"Customer {i % 250}",
+            "ContactStatus": "ACTIVE",
+            "EmailAddress": f"ap{i % 250}@example.com",
+            "HasValidationErrors": False,
+        },
+        "DateString": "2024-03-11T00:00:00",
+        "Date": "/Date(1710115200000+0000)/",
+        "DueDateString": "2024-04-10T00:00:00",
+        "DueDate": "/Date(1712707200000+0000)/",
+        "Status": "AUTHORISED",
+        "LineAmountTypes": "Exclusive",
+        "LineItems": lines,
+        "SubTotal": total,
+        "TotalTax": round(total * 0.15, 2),
+        "Total": round(total * 1.15, 2),
+        "AmountDue": round(total * 0.5, 2),
+        "AmountPaid": round(total * 0.65, 2),
+        "AmountCredited": 0.0,
+        "CurrencyCode": "NZD",
+        "CurrencyRate": 1.0,
+        "UpdatedDateUTC": f"/Date({1710115200000 + i * 1000}+0000)/",
+        "HasAttachments": True,
+        "Attachments": [
+            {
+                "AttachmentID": f"a0000000-0000-0000-0000-{i:012d}",
+                "FileName": "remittance.pdf",
+                "MimeType": "application/pdf",
+                "Url": f"https://api.xero.com/api.xro/2.0/Invoices/{i}/Attachments/remittance.pdf",
+                "ContentLength": 20480,
+            }
+        ],
+        "Payments": [
+            {
+                "PaymentID": f"p0000000-0000-0000-0000-{i:012d}",
+                "Date": "/Date(1710720000000+0000)/",
+                "Amount": round(total * 0.65, 2),
+                "Reference": "Direct credit",
+                "CurrencyRate": 1.0,
+                "HasAccount": False,
+                "HasValidationErrors": False,
+            }
+        ],
+    }
+
+
+def invoices(count: int = 1000) -> typing.Dict[str, typing.Any]:
+    return {
+        "Invoices": [invoice(i) for i in range(count)],
+        "pagination": {
+            "page": 1,
+            "pageSize": count,
+            "pageCount": 1,
+            "itemCount": count,
+        },
+    }
+
+
+ACCOUNTS = [
+    ("200", "Sales", "REVENUE"),
+    ("310", "Cost of Goods Sold", "DIRECTCOSTS"),
+    ("400", "Advertising", "OVERHEADS"),
+    ("610", "Accounts Receivable", "CURRENT"),
+    ("800", "Accounts Payable", "CURRLIAB"),
+    ("820", "GST", "CURRLIAB"),
+    ("090", "Business Bank Account", "BANK"),
+]
+
+
+def journal(i: int, *, lines: int = 3) -> typing.Dict[str, typing.Any]:
+    rng = random.Random(i)
+    amounts = [round(rng.uniform(10, 2000), 2) for _ in range(lines - 1)]
+    amounts.append(-round(sum(amounts), 2))
+    journal_lines = []
+    for n, amount in enumerate(amounts):
+        code, name, account_type = rng.choice(ACCOUNTS)
+        journal_lines.append(
+            {
+                "JournalLineID": f"l0000000-0000-0000-{i:04d}-{n:012d}",
+                "AccountID": f"a0000000-0000-0000-0000-{int(code):012d}",
+                "AccountCode": code,
+                "AccountType": account_type,
+                "AccountName": name,
+                "Description": "Invoice line",
+                "NetAmount": amount,
+                "GrossAmount": round(amount * 1.15, 2),
+                "TaxAmount": round(amount * 0.15, 2),
+                "TaxType": "OUTPUT2",
+                "TaxName": "GST on Income",
+                "TrackingCategories": [
+                    {
+                        "TrackingCategoryID": "e2f2f732-e92a-4f3a-9c4d-ee4da0182a13",
+                        "TrackingOptionID": f"o0000000-0000-0000-0000-{i % 4:012d}",
+                        "Name": "Region",
+                        "Option": ["North", "South", "East", "West"][i % 4],
+                    }
+                ],
+            }
+        )
+    return {
+        "JournalID": f"j0000000-0000-0000-0000-{i:012d}",
+        "JournalDate": f"/Date({1704067200000 + i * 3600000}+0000)/",
+        "JournalNumber": i + 1,
+        "CreatedDateUTC": f"/Date({1704067200000 + i * 3600000}+0000)/",
+        "Reference": f"INV-{i:06d}",
+        "SourceID": f"00000000-0000-0000-0000-{i:012d}",
+        "SourceType": "ACCREC",
+        "JournalLines": journal_lines,
+    }
+
+
+def journals(count: int = 100, *, offset: int = 0) -> typing.Dict[str, typing.Any]:
+    return {"Journals": [journal(offset + i) for i in range(count)]}
+
+
+def report_with_rows(accounts: int = 400) -> typing.Dict[str, typing.Any]:
+    rng = random.Random(accounts)
+
+    def cell(value: str, account_id: str) -> typing.Dict[str, typing.Any]:
+        return {
+            "Value": value,
+            "Attributes": [{"Value": account_id, "Id": "account"}],
+        }
+
+    rows = []
+    for n in range(accounts):
+        account_id = f"a0000000-0000-0000-0000-{n:012d}"
+        rows.append(
+            {
+                "RowType": "Row",
+                "Cells": [
+                    cell(f"Account {n}", account_id),
+                    *(
+                        cell(f"{rng.uniform(-5000, 5000):.2f}", account_id)
+                        for _ in range(12)
+                    ),
+                ],
+            }
+        )
+    return {
+        "Reports": [
+            {
+                "ReportID": "ProfitAndLoss",
+                "ReportName": "Profit and Loss",
+                "ReportType": "ProfitAndLoss",
+                "ReportTitles": ["Profit & Loss", "Demo Company", "2024"],
+                "ReportDate": "31 December 2024",
+                "UpdatedDateUTC": "/Date(1735603200000)/",
+                "Rows": [
+                    {
+                        "RowType": "Header",
+                        "Cells": [{"Value": ""}]
+                        + [{"Value": f"2024-{m:02d}"} for m in range(1, 13)],
+                    },
+                    {"RowType": "Section", "Title": "Income", "Rows": rows},
+                ],
+            }
+        ]
+    }
@@ -0,0 +1,36 @@
+"""
+Payload builders shared by the engine tests.
+"""
+
+import datetime
+import typing
+
+
+def xero_date(day: datetime.date) -> str:
+    """Formats a date the way the Accounting API serialises it"""
+    epoch = datetime.date(1970, 1, 1)
+    return f"/Date({(day - epoch).days * 86400000}+0000)/"
+
+
+def invoice(
+    invoice_id: str,
+    contact: typing.Dict[str, str],
+    *,
+    due: datetime.date,
+    amount_due: float,
+    issued: typing.Optional[datetime.date] = None,
+    **extra: typing.Any,
+) -> typing.Dict[str, typing.Any]:
+    """An authorised sales invoice, issued 30 days before it is due by default"""
+    return {
+        "InvoiceID": invoice_id,
+        "InvoiceNumber": f"INV-{invoice_id}",
+        "Type": "ACCREC",
+        "Status": "AUTHORISED",
+        "Contact": contact,
+        "CurrencyCode": "NZD",
+        "Date": xero_date(issued or due - datetime.timedelta(days=30)),
+        "DueDate": xero_date(due),
+        "AmountDue": amount_due,
+        **extra,
+    }
@@ -0,0 +1,75 @@
+import gzip
+import pathlib
+import time
+import typing
+
+import httpx
+import pytest
+
+from xero_accounting_py import AsyncClient, Client
+from xero_accounting_py.core import (
+    CassetteMissError,
+    RecordingTransport,
+    ReplayTransport,
+)
+
+TENANT = "7a2c4c1e-3f51-4f4b-9a3e-5b0d1c2e3f40"
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    time.sleep(0.02)
+    page = request.url.params.get("page", "1")
+    return httpx.Response(
+        200,
+        json={
+            "Invoices": [{"InvoiceNumber": f"INV-{page}"}],
+            "Echo": request.headers["xero-tenant-id"],
+        },
+    )
+
+
+def test_record_then_replay(tmp_path: pathlib.Path) -> None:
+    """Tests recording interactions to a cassette and serving them back.
+
+    Validates:
+    - The cassette is compressed and holds no tenant id or token
+    - Replayed responses match the recorded ones per request
+    - Recorded latency is reproduced on request
+    - Unrecorded requests raise CassetteMissError
+    """
+    path = str(tmp_path / "invoices.cassette.gz")
+    recorder = RecordingTransport(path, httpx.MockTransport(_handler))
+    with httpx.Client(transport=recorder) as http:
+        client = Client(oauth_token="SECRET_TOKEN", httpx_client=http)
+        for page in (1, 2):
+            client.accounting.invoices.list(xero_tenant_id=TENANT, page=page)
+
+    raw = pathlib.Path(path).read_bytes()
+    assert raw[:2] == b"\x1f\x8b"
+    text = gzip.decompress(raw).decode()
+    assert TENANT not in text and "SECRET_TOKEN" not in text
+
+    replay = ReplayTransport(path, latency="recorded")
+    client = Client(oauth_token="OTHER", httpx_client=httpx.Client(transport=replay))
+    started = time.perf_counter()
+    second = client.accounting.invoices.list(xero_tenant_id="other", page=2)
+    assert time.perf_counter() - started >= 0.02
+    assert second.invoices[0].invoice_number == "INV-2"
+    with pytest.raises(CassetteMissError):
+        client.accounting.invoices.list(xero_tenant_id="other", page=3)
+
+
+@pytest.mark.asyncio
+async def test_async_replay(tmp_path: pathlib.Path) -> None:
+    """Tests that an AsyncClient can record and replay cassettes."""
+    path = str(tmp_path / "invoices.cassette.gz")
+    recorder = RecordingTransport(path, httpx.MockTransport(_handler))
+    async with httpx.AsyncClient(transport=recorder) as http:
+        client = AsyncClient(oauth_token="SECRET_TOKEN", httpx_client=http)
+        await client.accounting.invoices.list(xero_tenant_id=TENANT)
+
+    client = AsyncClient(
+        httpx_client=httpx.AsyncClient(transport=ReplayTransport(path))
+    )
+    replayed: typing.Any = await client.accounting.invoices.list(xero_tenant_id="x")
+    assert replayed.invoices[0].invoice_number == "INV-1"
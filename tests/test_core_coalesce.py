@@ -0,0 +1,115 @@
+import asyncio
+import json
+import typing
+
+import httpx
+import pydantic
+import pytest
+
+from xero_accounting_py import ApiError, AsyncClient
+from xero_accounting_py.core import RecordValidationError
+
+
+def _transport(seen: typing.List[httpx.Request]) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        body = json.loads(request.content)
+        if request.url.path.endswith("/Invoices"):
+            invoices = []
+            for n, invoice in enumerate(body["Invoices"]):
+                echoed = dict(invoice, InvoiceID=f"inv-{n}")
+                if not invoice.get("Reference"):
+                    echoed["HasErrors"] = True
+                    echoed["ValidationErrors"] = [
+                        {"Message": "A reference is required"}
+                    ]
+                invoices.append(echoed)
+            return httpx.Response(200, json={"Invoices": invoices})
+        return httpx.Response(500, json={"Message": "boom"})
+
+    return httpx.MockTransport(handler)
+
+
+def _client(seen: typing.List[httpx.Request]) -> AsyncClient:
+    return AsyncClient(
+        oauth_token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=_transport(seen)),
+    )
+
+
+@pytest.mark.asyncio
+async def test_coalescer_batches_creates_per_tenant() -> None:
+    """Tests that single creates inside one window become one call per tenant.
+
+    Validates:
+    - Creates for the same tenant share one request sent with summarizeErrors=false
+    - Each caller receives the element at its own position
+    - Rejected records raise RecordValidationError with their validation errors
+    - A full buffer is sent without waiting for the window
+    """
+    seen: typing.List[httpx.Request] = []
+    coalescer = _client(seen).coalescer(window=0.01, max_batch=3)
+
+    def invoice(reference: str) -> typing.Dict[str, typing.Any]:
+        return {"type_": "ACCREC", "reference": reference}
+
+    results = await asyncio.gather(
+        coalescer.create_invoice(invoice("r-0"), xero_tenant_id="tenant-a"),
+        coalescer.create_invoice(invoice(""), xero_tenant_id="tenant-a"),
+        coalescer.create_invoice(invoice("r-2"), xero_tenant_id="tenant-b"),
+        return_exceptions=True,
+    )
+    assert results[0].reference == "r-0"
+    assert isinstance(results[1], RecordValidationError)
+    assert [e.message for e in results[1].validation_errors] == [
+        "A reference is required"
+    ]
+    assert results[2].reference == "r-2"
+    assert len(seen) == 2
+    assert all(r.url.params["summarizeErrors"] == "false" for r in seen)
+
+    seen.clear()
+    futures = [
+        coalescer.create_invoice(invoice(f"r-{n}"), xero_tenant_id="tenant-a")
+        for n in range(4)
+    ]
+    await coalescer.aclose()
+    assert [f.result().invoice_id for f in futures] == [
+        "inv-0",
+        "inv-1",
+        "inv-2",
+        "inv-0",
+    ]
+    assert [len(json.loads(r.content)["Invoices"]) for r in seen] == [3, 1]
+
+
+@pytest.mark.asyncio
+async def test_coalescer_request_failure_reaches_every_caller() -> None:
+    """Tests that a failed batched call is raised to each caller in the batch."""
+    seen: typing.List[httpx.Request] = []
+    coalescer = _client(seen).coalescer()
+    results = await asyncio.gather(
+        coalescer.create_contact({"name": "A"}, xero_tenant_id="tenant-a"),
+        coalescer.create_contact({"name": "B"}, xero_tenant_id="tenant-a"),
+        return_exceptions=True,
+    )
+    assert all(isinstance(r, ApiError) for r in results)
+    assert len(seen) == 1
+
+
+@pytest.mark.asyncio
+async def test_coalescer_malformed_record_fails_alone() -> None:
+    """Tests that a record which cannot be encoded only fails its own caller."""
+    seen: typing.List[httpx.Request] = []
+    coalescer = _client(seen).coalescer(window=0.01)
+    results = await asyncio.gather(
+        coalescer.create_invoice({"reference": "r-0"}, xero_tenant_id="tenant-a"),
+        coalescer.create_invoice(
+            {"reference": "r-1", "line_items": "not a list"}, xero_tenant_id="tenant-a"
+        ),
+        return_exceptions=True,
+    )
+    assert results[0].reference == "r-0"
+    assert isinstance(results[1], pydantic.ValidationError)
+    assert len(seen) == 1
+    assert [i["Reference"] for i in json.loads(seen[0].content)["Invoices"]] == ["r-0"]
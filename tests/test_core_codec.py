@@ -0,0 +1,88 @@
+import json
+import typing
+
+import httpx
+import pytest
+
+from xero_accounting_py import AsyncClient, Client
+from xero_accounting_py.core import JsonCodec, get_codec
+from xero_accounting_py.types import models
+
+
+class RecordingCodec(JsonCodec):
+    name = "recording"
+
+    def __init__(self) -> None:
+        self.dumped: typing.List[typing.Any] = []
+
+    def dumps(self, obj: typing.Any) -> bytes:
+        self.dumped.append(obj)
+        return super().dumps(obj)
+
+
+def _echo_transport(seen: typing.List[httpx.Request]) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        body = json.loads(request.content)
+        return httpx.Response(200, json={"Invoices": body["Invoices"]})
+
+    return httpx.MockTransport(handler)
+
+
+def test_get_codec_resolution() -> None:
+    """Tests codec resolution, including the standard library fallback."""
+    assert get_codec("json").name == "json"
+    codec = RecordingCodec()
+    assert get_codec(codec) is codec
+    with pytest.raises(ValueError):
+        get_codec("yaml")  # type: ignore[arg-type]
+    try:
+        import orjson  # noqa: F401
+
+        assert get_codec("auto").name == "orjson"
+    except ImportError:
+        assert get_codec("auto").name in ("msgspec", "json")
+
+
+def test_create_200_codec_body() -> None:
+    """Tests a PUT request to the /Invoices endpoint encoded with a custom codec.
+
+    Mode: Synchronous execution
+    """
+    seen: typing.List[httpx.Request] = []
+    codec = RecordingCodec()
+    client = Client(
+        oauth_token="API_TOKEN",
+        httpx_client=httpx.Client(transport=_echo_transport(seen)),
+        codec=codec,
+    )
+    response = client.accounting.invoices.create(
+        xero_tenant_id="YOUR_XERO_TENANT_ID",
+        invoices=[{"type_": "ACCREC", "reference": "Website Design"}],
+    )
+    assert codec.dumped == [
+        {"Invoices": [{"Type": "ACCREC", "Reference": "Website Design"}]}
+    ]
+    assert seen[0].headers["content-type"] == "application/json"
+    assert isinstance(response, models.Invoices)
+    assert response.invoices[0].reference == "Website Design"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("codec", ["json", "auto"])
+async def test_await_create_200_codec(codec: str) -> None:
+    """Tests a PUT request to the /Invoices endpoint with the builtin codecs.
+
+    Mode: Asynchronous execution
+    """
+    seen: typing.List[httpx.Request] = []
+    client = AsyncClient(
+        oauth_token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=_echo_transport(seen)),
+        codec=codec,  # type: ignore[arg-type]
+    )
+    response = await client.accounting.invoices.create(
+        xero_tenant_id="YOUR_XERO_TENANT_ID",
+        invoices=[{"type_": "ACCPAY", "reference": "Rent"}],
+    )
+    assert response.invoices[0].type_ == "ACCPAY"
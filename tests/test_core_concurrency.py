@@ -0,0 +1,86 @@
+import asyncio
+import typing
+
+import httpx
+import pytest
+
+from xero_accounting_py import ApiError, AsyncClient
+from xero_accounting_py.core import AdaptiveLimiter
+
+
+@pytest.mark.asyncio
+async def test_adaptive_limiter_increases_and_backs_off() -> None:
+    """Tests the AIMD window of a single limiter.
+
+    Validates:
+    - The window grows while in use, up to its maximum
+    - An overload halves the window once per burst of failures
+    - A latency spike against the baseline also shrinks the window
+    - A sustained slower latency becomes the baseline and the window regrows
+    """
+    limiter = AdaptiveLimiter(initial=2, max_limit=4)
+    for _ in range(10):
+        tokens = [await limiter.acquire() for _ in range(limiter.limit)]
+        for token in tokens:
+            limiter.release(token, latency=0.1)
+    assert limiter.limit == 4
+
+    tokens = [await limiter.acquire() for _ in range(4)]
+    for token in tokens:
+        limiter.release(token, overloaded=True)
+    assert limiter.limit == 2
+
+    tokens = [await limiter.acquire() for _ in range(2)]
+    limiter.release(tokens[0], latency=0.1)
+    limiter.release(tokens[1], latency=1.0)
+    assert limiter.limit == 1
+    assert limiter.in_flight == 0
+
+    for _ in range(30):
+        tokens = [await limiter.acquire() for _ in range(limiter.limit)]
+        for token in tokens:
+            limiter.release(token, latency=1.0)
+    assert limiter.limit == 4
+
+
+@pytest.mark.asyncio
+async def test_client_limits_in_flight_per_tenant() -> None:
+    """Tests adaptive concurrency on an AsyncClient.
+
+    Validates:
+    - Requests in flight never exceed the current limit of their tenant
+    - 429 responses shrink only the limit of the tenant that received them
+    - The current limits are exposed per service and tenant
+    """
+    active: typing.Dict[str, int] = {"tenant-a": 0, "tenant-b": 0}
+    peak: typing.Dict[str, int] = {"tenant-a": 0, "tenant-b": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        tenant = request.headers["xero-tenant-id"]
+        active[tenant] += 1
+        peak[tenant] = max(peak[tenant], active[tenant])
+        await asyncio.sleep(0.001)
+        active[tenant] -= 1
+        if tenant == "tenant-b":
+            return httpx.Response(429, json={"Message": "rate limited"})
+        return httpx.Response(200, json={"Contacts": []})
+
+    client = AsyncClient(
+        oauth_token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        adaptive_concurrency=True,
+    )
+    results = await asyncio.gather(
+        *(
+            client.accounting.contacts.list(xero_tenant_id=tenant)
+            for tenant in ["tenant-a", "tenant-b"] * 20
+        ),
+        return_exceptions=True,
+    )
+    assert sum(isinstance(r, ApiError) for r in results) == 20
+    assert client.concurrency is not None
+    limits = client.concurrency.limits()
+    assert limits[("accounting", "tenant-b")] == 1
+    assert limits[("accounting", "tenant-a")] == 5
+    assert peak["tenant-a"] <= 5
+    assert peak["tenant-b"] <= 2
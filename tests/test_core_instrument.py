@@ -0,0 +1,77 @@
+import typing
+
+import httpx
+import pytest
+
+from xero_accounting_py import ApiError, AsyncClient, Client
+from xero_accounting_py.core import RequestMetrics
+
+INVOICE_ID = "0032517c-0b4e-4e5d-9b1e-27b8a2b3c1f0"
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path.endswith("/Contacts"):
+        return httpx.Response(400, json={"Message": "bad request"})
+    return httpx.Response(
+        200, json={"Invoices": [{"InvoiceID": INVOICE_ID, "Total": 10.0}]}
+    )
+
+
+def test_hooks_receive_phase_timings() -> None:
+    """Tests the metrics reported for each request of a synchronous client.
+
+    Validates:
+    - Each request reports its method, path template, tenant and status
+    - Encode, ttfb, download and validate phases are timed
+    - Lite decoding is split into decode and validate
+    - Failed requests report the error type
+    """
+    reported: typing.List[RequestMetrics] = []
+    client = Client(
+        oauth_token="API_TOKEN",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(_handler)),
+        hooks=[reported.append],
+    )
+    invoices = client.accounting.invoices.get(
+        xero_tenant_id="tenant-a", invoice_id=INVOICE_ID
+    )
+    assert invoices.invoices[0].invoice_id == INVOICE_ID
+    client.accounting.invoices.list(
+        xero_tenant_id="tenant-a", request_options={"decode": "lite"}
+    )
+    with pytest.raises(ApiError):
+        client.accounting.contacts.list(xero_tenant_id="tenant-b")
+
+    get, lite, failed = reported
+    assert (get.method, get.path, get.service_name) == (
+        "GET",
+        "/Invoices/{id}",
+        "accounting",
+    )
+    assert (get.xero_tenant_id, get.status_code, get.error) == ("tenant-a", 200, None)
+    assert get.response_bytes == len(
+        b'{"Invoices":[{"InvoiceID":"%s","Total":10.0}]}' % INVOICE_ID.encode()
+    )
+    assert all(getattr(get, phase) > 0 for phase in ("encode", "ttfb", "validate"))
+    assert get.decode == 0
+    assert get.total >= get.encode + get.ttfb + get.download + get.validate
+    assert lite.decode > 0 and lite.validate > 0
+    assert (failed.status_code, failed.error) == (400, "ApiError")
+    assert failed.xero_tenant_id == "tenant-b"
+
+
+@pytest.mark.asyncio
+async def test_async_hooks_report_each_request() -> None:
+    """Tests that an asynchronous client reports one record per request."""
+    reported: typing.List[RequestMetrics] = []
+    client = AsyncClient(
+        oauth_token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(_handler)),
+        adaptive_concurrency=True,
+        hooks=[reported.append],
+    )
+    await client.accounting.invoices.list(xero_tenant_id="tenant-a")
+    (metrics,) = reported
+    assert metrics.path == "/Invoices"
+    assert metrics.status_code == 200
+    assert metrics.queue >= 0 and metrics.validate > 0
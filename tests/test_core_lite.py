@@ -0,0 +1,80 @@
+import httpx
+import pytest
+
+from xero_accounting_py import AsyncClient, Client
+from xero_accounting_py.core import LiteRecord, decode_lite
+from xero_accounting_py.types import models
+
+INVOICES_PAYLOAD = {
+    "Invoices": [
+        {
+            "InvoiceID": "00000000-0000-0000-0000-000000000001",
+            "InvoiceNumber": "INV-0001",
+            "AmountDue": 40.0,
+            "Status": "AUTHORISED",
+            "Contact": {"ContactID": "c-1", "Name": "Acme"},
+            "LineItems": [{"Description": "Tires", "LineAmount": 40.0}],
+        }
+    ],
+    "pagination": {"page": 1, "pageCount": 1, "pageSize": 100, "itemCount": 1},
+}
+
+
+def _transport() -> httpx.MockTransport:
+    return httpx.MockTransport(
+        lambda request: httpx.Response(200, json=INVOICES_PAYLOAD)
+    )
+
+
+def test_decode_lite_builds_frozen_records() -> None:
+    """Tests that lite decoding maps aliases onto slotted, read-only records.
+
+    Validates:
+    - Nested models and lists of models become lite records
+    - Absent fields default to None
+    - Records reject attribute assignment
+    """
+    invoices = decode_lite(INVOICES_PAYLOAD, models.Invoices)
+    invoice = invoices.invoices[0]
+
+    assert isinstance(invoice, LiteRecord)
+    assert invoice.invoice_number == "INV-0001"
+    assert invoice.contact.name == "Acme"
+    assert invoice.line_items[0].line_amount == 40.0
+    assert invoice.payments is None
+    assert invoices.pagination.page_count == 1
+    assert not hasattr(invoice, "__dict__")
+    with pytest.raises(AttributeError):
+        invoice.amount_due = 0.0
+
+
+def test_list_200_lite_decode() -> None:
+    """Tests a GET request to the /Invoices endpoint with `decode="lite"`.
+
+    Mode: Synchronous execution
+    """
+    client = Client(
+        oauth_token="API_TOKEN", httpx_client=httpx.Client(transport=_transport())
+    )
+    response = client.accounting.invoices.list(
+        xero_tenant_id="YOUR_XERO_TENANT_ID", request_options={"decode": "lite"}
+    )
+    assert isinstance(response, LiteRecord)
+    assert response.invoices[0].amount_due == 40.0
+
+
+@pytest.mark.asyncio
+async def test_await_list_200_lite_decode() -> None:
+    """Tests a GET request to the /Invoices endpoint with `decode="lite"`.
+
+    Mode: Asynchronous execution
+    """
+    client = AsyncClient(
+        oauth_token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=_transport()),
+    )
+    response = await client.accounting.invoices.list(
+        xero_tenant_id="YOUR_XERO_TENANT_ID", request_options={"decode": "lite"}
+    )
+    assert isinstance(response, LiteRecord)
+    assert response.invoices[0].contact.name == "Acme"
@@ -0,0 +1,148 @@
+import asyncio
+import re
+import typing
+
+import httpx
+import pytest
+
+from xero_accounting_py import ApiError, AsyncClient
+
+
+def _transport(seen: typing.List[httpx.Request]) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        if request.url.path.endswith("/Contacts"):
+            ids = request.url.params.get("IDs", "").split(",")
+            contacts = [
+                {"ContactID": i.upper(), "Name": f"Contact {i}"}
+                for i in ids
+                if i != "missing"
+            ]
+            return httpx.Response(200, json={"Contacts": contacts})
+        if request.url.path.endswith("/Items"):
+            ids = re.findall(r'ItemID==Guid\("([^"]+)"\)', request.url.params["where"])
+            return httpx.Response(
+                200, json={"Items": [{"ItemID": i, "Code": i} for i in ids]}
+            )
+        return httpx.Response(500, json={"Message": "boom"})
+
+    return httpx.MockTransport(handler)
+
+
+def _client(seen: typing.List[httpx.Request], **options: typing.Any) -> AsyncClient:
+    return AsyncClient(
+        oauth_token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=_transport(seen)),
+        **options,
+    )
+
+
+@pytest.mark.asyncio
+async def test_loader_batches_gets_per_tenant() -> None:
+    """Tests that gets issued in one tick become one list call per tenant.
+
+    Validates:
+    - Concurrent contact loads share one request per tenant
+    - Each caller receives its own record, or None when it does not exist
+    - Repeated loads are served from the memo
+    - Items are batched through a where filter
+    - Client-wide raw and decode defaults do not change what loads return
+    """
+    seen: typing.List[httpx.Request] = []
+    loader = _client(seen).loader()
+
+    async def resolve(contact_id: str, tenant: str) -> typing.Any:
+        return await loader.contact(contact_id, xero_tenant_id=tenant)
+
+    contacts = await asyncio.gather(
+        resolve("c-1", "tenant-a"),
+        resolve("c-2", "tenant-a"),
+        resolve("c-1", "tenant-a"),
+        resolve("missing", "tenant-a"),
+        resolve("c-3", "tenant-b"),
+    )
+    assert [c and c.name for c in contacts] == [
+        "Contact c-1",
+        "Contact c-2",
+        "Contact c-1",
+        None,
+        "Contact c-3",
+    ]
+    assert sorted(r.headers["xero-tenant-id"] for r in seen) == [
+        "tenant-a",
+        "tenant-b",
+    ]
+    assert seen[0].url.params["IDs"] == "c-1,c-2,missing"
+
+    again = await loader.contact("c-2", xero_tenant_id="tenant-a")
+    assert again is contacts[1]
+    assert len(seen) == 2
+
+    seen.clear()
+    items = await asyncio.gather(
+        *(loader.item(f"i-{n}", xero_tenant_id="tenant-a") for n in range(3))
+    )
+    assert [item.code for item in items] == ["i-0", "i-1", "i-2"]
+    assert len(seen) == 1
+
+    for options in ({"raw": "json"}, {"decode": "lite"}):
+        loader = _client(seen, **options).loader()
+        contact = await loader.contact("c-1", xero_tenant_id="tenant-a")
+        assert contact.contact_id == "C-1"
+
+
+@pytest.mark.asyncio
+async def test_loader_chunks_and_errors() -> None:
+    """Tests batch size limits and that failures reach every caller unmemoized."""
+    seen: typing.List[httpx.Request] = []
+    loader = _client(seen).loader(max_batch=2)
+    contacts = await asyncio.gather(
+        *(loader.contact(f"c-{n}", xero_tenant_id="tenant-a") for n in range(5))
+    )
+    assert len(contacts) == 5
+    assert len(seen) == 3
+
+    results = await asyncio.gather(
+        loader.account("a-1", xero_tenant_id="tenant-a"),
+        loader.account("a-2", xero_tenant_id="tenant-a"),
+        return_exceptions=True,
+    )
+    assert all(isinstance(r, ApiError) for r in results)
+    with pytest.raises(ApiError):
+        await loader.account("a-1", xero_tenant_id="tenant-a")
+
+
+@pytest.mark.asyncio
+async def test_loader_caller_cancellation_is_isolated() -> None:
+    """Tests that a caller giving up does not cancel the load it shares.
+
+    Validates:
+    - A caller timing out does not cancel other callers of the same id
+    - The completed load stays memoized for later callers
+    """
+    release = asyncio.Event()
+    seen: typing.List[httpx.Request] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        await release.wait()
+        contacts = [{"ContactID": "c-1", "Name": "Contact c-1"}]
+        return httpx.Response(200, json={"Contacts": contacts})
+
+    loader = AsyncClient(
+        oauth_token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    ).loader()
+
+    waiting = asyncio.ensure_future(loader.contact("c-1", xero_tenant_id="tenant-a"))
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(
+            loader.contact("c-1", xero_tenant_id="tenant-a"), timeout=0.01
+        )
+    release.set()
+    contact = await waiting
+    assert contact.name == "Contact c-1"
+
+    again = await loader.contact("c-1", xero_tenant_id="tenant-a")
+    assert again is contact
+    assert len(seen) == 1
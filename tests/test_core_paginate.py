@@ -0,0 +1,132 @@
+import asyncio
+import typing
+
+import httpx
+import pytest
+
+from xero_accounting_py import AsyncClient
+
+PAGES = 6
+
+
+def _client(
+    seen: typing.List[httpx.Request],
+    in_flight: typing.List[int],
+    *,
+    window: int = 0,
+    gates: typing.Optional[typing.Dict[int, asyncio.Event]] = None,
+) -> AsyncClient:
+    """
+    Serves `PAGES` one-item pages. Pages after the first are held until
+    `window` of them are in flight, then until their gate in `gates` is set.
+    """
+    active = 0
+    full = asyncio.Event()
+    if not window:
+        full.set()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal active
+        seen.append(request)
+        page = int(request.url.params["page"])
+        active += 1
+        in_flight.append(active)
+        if active >= window:
+            full.set()
+        if page > 1:
+            await full.wait()
+            if gates and page in gates:
+                await gates[page].wait()
+        active -= 1
+        return httpx.Response(
+            200,
+            json={
+                "pagination": {"page": page, "pageCount": PAGES, "pageSize": 1},
+                "items": [{"projectId": f"p-{page}", "name": f"Project {page}"}],
+            },
+        )
+
+    return AsyncClient(
+        oauth_token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+
+@pytest.mark.asyncio
+async def test_paginate_fetches_remaining_pages_concurrently() -> None:
+    """Tests concurrent page fetching once page 1 reports the page count.
+
+    Validates:
+    - Every page is fetched once and yielded in page order by default
+    - No more than `window` pages are in flight at a time
+    - request_options are forwarded to every page call
+    - ordered=False yields pages as they arrive
+    """
+    seen: typing.List[httpx.Request] = []
+    in_flight: typing.List[int] = []
+    client = _client(seen, in_flight, window=3)
+    pages = [
+        page
+        async for page in client.paginate(
+            client.projects.list,
+            window=3,
+            xero_tenant_id="YOUR_XERO_TENANT_ID",
+            page_size=1,
+            request_options={"additional_headers": {"x-trace": "t-1"}},
+        )
+    ]
+    assert [page.pagination.page for page in pages] == list(range(1, PAGES + 1))
+    assert [page.items[0].project_id for page in pages][:2] == ["p-1", "p-2"]
+    assert sorted(int(r.url.params["page"]) for r in seen) == list(range(1, PAGES + 1))
+    assert max(in_flight) == 3
+    assert all(r.headers["x-trace"] == "t-1" for r in seen)
+
+    # later pages are released first, so arrival order differs from page order
+    gates = {page: asyncio.Event() for page in range(2, PAGES + 1)}
+    client = _client(seen, [], gates=gates)
+    arrived = []
+    async for page in client.paginate(
+        client.projects.list,
+        window=PAGES,
+        ordered=False,
+        xero_tenant_id="YOUR_XERO_TENANT_ID",
+    ):
+        number = page.pagination.page
+        arrived.append(number)
+        release = PAGES if number == 1 else number - 1
+        if release in gates:
+            gates[release].set()
+    assert arrived == [1, 6, 5, 4, 3, 2]
+
+
+@pytest.mark.asyncio
+async def test_paginate_cancels_pages_when_stopped_early() -> None:
+    """Tests that breaking out of the iteration cancels pages still in flight."""
+    seen: typing.List[httpx.Request] = []
+    client = _client(seen, [])
+    iterator = client.paginate(
+        client.projects.list, window=2, xero_tenant_id="YOUR_XERO_TENANT_ID"
+    )
+    async for page in iterator:
+        if page.pagination.page == 2:
+            break
+    await iterator.aclose()
+    assert len(seen) <= 4
+
+
+@pytest.mark.asyncio
+async def test_paginate_reads_page_count_of_raw_responses() -> None:
+    """Tests that raw pages are paginated from their parsed or received body."""
+    for raw in ("json", "bytes"):
+        seen: typing.List[httpx.Request] = []
+        client = _client(seen, [])
+        pages = [
+            page
+            async for page in client.paginate(
+                client.projects.list,
+                xero_tenant_id="YOUR_XERO_TENANT_ID",
+                request_options={"raw": raw},
+            )
+        ]
+        assert len(pages) == PAGES
+        assert all(page.status_code == 200 for page in pages)
@@ -0,0 +1,89 @@
+import httpx
+import pytest
+
+from xero_accounting_py import AsyncClient, Client
+from xero_accounting_py.core import LiteRecord, projected_model
+from xero_accounting_py.types import models
+
+INVOICES_PAYLOAD = {
+    "Invoices": [
+        {
+            "InvoiceID": "00000000-0000-0000-0000-000000000001",
+            "InvoiceNumber": "INV-0001",
+            "AmountDue": 40.0,
+            "Contact": {"ContactID": "c-1", "Name": "Acme"},
+            "LineItems": [{"Description": "Tires", "LineAmount": 40.0}],
+        }
+    ],
+    "pagination": {"page": 1, "pageCount": 1, "pageSize": 100, "itemCount": 1},
+}
+FIELDS = ["invoice_id", "amount_due", "contact.name"]
+
+
+def _transport() -> httpx.MockTransport:
+    return httpx.MockTransport(
+        lambda request: httpx.Response(200, json=INVOICES_PAYLOAD)
+    )
+
+
+def test_projected_model_is_cached_and_trimmed() -> None:
+    """Tests that a projection compiles once into a model with only the selected fields.
+
+    Validates:
+    - Paths not on the wrapper resolve against its records
+    - Nested paths trim nested models
+    - Unknown fields are rejected
+    """
+    projection = projected_model(models.Invoices, FIELDS)
+    decoded = projection.model_validate(INVOICES_PAYLOAD)
+
+    assert projected_model(models.Invoices, list(reversed(FIELDS))) is projection
+    assert set(projection.model_fields) == {"invoices", "pagination", "warnings"}
+    assert set(type(decoded.invoices[0]).model_fields) == {
+        "amount_due",
+        "contact",
+        "invoice_id",
+    }
+    assert set(type(decoded.invoices[0].contact).model_fields) == {"name"}
+    with pytest.raises(ValueError):
+        projected_model(models.Invoices, ["not_a_field"])
+
+
+def test_list_200_fields() -> None:
+    """Tests a GET request to the /Invoices endpoint with a field projection.
+
+    Mode: Synchronous execution
+    """
+    client = Client(
+        oauth_token="API_TOKEN", httpx_client=httpx.Client(transport=_transport())
+    )
+    response = client.accounting.invoices.list(
+        xero_tenant_id="YOUR_XERO_TENANT_ID", request_options={"fields": FIELDS}
+    )
+    invoice = response.invoices[0]
+    assert invoice.amount_due == 40.0
+    assert invoice.contact.name == "Acme"
+    assert not hasattr(invoice, "line_items")
+    assert not hasattr(invoice.contact, "contact_id")
+    assert response.pagination.page_count == 1
+
+
+@pytest.mark.asyncio
+async def test_await_get_200_fields_lite() -> None:
+    """Tests a GET request to the /Invoices/{InvoiceID} endpoint with a projection and lite decoding.
+
+    Mode: Asynchronous execution
+    """
+    client = AsyncClient(
+        oauth_token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=_transport()),
+    )
+    response = await client.accounting.invoices.get(
+        invoice_id="00000000-0000-0000-0000-000000000001",
+        xero_tenant_id="YOUR_XERO_TENANT_ID",
+        request_options={"fields": FIELDS, "decode": "lite"},
+    )
+    invoice = response.invoices[0]
+    assert isinstance(invoice, LiteRecord)
+    assert invoice._fields == ("amount_due", "contact", "invoice_id")
+    assert invoice.contact.name == "Acme"
@@ -0,0 +1,72 @@
+import httpx
+import pytest
+
+from xero_accounting_py import AsyncClient, Client
+from xero_accounting_py.core import RawResponse
+from xero_accounting_py.types import models
+
+BODY = (
+    b'{"Invoices":[{"InvoiceID":"i-1","Total":12.5,"Date":"2024-06-30",'
+    b'"Contact":{"ContactID":"c-1","Name":"Acme"},'
+    b'"LineItems":[{"Description":"Widget","Quantity":2}]}]}'
+)
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(
+        200,
+        content=BODY,
+        headers={"content-type": "application/json", "x-rate-limit-problem": ""},
+    )
+
+
+def _client(**options: str) -> Client:
+    return Client(
+        oauth_token="API_TOKEN",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(_handler)),
+        **options,  # type: ignore[arg-type]
+    )
+
+
+def test_raw_responses() -> None:
+    """Tests raw responses per call and per client.
+
+    Validates:
+    - raw="bytes" returns the status, headers and body as received
+    - raw="json" also parses the body with the client codec
+    - A client-wide raw mode can be overridden per call
+    """
+    client = _client()
+    raw = client.accounting.invoices.list(
+        xero_tenant_id="tenant-a", request_options={"raw": "bytes"}
+    )
+    assert isinstance(raw, RawResponse)
+    assert (raw.status_code, raw.content, raw.data) == (200, BODY, None)
+    assert raw.headers["content-type"] == "application/json"
+
+    parsed = _client(raw="json").accounting.invoices.list(xero_tenant_id="tenant-a")
+    assert parsed.data["Invoices"][0]["Total"] == 12.5
+
+
+def test_client_default_decode() -> None:
+    """Tests that a client-wide decode mode applies to every call."""
+    invoices = _client(decode="lite").accounting.invoices.list(
+        xero_tenant_id="tenant-a"
+    )
+    invoice = invoices.invoices[0]
+    assert not isinstance(invoice, models.Invoice)
+    assert invoice.contact.name == "Acme"
+    assert invoice.line_items[0].quantity == 2
+
+
+@pytest.mark.asyncio
+async def test_async_raw_response() -> None:
+    """Tests the raw option on an AsyncClient."""
+    client = AsyncClient(
+        oauth_token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(_handler)),
+    )
+    raw = await client.accounting.invoices.list(
+        xero_tenant_id="tenant-a", request_options={"raw": "bytes"}
+    )
+    assert raw.content == BODY
@@ -0,0 +1,42 @@
+import typing
+
+import make_api_request
+import pydantic
+import pytest
+import typing_extensions
+
+from xero_accounting_py.core import request as core_request
+from xero_accounting_py.types import params
+
+CASES = [
+    ("REF12", str),
+    (4, int),
+    (True, bool),
+    (2.5, float),
+    (["DRAFT", "PAID"], typing.List[str]),
+    ("5", int),
+    ("MONTH", typing_extensions.Literal["MONTH", "QUARTER", "YEAR"]),
+    (
+        {"invoices": [{"type_": "ACCREC", "line_items": [{"line_amount": 40.0}]}]},
+        params._SerializerInvoices,
+    ),
+]
+
+
+@pytest.mark.parametrize("item,dump_with", CASES)
+def test_to_encodable_matches_upstream(item: typing.Any, dump_with: typing.Any) -> None:
+    """Tests that compiled encoders produce the same output as the upstream encoder."""
+    params._SerializerInvoices.model_rebuild(_types_namespace=params._types_namespace)
+    expected = make_api_request.to_encodable(item=item, dump_with=dump_with)
+    assert core_request.to_encodable(item=item, dump_with=dump_with) == expected
+
+
+def test_to_encodable_compiles_once_per_type() -> None:
+    """Tests that an encoder is compiled once and invalid values still fail validation."""
+    core_request.to_encodable(item=["a"], dump_with=typing.List[str])
+    encoder = core_request._ENCODERS[typing.List[str]]
+    core_request.to_encodable(item=["b"], dump_with=typing.List[str])
+
+    assert core_request._ENCODERS[typing.List[str]] is encoder
+    with pytest.raises(pydantic.ValidationError):
+        core_request.to_encodable(item="not-a-number", dump_with=int)
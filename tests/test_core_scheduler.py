@@ -0,0 +1,74 @@
+import asyncio
+import typing
+
+import httpx
+import pytest
+
+from xero_accounting_py import AsyncClient
+from xero_accounting_py.core import PriorityScheduler
+
+
+@pytest.mark.asyncio
+async def test_interactive_calls_overtake_batch_backlog() -> None:
+    """Tests priority lanes on a shared AsyncClient.
+
+    Validates:
+    - Batch calls never take the slot reserved for interactive calls
+    - A waiting interactive call is admitted before queued batch calls
+    - The priority is read from request_options
+    """
+    order: typing.List[str] = []
+    release = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        order.append(request.url.path.rsplit("/", 1)[-1])
+        await release.wait()
+        return httpx.Response(200, json={"Contacts": [], "Invoices": []})
+
+    scheduler = PriorityScheduler(per_tenant=3, reserved=1)
+    client = AsyncClient(
+        oauth_token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        scheduler=scheduler,
+    )
+    batch = [
+        asyncio.ensure_future(
+            client.accounting.invoices.list(
+                xero_tenant_id="tenant-a", request_options={"priority": "batch"}
+            )
+        )
+        for _ in range(6)
+    ]
+    await asyncio.sleep(0.01)
+    assert scheduler.active("tenant-a") == {"interactive": 0, "batch": 2}
+    assert scheduler.waiting("batch") == 4
+
+    interactive = [
+        asyncio.ensure_future(
+            client.accounting.contacts.list(xero_tenant_id="tenant-a")
+        )
+        for _ in range(2)
+    ]
+    await asyncio.sleep(0.01)
+    # the reserved slot is taken at once, the second call waits for the next
+    assert order == ["Invoices", "Invoices", "Contacts"]
+    release.set()
+    await asyncio.gather(*batch, *interactive)
+    assert order[3] == "Contacts"
+    assert scheduler.active("tenant-a") == {"interactive": 0, "batch": 0}
+
+
+@pytest.mark.asyncio
+async def test_tenants_take_turns() -> None:
+    """Tests that a deep queue for one tenant does not delay another."""
+    scheduler = PriorityScheduler(per_tenant=5, reserved=0, max_total=1)
+    admitted: typing.List[str] = []
+
+    async def call(tenant: str) -> None:
+        async with scheduler.slot(tenant, "batch"):
+            admitted.append(tenant)
+            await asyncio.sleep(0)
+
+    await asyncio.gather(*(call("tenant-a") for _ in range(4)), call("tenant-b"))
+    # tenant-b queued behind the second call of tenant-a, not behind all four
+    assert admitted == ["tenant-a", "tenant-a", "tenant-b", "tenant-a", "tenant-a"]
@@ -0,0 +1,181 @@
+import datetime
+import typing
+
+import httpx
+import pytest
+
+from xero_accounting_py import AsyncClient
+from xero_accounting_py.core import RateLimiter
+from xero_accounting_py.engines import AgingEngine
+from xero_accounting_py.types import models
+
+from _xero import invoice, xero_date
+
+ACME = {"ContactID": "c-1", "Name": "Acme"}
+GLOBEX = {"ContactID": "c-2", "Name": "Globex"}
+
+
+# synced invoices carry their total and last update
+SYNCED = {"Total": 100.0, "UpdatedDateUTC": "/Date(1717200000000+0000)/"}
+INVOICES = [
+    invoice(
+        "1",
+        ACME,
+        issued=datetime.date(2024, 5, 1),
+        due=datetime.date(2024, 5, 31),
+        amount_due=100.0,
+        **SYNCED,
+    ),
+    invoice(
+        "2",
+        ACME,
+        issued=datetime.date(2024, 3, 1),
+        due=datetime.date(2024, 3, 31),
+        amount_due=40.0,
+        **SYNCED,
+    ),
+    invoice(
+        "3",
+        GLOBEX,
+        issued=datetime.date(2023, 12, 1),
+        due=datetime.date(2023, 12, 31),
+        amount_due=50.0,
+        CurrencyCode="USD",
+        CurrencyRate=0.5,
+        **SYNCED,
+    ),
+]
+CREDIT_NOTES = [
+    {
+        "CreditNoteID": "cn-1",
+        "Type": "ACCRECCREDIT",
+        "Status": "AUTHORISED",
+        "Contact": ACME,
+        "Date": xero_date(datetime.date(2024, 6, 10)),
+        "Total": 25.0,
+        "RemainingCredit": 25.0,
+    }
+]
+PAYMENTS = [
+    {
+        "PaymentID": "pay-1",
+        "Status": "AUTHORISED",
+        "Date": xero_date(datetime.date(2024, 6, 15)),
+        "Amount": 60.0,
+        "Invoice": {"InvoiceID": "2"},
+    }
+]
+
+
+def _transport(seen: typing.List[httpx.Request]) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        endpoint = request.url.path.rsplit("/", 1)[-1]
+        if "UpdatedDateUTC" in request.url.params.get("where", ""):
+            # incremental sync: invoice 1 has been paid in full since
+            paid = dict(INVOICES[0], Status="PAID", AmountDue=0.0)
+            body: typing.Dict[str, typing.Any] = {"Invoices": [paid]}
+        else:
+            body = {
+                "Invoices": INVOICES,
+                "CreditNotes": CREDIT_NOTES,
+                "Payments": PAYMENTS,
+            }
+        records = body.get(endpoint, [])
+        return httpx.Response(
+            200,
+            json={
+                endpoint: records,
+                "pagination": {"page": 1, "pageCount": 1, "itemCount": len(records)},
+            },
+        )
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.mark.asyncio
+async def test_sync_and_summary() -> None:
+    """Tests a full and an incremental sync followed by local ageing.
+
+    Validates:
+    - Balances are bucketed by days overdue, in base currency cents
+    - Payments dated after `as_at` are added back
+    - The summary report matches the aged report shape
+    - An incremental sync filters on UpdatedDateUTC and applies changes
+    """
+    seen: typing.List[httpx.Request] = []
+    client = AsyncClient(
+        oauth_token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=_transport(seen)),
+    )
+    engine = AgingEngine()
+    limiter = RateLimiter(calls_per_minute=60_000)
+    await engine.sync(
+        client.accounting, xero_tenant_id="YOUR_XERO_TENANT_ID", limiter=limiter
+    )
+
+    as_at = datetime.date(2024, 6, 30)
+    assert engine.buckets("receivables", as_at=as_at) == {
+        "c-1": [0, 7500, 0, 0, 4000, 0],
+        "c-2": [0, 0, 0, 0, 0, 10000],
+    }
+    assert engine.buckets("receivables", as_at=datetime.date(2024, 6, 1)) == {
+        "c-1": [0, 10000, 0, 10000, 0, 0],
+        "c-2": [0, 0, 0, 0, 0, 10000],
+    }
+    assert engine.buckets("payables", as_at=as_at) == {}
+
+    report = engine.summary("receivables", as_at=as_at).reports[0]
+    assert report.report_date == "30 June 2024"
+    header, section = report.rows
+    assert [cell.value for cell in header.cells] == [
+        "Contact",
+        "Current",
+        "1 - 30 days",
+        "31 - 60 days",
+        "61 - 90 days",
+        "91 - 120 days",
+        "Older",
+        "Total",
+    ]
+    acme, globex, total = section.rows
+    assert acme.cells[0].value == "Acme"
+    assert acme.cells[0].attributes[0].value == "c-1"
+    assert acme.cells[-1].value == "115.00"
+    assert total.row_type == "SummaryRow"
+    assert total.cells[-1].value == "215.00"
+
+    detail = engine.by_contact("receivables", "c-1", as_at=as_at).reports[0]
+    assert [row.cells[1].value for row in detail.rows[1].rows[:-1]] == [
+        "INV-2",
+        "INV-1",
+        "",
+    ]
+
+    await engine.sync(
+        client.accounting, xero_tenant_id="YOUR_XERO_TENANT_ID", limiter=limiter
+    )
+    assert (
+        seen[-1].url.params["where"] == "UpdatedDateUTC>=DateTime(2024,06,01,00,00,00)"
+    )
+    assert engine.buckets("receivables", as_at=as_at)["c-1"] == [
+        0,
+        -2500,
+        0,
+        0,
+        4000,
+        0,
+    ]
+
+
+def test_update_drops_voided_documents() -> None:
+    """Tests that voided documents stop contributing to balances."""
+    engine = AgingEngine(periods=2, period_days=7)
+    models.Invoice.model_rebuild(_types_namespace=models._types_namespace)
+    invoice = models.Invoice.model_validate(INVOICES[0])
+    engine.update(invoices=[invoice])
+    assert engine.buckets("receivables", as_at=datetime.date(2024, 6, 5)) == {
+        "c-1": [0, 10000, 0, 0]
+    }
+    engine.update(invoices=[invoice.model_copy(update={"status": "VOIDED"})])
+    assert engine.buckets("receivables", as_at=datetime.date(2024, 6, 5)) == {}
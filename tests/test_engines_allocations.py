@@ -0,0 +1,189 @@
+import datetime
+import json
+import typing
+
+import httpx
+import pytest
+
+from xero_accounting_py import AsyncClient
+from xero_accounting_py.core import RateLimiter
+from xero_accounting_py.core.utils import rebuild_model
+from xero_accounting_py.engines import AllocationEngine
+from xero_accounting_py.types import models
+
+from _xero import invoice, xero_date
+
+ACME = {"ContactID": "c-1", "Name": "Acme"}
+GLOBEX = {"ContactID": "c-2", "Name": "Globex"}
+
+
+INVOICES = [
+    invoice("i-1", ACME, due=datetime.date(2024, 3, 31), amount_due=40.0),
+    invoice("i-2", ACME, due=datetime.date(2024, 2, 29), amount_due=30.0),
+    invoice("i-3", ACME, due=datetime.date(2024, 4, 30), amount_due=50.0),
+    invoice("i-4", GLOBEX, due=datetime.date(2024, 4, 30), amount_due=20.0),
+]
+CREDIT_NOTES = [
+    {
+        "CreditNoteID": "cn-1",
+        "CreditNoteNumber": "CN-1",
+        "Type": "ACCRECCREDIT",
+        "Status": "AUTHORISED",
+        "Contact": ACME,
+        "CurrencyCode": "NZD",
+        "Date": xero_date(datetime.date(2024, 1, 15)),
+        "RemainingCredit": 50.0,
+        "Allocations": [
+            {
+                "AllocationID": "old",
+                "Amount": 40.0,
+                "Date": xero_date(datetime.date(2024, 1, 20)),
+                "Invoice": {"InvoiceID": "i-1"},
+            }
+        ],
+    },
+    {
+        "CreditNoteID": "cn-2",
+        "CreditNoteNumber": "CN-2",
+        "Type": "ACCRECCREDIT",
+        "Status": "AUTHORISED",
+        "Contact": GLOBEX,
+        "CurrencyCode": "USD",
+        "Date": xero_date(datetime.date(2024, 1, 15)),
+        "RemainingCredit": 20.0,
+    },
+]
+OVERPAYMENTS = [
+    {
+        "OverpaymentID": "op-1",
+        "Type": "RECEIVE-OVERPAYMENT",
+        "Status": "AUTHORISED",
+        "Contact": ACME,
+        "CurrencyCode": "NZD",
+        "Date": xero_date(datetime.date(2024, 2, 1)),
+        "RemainingCredit": 50.0,
+    }
+]
+
+
+class _Server:
+    """Serves the lists and applies allocations, failing the first call"""
+
+    def __init__(self) -> None:
+        self.allocations: typing.Dict[str, typing.List[typing.Any]] = {
+            "cn-1": list(CREDIT_NOTES[0]["Allocations"])
+        }
+        self.creates: typing.List[typing.Tuple[str, typing.Any]] = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        parts = request.url.path.strip("/").split("/")
+        if parts[-1] == "Allocations":
+            credit_id = parts[-2]
+            body = json.loads(request.content)["Allocations"]
+            self.creates.append((credit_id, body))
+            created = [
+                dict(a, AllocationID=f"{credit_id}-{len(self.creates)}-{n}")
+                for n, a in enumerate(body)
+            ]
+            self.allocations.setdefault(credit_id, []).extend(created)
+            if len(self.creates) == 1:
+                # applied, but the response is lost
+                return httpx.Response(503)
+            return httpx.Response(200, json={"Allocations": created})
+        if parts[-2] == "CreditNotes":
+            credit_note = dict(
+                CREDIT_NOTES[0], Allocations=self.allocations.get(parts[-1], [])
+            )
+            return httpx.Response(200, json={"CreditNotes": [credit_note]})
+        if parts[-2] == "Overpayments":
+            overpayment = dict(
+                OVERPAYMENTS[0], Allocations=self.allocations.get(parts[-1], [])
+            )
+            return httpx.Response(200, json={"Overpayments": [overpayment]})
+        records = {
+            "Invoices": INVOICES,
+            "CreditNotes": CREDIT_NOTES,
+            "Overpayments": OVERPAYMENTS,
+        }.get(parts[-1], [])
+        return httpx.Response(
+            200,
+            json={
+                parts[-1]: records,
+                "pagination": {"page": 1, "pageCount": 1, "itemCount": len(records)},
+            },
+        )
+
+
+def _engine_client(server: _Server) -> AsyncClient:
+    return AsyncClient(
+        oauth_token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(server.handler)),
+    )
+
+
+@pytest.mark.asyncio
+async def test_plan_report_and_apply() -> None:
+    """Tests planning, previewing and applying oldest-first allocations.
+
+    Validates:
+    - Credits only match invoices of the same contact and currency
+    - The oldest credit goes to the invoice due first, splitting amounts
+    - The dry-run report has a section per contact with the credit left
+    - A call that fails after the API applied it is not sent twice
+    - Applied amounts are deducted from the loaded documents
+    """
+    server = _Server()
+    client = _engine_client(server)
+    limiter = RateLimiter(calls_per_minute=60_000)
+    engine = AllocationEngine(backoff=0)
+    await engine.load(client.accounting, xero_tenant_id="T", limiter=limiter)
+
+    plan = engine.plan(date=datetime.date(2024, 6, 1))
+    assert [(a.credit_id, a.invoice_id, a.amount) for a in plan] == [
+        ("cn-1", "i-2", 3000),
+        ("cn-1", "i-1", 2000),
+        ("op-1", "i-1", 2000),
+        ("op-1", "i-3", 3000),
+    ]
+    assert {a.date for a in plan} == {datetime.date(2024, 6, 1)}
+
+    report = engine.report(plan).reports[0]
+    header, acme = report.rows
+    assert [c.value for c in header.cells] == [
+        "Credit",
+        "Invoice",
+        "Date",
+        "Amount",
+        "Credit Left",
+    ]
+    assert acme.title == "Acme"
+    assert [[c.value for c in row.cells] for row in acme.rows[:2]] == [
+        ["CN-1", "INV-i-2", "2024-06-01", "30.00", "20.00"],
+        ["CN-1", "INV-i-1", "2024-06-01", "20.00", "0.00"],
+    ]
+    assert acme.rows[-1].cells[3].value == "100.00"
+
+    outcomes = await engine.apply(
+        client.accounting, plan, xero_tenant_id="T", limiter=limiter
+    )
+    assert [o.ok for o in outcomes] == [True] * 4
+    assert sorted(len(body) for _, body in server.creates) == [2, 2]
+    assert engine.invoices["i-3"].amount_due == 2000
+    assert set(engine.invoices) == {"i-3", "i-4"}
+    assert set(engine.credits) == {"cn-2"}
+    assert engine.plan() == []
+
+
+def test_exact_match() -> None:
+    """Tests that exact matching only pairs equal amounts, oldest first."""
+    engine = AllocationEngine(strategy="exact_match")
+    for model in (models.Invoice, models.CreditNote, models.Overpayment):
+        rebuild_model(model)
+    engine.update(
+        invoices=[models.Invoice.model_validate(i) for i in INVOICES],
+        overpayments=[models.Overpayment.model_validate(o) for o in OVERPAYMENTS],
+    )
+    plan = engine.plan(date=datetime.date(2024, 6, 1))
+    assert [(a.credit_id, a.invoice_id, a.amount) for a in plan] == [
+        ("op-1", "i-3", 5000)
+    ]
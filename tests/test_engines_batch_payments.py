@@ -0,0 +1,201 @@
+import datetime
+import json
+import typing
+
+import httpx
+import pytest
+
+from xero_accounting_py import AsyncClient
+from xero_accounting_py.core import RateLimiter
+from xero_accounting_py.engines import PaymentBatcher, PaymentIntent
+
+DAY = datetime.date(2024, 6, 3)
+
+
+def _transport(seen: typing.List[typing.Any]) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        seen.append((request.url.path, body))
+        if request.url.path.endswith("/BatchPayments"):
+            if any(b["Reference"] == "down" for b in body["BatchPayments"]):
+                return httpx.Response(500, json={"Message": "Service unavailable"})
+            created = []
+            for index, batch in enumerate(body["BatchPayments"]):
+                record = dict(batch, BatchPaymentID=f"bp-{len(seen)}-{index}")
+                if any(
+                    p["Invoice"]["InvoiceID"].startswith("bad")
+                    for p in batch["Payments"]
+                ):
+                    record["ValidationErrors"] = [{"Message": "Invoice not payable"}]
+                else:
+                    record["Payments"] = [
+                        dict(p, PaymentID=f"p-{p['Invoice']['InvoiceID']}")
+                        for p in batch["Payments"]
+                    ]
+                created.append(record)
+            return httpx.Response(200, json={"BatchPayments": created})
+        if any(p["Invoice"]["InvoiceID"] == "bad-down" for p in body["Payments"]):
+            return httpx.Response(500, json={"Message": "Service unavailable"})
+        payments = []
+        for payment in body["Payments"]:
+            if payment["Invoice"]["InvoiceID"] == "bad":
+                payments.append(
+                    dict(payment, ValidationErrors=[{"Message": "Invoice not payable"}])
+                )
+            else:
+                payments.append(
+                    dict(payment, PaymentID=f"p-{payment['Invoice']['InvoiceID']}")
+                )
+        return httpx.Response(200, json={"Payments": payments})
+
+    return httpx.MockTransport(handler)
+
+
+def test_plan_groups_by_statement_line() -> None:
+    """Tests grouping of payment intents into batches.
+
+    Validates:
+    - Intents sharing account, date and reference share a batch
+    - Groups are split at `max_payments`
+    - An invoice paid twice in a group goes into a separate batch
+    """
+    batcher = PaymentBatcher(max_payments=2)
+    intents = [
+        PaymentIntent("i-1", 1000, DAY, "bank", "dep-1"),
+        PaymentIntent("i-2", 2000, DAY, "bank", "dep-1"),
+        PaymentIntent("i-3", 3000, DAY, "bank", "dep-1"),
+        PaymentIntent("i-4", 4000, DAY, "bank", "dep-2"),
+        PaymentIntent("i-4", 500, DAY, "bank", "dep-2"),
+    ]
+    plan = batcher.plan(intents)
+    assert [
+        (batch.reference, [i.invoice_id for i in batch.intents]) for batch in plan
+    ] == [
+        ("dep-1", ["i-1", "i-2"]),
+        ("dep-1", ["i-3"]),
+        ("dep-2", ["i-4"]),
+        ("dep-2", ["i-4"]),
+    ]
+    assert plan[0].amount == 3000
+    with pytest.raises(ValueError):
+        batcher.plan([PaymentIntent("i-5", 0, DAY, "bank")])
+
+
+@pytest.mark.asyncio
+async def test_submit_reports_outcomes_per_intent() -> None:
+    """Tests submitting a plan with one rejected batch.
+
+    Validates:
+    - Batches are sent `batches_per_call` per request, amounts in units
+    - Accepted intents carry their payment and batch payment ids
+    - A rejected batch is retried as individual payments, so only the bad
+      invoice fails
+    """
+    seen: typing.List[typing.Any] = []
+    client = AsyncClient(
+        oauth_token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=_transport(seen)),
+    )
+    batcher = PaymentBatcher(batches_per_call=2)
+    plan = batcher.plan(
+        [
+            PaymentIntent("i-1", 1050, DAY, "bank", "dep-1", key="r-1"),
+            PaymentIntent("i-2", 2000, DAY, "bank", "dep-1"),
+            PaymentIntent("i-3", 3000, DAY, "bank", "dep-2"),
+            PaymentIntent("bad", 4000, DAY, "bank", "dep-2"),
+            PaymentIntent("i-5", 5000, DAY, "bank", "dep-3"),
+        ]
+    )
+    outcomes = await batcher.submit(
+        client.accounting,
+        plan,
+        xero_tenant_id="YOUR_XERO_TENANT_ID",
+        limiter=RateLimiter(calls_per_minute=60_000),
+    )
+
+    batch_calls = [body for path, body in seen if path.endswith("/BatchPayments")]
+    assert sorted(len(body["BatchPayments"]) for body in batch_calls) == [1, 2]
+    first = next(body for body in batch_calls if len(body["BatchPayments"]) == 2)
+    assert first["BatchPayments"][0]["Payments"][0]["Amount"] == 10.5
+    assert first["BatchPayments"][0]["Reference"] == "dep-1"
+    fallback = [body for path, body in seen if path.endswith("/Payments")]
+    assert [
+        [p["Invoice"]["InvoiceID"] for p in body["Payments"]] for body in fallback
+    ] == [["i-3", "bad"]]
+
+    by_invoice = {o.intent.invoice_id: o for o in outcomes}
+    assert len(outcomes) == 5
+    assert by_invoice["i-1"].ok and by_invoice["i-1"].intent.key == "r-1"
+    assert by_invoice["i-1"].payment_id == "p-i-1"
+    assert by_invoice["i-1"].batch_payment_id is not None
+    assert by_invoice["i-3"].ok and by_invoice["i-3"].batch_payment_id is None
+    assert not by_invoice["bad"].ok
+    assert by_invoice["bad"].errors == ["Invoice not payable"]
+    assert by_invoice["i-5"].ok
+
+
+@pytest.mark.asyncio
+async def test_submit_keeps_outcomes_of_other_calls_on_failure() -> None:
+    """Tests that a failed call only fails the intents of its own batches."""
+    seen: typing.List[typing.Any] = []
+    client = AsyncClient(
+        oauth_token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=_transport(seen)),
+    )
+    batcher = PaymentBatcher(batches_per_call=1)
+    plan = batcher.plan(
+        [
+            PaymentIntent("i-1", 1000, DAY, "bank", "dep-1"),
+            PaymentIntent("i-2", 2000, DAY, "bank", "down"),
+            PaymentIntent("i-3", 3000, DAY, "bank", "down"),
+        ]
+    )
+    outcomes = await batcher.submit(
+        client.accounting,
+        plan,
+        xero_tenant_id="YOUR_XERO_TENANT_ID",
+        limiter=RateLimiter(calls_per_minute=60_000),
+    )
+    assert [o.intent.invoice_id for o in outcomes] == ["i-1", "i-2", "i-3"]
+    assert outcomes[0].ok and outcomes[0].batch_payment_id is not None
+    assert [o.ok for o in outcomes[1:]] == [False, False]
+    assert all(o.errors and o.payment_id is None for o in outcomes[1:])
+    assert not any(path.endswith("/Payments") for path, _ in seen)
+
+
+@pytest.mark.asyncio
+async def test_submit_keeps_accepted_batches_when_fallback_fails() -> None:
+    """Tests that a failed fallback call only fails the rejected intents.
+
+    Validates:
+    - Intents of accepted batches keep their payment and batch payment ids
+    - Intents retried individually report the failed call
+    - Outcomes come back in plan order, including retried intents
+    """
+    seen: typing.List[typing.Any] = []
+    client = AsyncClient(
+        oauth_token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=_transport(seen)),
+    )
+    batcher = PaymentBatcher(batches_per_call=3)
+    plan = batcher.plan(
+        [
+            PaymentIntent("bad-down", 1000, DAY, "bank", "dep-1"),
+            PaymentIntent("i-1", 2000, DAY, "bank", "dep-2"),
+        ]
+    )
+    outcomes = await batcher.submit(
+        client.accounting,
+        plan,
+        xero_tenant_id="YOUR_XERO_TENANT_ID",
+        limiter=RateLimiter(calls_per_minute=60_000),
+    )
+    assert [o.intent.invoice_id for o in outcomes] == ["bad-down", "i-1"]
+    failed, paid = outcomes
+    assert not failed.ok and failed.payment_id is None and failed.errors
+    assert paid.ok and paid.payment_id == "p-i-1"
+    assert paid.batch_payment_id is not None
+    assert [path.rsplit("/", 1)[-1] for path, _ in seen] == [
+        "BatchPayments",
+        "Payments",
+    ]
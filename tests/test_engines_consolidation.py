@@ -0,0 +1,146 @@
+import typing
+
+import httpx
+import pytest
+
+from xero_accounting_py import AsyncClient
+from xero_accounting_py.core import RateLimiter
+from xero_accounting_py.engines import Consolidation
+
+TENANTS: typing.Dict[str, typing.Dict[str, typing.Any]] = {
+    "t-nz": {
+        "name": "Kiwi Ltd",
+        "currency": "NZD",
+        "accounts": [("a-1", "200", "Sales"), ("a-2", "400", "Advertising")],
+        "income": [("a-1", "Sales", "1,000.00")],
+        "expenses": [("a-2", "Advertising", "100.00")],
+    },
+    "t-au": {
+        "name": "Roo Pty",
+        "currency": "AUD",
+        "accounts": [("b-1", "210", "Consulting"), ("b-2", "420", "Entertainment")],
+        "income": [("b-1", "Consulting", "500.00")],
+        "expenses": [("b-2", "Entertainment", "50.00")],
+    },
+}
+
+
+def _rows(
+    title: str, rows: typing.List[typing.Tuple[str, str, str]]
+) -> typing.Dict[str, typing.Any]:
+    return {
+        "RowType": "Section",
+        "Title": title,
+        "Rows": [
+            {
+                "RowType": "Row",
+                "Cells": [
+                    {"Value": value, "Attributes": [{"Id": "account", "Value": id_}]}
+                    for value in (name, amount)
+                ],
+            }
+            for id_, name, amount in rows
+        ],
+    }
+
+
+def _handler(seen: typing.List[httpx.Request]) -> typing.Callable[..., httpx.Response]:
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        tenant = TENANTS[request.headers["xero-tenant-id"]]
+        path = request.url.path
+        if path.endswith("/Organisation"):
+            organisation = {"Name": tenant["name"], "BaseCurrency": tenant["currency"]}
+            return httpx.Response(200, json={"Organisations": [organisation]})
+        if path.endswith("/Accounts"):
+            accounts = [
+                {"AccountID": id_, "Code": code, "Name": name}
+                for id_, code, name in tenant["accounts"]
+            ]
+            return httpx.Response(200, json={"Accounts": accounts})
+        report = {
+            "ReportID": "ProfitAndLoss",
+            "ReportDate": "30 September 2024",
+            "Rows": [
+                {"RowType": "Header", "Cells": [{"Value": ""}, {"Value": "Q1"}]},
+                _rows("Income", tenant["income"]),
+                _rows("Operating Expenses", tenant["expenses"]),
+                {
+                    "RowType": "Section",
+                    "Title": "",
+                    "Rows": [
+                        {
+                            "RowType": "Row",
+                            "Cells": [{"Value": "Net Profit"}, {"Value": "1.00"}],
+                        }
+                    ],
+                },
+            ],
+        }
+        return httpx.Response(200, json={"Reports": [report]})
+
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_run_consolidates_tenants() -> None:
+    """Tests consolidating a profit and loss across two organisations.
+
+    Validates:
+    - Every tenant's report, organisation and accounts are requested
+    - Report query parameters are passed to each report call
+    - Accounts are mapped by code, unmapped ones keep their name
+    - Amounts are converted from each base currency with the rate table
+    - Sections are kept with a total each, computed rows are left out
+    - A base currency without a rate is rejected
+    """
+    seen: typing.List[httpx.Request] = []
+    client = AsyncClient(
+        oauth_token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(_handler(seen))),
+    )
+    limiter = RateLimiter(calls_per_minute=60_000)
+    consolidation = Consolidation(
+        ["t-nz", "t-au"], chart={"200": "Revenue", "210": "Revenue"}
+    )
+    report = (
+        await consolidation.run(
+            client.accounting,
+            "profit_and_loss",
+            currency="NZD",
+            rates={"AUD": 1.1},
+            limiter=limiter,
+            from_date="2024-07-01",
+            to_date="2024-09-30",
+        )
+    ).reports[0]
+    assert len(seen) == 6
+    reports = [r for r in seen if r.url.path.endswith("/ProfitAndLoss")]
+    assert {r.url.params["fromDate"] for r in reports} == {"2024-07-01"}
+
+    assert report.report_name == "Consolidated Profit and Loss"
+    header, income, expenses = report.rows
+    assert [c.value for c in header.cells] == [
+        "Account",
+        "Kiwi Ltd",
+        "Roo Pty",
+        "Consolidated",
+    ]
+    assert income.title == "Income"
+    assert [[c.value for c in row.cells] for row in income.rows] == [
+        ["Revenue", "1000.00", "550.00", "1550.00"],
+        ["Total Income", "1000.00", "550.00", "1550.00"],
+    ]
+    assert [[c.value for c in row.cells] for row in expenses.rows] == [
+        ["Advertising", "100.00", "0.00", "100.00"],
+        ["Entertainment", "0.00", "55.00", "55.00"],
+        ["Total Operating Expenses", "100.00", "55.00", "155.00"],
+    ]
+
+    fetched = await consolidation.fetch(
+        client.accounting, "balance_sheet", limiter=limiter
+    )
+    with pytest.raises(ValueError, match="AUD"):
+        consolidation.consolidate(
+            "balance_sheet", fetched, currency="NZD", rates={"USD": 1.6}
+        )
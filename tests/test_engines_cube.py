@@ -0,0 +1,131 @@
+import datetime
+import typing
+
+import httpx
+import pytest
+
+from xero_accounting_py import AsyncClient
+from xero_accounting_py.core import RateLimiter
+from xero_accounting_py.engines import TrackingCube
+
+from _xero import xero_date
+
+SALES = ("a-sales", "200")
+RENT = ("a-rent", "469")
+CATEGORIES = [
+    {
+        "TrackingCategoryID": "region",
+        "Name": "Region",
+        "Options": [
+            {"TrackingOptionID": "north", "Name": "North"},
+            {"TrackingOptionID": "south", "Name": "South"},
+        ],
+    },
+    {
+        "TrackingCategoryID": "dept",
+        "Name": "Department",
+        "Options": [{"TrackingOptionID": "retail", "Name": "Retail"}],
+    },
+]
+
+
+def _journal(
+    number: int,
+    day: datetime.date,
+    account: typing.Tuple[str, str],
+    amount: float,
+    *options: typing.Tuple[str, str],
+) -> typing.Dict[str, typing.Any]:
+    return {
+        "JournalID": f"j-{number}",
+        "JournalNumber": number,
+        "JournalDate": xero_date(day),
+        "JournalLines": [
+            {
+                "AccountID": account[0],
+                "AccountCode": account[1],
+                "NetAmount": amount,
+                "TrackingCategories": [
+                    {"TrackingCategoryID": c, "TrackingOptionID": o} for c, o in options
+                ],
+            }
+        ],
+    }
+
+
+JULY = datetime.date(2024, 7, 10)
+AUGUST = datetime.date(2024, 8, 10)
+JOURNALS = [
+    _journal(1, JULY, SALES, -100.0, ("region", "north")),
+    _journal(2, JULY, SALES, -40.0, ("region", "south")),
+    _journal(3, JULY, RENT, 30.0),
+    # the first line tagged with a department
+    _journal(4, AUGUST, SALES, -60.0, ("region", "north"), ("dept", "retail")),
+    _journal(5, AUGUST, SALES, -10.0, ("region", "north")),
+    _journal(6, AUGUST, SALES, -5.0, ("region", "north"), ("dept", "retail")),
+]
+
+
+@pytest.mark.asyncio
+async def test_sync_and_rollup() -> None:
+    """Tests building the cube from journals and rolling it up.
+
+    Validates:
+    - Journals and the tracking category catalogue are fetched together
+    - Lines with the same account, month and options share one row
+    - Rollups group by account, month and two tracking categories at once
+    - Rows seen before a category appeared are untagged for it
+    - Month bounds and value filters restrict the rows rolled up
+    - A later sync only applies journals after the offset
+    """
+    journals = JOURNALS[:5]
+    seen: typing.List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        if request.url.path.endswith("/TrackingCategories"):
+            return httpx.Response(200, json={"TrackingCategories": CATEGORIES})
+        offset = int(request.url.params.get("offset", 0))
+        return httpx.Response(
+            200,
+            json={"Journals": [j for j in journals if j["JournalNumber"] > offset]},
+        )
+
+    client = AsyncClient(
+        oauth_token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    limiter = RateLimiter(calls_per_minute=60_000)
+    cube = TrackingCube()
+    assert await cube.sync(client.accounting, xero_tenant_id="T", limiter=limiter) == 5
+    assert seen[0].url.params["includeArchived"] == "true"
+    assert len(cube) == 5
+
+    assert cube.rollup(["account", "month"]) == {
+        ("200", "2024-07"): -14000,
+        ("469", "2024-07"): 3000,
+        ("200", "2024-08"): -7000,
+    }
+    assert cube.rollup(["Region", "Department"]) == {
+        ("North", ""): -11000,
+        ("South", ""): -4000,
+        ("North", "Retail"): -6000,
+        ("", ""): 3000,
+    }
+    assert cube.rollup(["region"], start="2024-08") == {("North",): -7000}
+    assert cube.rollup(
+        ["month"], where={"account": ["200"], "Region": ["North"]}, end="2024-07"
+    ) == {("2024-07",): -10000}
+    with pytest.raises(ValueError, match="Colour"):
+        cube.rollup(["Colour"])
+
+    seen.clear()
+    journals = JOURNALS
+    assert await cube.sync(client.accounting, xero_tenant_id="T", limiter=limiter) == 1
+    journal_requests = [r for r in seen if r.url.path.endswith("/Journals")]
+    assert journal_requests[0].url.params["offset"] == "5"
+    assert len(cube) == 5
+    assert cube.rollup(["Department"], where={"month": ["2024-08"]}) == {
+        ("Retail",): -6500,
+        ("",): -1000,
+    }
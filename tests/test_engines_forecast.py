@@ -0,0 +1,184 @@
+import datetime
+import typing
+
+import httpx
+import pytest
+
+from xero_accounting_py import AsyncClient
+from xero_accounting_py.core import RateLimiter
+from xero_accounting_py.engines import RepeatingForecast
+
+from _xero import xero_date
+
+
+def _template(
+    template_id: str,
+    contact: str,
+    schedule: typing.Dict[str, typing.Any],
+    lines: typing.List[typing.Dict[str, typing.Any]],
+    **extra: typing.Any,
+) -> typing.Dict[str, typing.Any]:
+    return {
+        "RepeatingInvoiceID": template_id,
+        "Type": "ACCREC",
+        "Status": "AUTHORISED",
+        "Contact": {"ContactID": contact, "Name": contact.title()},
+        "CurrencyCode": "NZD",
+        "Schedule": schedule,
+        "LineItems": lines,
+        "Total": sum(line["LineAmount"] for line in lines) * 1.15,
+        **extra,
+    }
+
+
+REGION_NORTH = [{"Name": "Region", "Option": "North"}]
+TEMPLATES = [
+    # monthly on the 31st, clamped in short months, ending in November
+    _template(
+        "r-1",
+        "acme",
+        {
+            "Unit": "MONTHLY",
+            "Period": 1,
+            "StartDate": xero_date(datetime.date(2024, 1, 31)),
+            "NextScheduledDate": xero_date(datetime.date(2024, 6, 30)),
+            "EndDate": xero_date(datetime.date(2024, 11, 15)),
+            "DueDate": 20,
+            "DueDateType": "OFFOLLOWINGMONTH",
+        },
+        [
+            {"AccountCode": "200", "LineAmount": 100.0, "Tracking": REGION_NORTH},
+            {"AccountCode": "260", "LineAmount": 20.0},
+        ],
+    ),
+    # fortnightly
+    _template(
+        "r-2",
+        "globex",
+        {
+            "Unit": "WEEKLY",
+            "Period": 2,
+            "StartDate": xero_date(datetime.date(2024, 1, 1)),
+            "NextScheduledDate": xero_date(datetime.date(2024, 7, 1)),
+            "DueDate": 7,
+            "DueDateType": "DAYSAFTERBILLDATE",
+        },
+        [{"AccountCode": "200", "LineAmount": 10.0, "Tracking": REGION_NORTH}],
+    ),
+    _template(
+        "r-3",
+        "initech",
+        {
+            "Unit": "MONTHLY",
+            "Period": 1,
+            "NextScheduledDate": xero_date(datetime.date(2024, 7, 1)),
+        },
+        [{"AccountCode": "200", "LineAmount": 999.0}],
+        Status="DRAFT",
+    ),
+]
+
+
+@pytest.mark.asyncio
+async def test_forecast() -> None:
+    """Tests expanding schedules and aggregating a forecast.
+
+    Validates:
+    - Monthly schedules keep their day of month and stop at the end date
+    - Weekly schedules step by their period
+    - Due dates follow the payment terms
+    - Line amounts aggregate by contact, account and tracking option
+    - Draft templates are left out by default
+    """
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"RepeatingInvoices": TEMPLATES})
+
+    client = AsyncClient(
+        oauth_token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    forecast = RepeatingForecast()
+    await forecast.load(
+        client.accounting,
+        xero_tenant_id="T",
+        limiter=RateLimiter(calls_per_minute=60_000),
+    )
+
+    occurrences = forecast.occurrences(
+        datetime.date(2024, 7, 1), datetime.date(2024, 12, 1)
+    )
+    acme = [o for o in occurrences if o.repeating_invoice_id == "r-1"]
+    assert [o.date.isoformat() for o in acme] == [
+        "2024-07-31",
+        "2024-08-31",
+        "2024-09-30",
+        "2024-10-31",
+    ]
+    assert acme[0].due_date == datetime.date(2024, 8, 20)
+    assert acme[0].total == 13800
+    globex = [o for o in occurrences if o.repeating_invoice_id == "r-2"]
+    assert [o.date.day for o in globex[:3]] == [1, 15, 29]
+    assert globex[0].due_date == datetime.date(2024, 7, 8)
+
+    start = datetime.date(2024, 7, 1)
+    assert forecast.forecast(start, months=3) == {
+        "acme": [12000, 12000, 12000],
+        # fortnights starting 1, 15 and 29 July, 12 and 26 August, ...
+        "globex": [3000, 2000, 2000],
+    }
+    assert forecast.forecast(start, months=3, by="account") == {
+        "200": [13000, 12000, 12000],
+        "260": [2000, 2000, 2000],
+    }
+    assert forecast.forecast(start, months=3, by="tracking") == {
+        "Region: North": [13000, 12000, 12000],
+        "": [2000, 2000, 2000],
+    }
+
+    report = forecast.summary(start, months=3).reports[0]
+    header, *rows, total = report.rows
+    assert [c.value for c in header.cells] == [
+        "Contact",
+        "Jul 2024",
+        "Aug 2024",
+        "Sep 2024",
+        "Total",
+    ]
+    assert [row.cells[0].value for row in rows] == ["Acme", "Globex"]
+    assert total.cells[-1].value == "430.00"
+
+
+@pytest.mark.asyncio
+async def test_forecast_keeps_currencies_apart() -> None:
+    """Tests that templates in different currencies are not added together.
+
+    Validates:
+    - A window holding several currencies is rejected
+    - Passing a currency forecasts only the templates in it
+    """
+    usd = dict(TEMPLATES[0], RepeatingInvoiceID="r-usd", CurrencyCode="USD")
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"RepeatingInvoices": [*TEMPLATES, usd]})
+
+    client = AsyncClient(
+        oauth_token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    forecast = RepeatingForecast()
+    await forecast.load(
+        client.accounting,
+        xero_tenant_id="T",
+        limiter=RateLimiter(calls_per_minute=60_000),
+    )
+    start = datetime.date(2024, 7, 1)
+    with pytest.raises(ValueError, match="NZD, USD"):
+        forecast.forecast(start, months=3)
+    with pytest.raises(ValueError):
+        forecast.summary(start, months=3)
+    assert forecast.forecast(start, months=3, currency="USD") == {
+        "acme": [12000, 12000, 12000]
+    }
+    report = forecast.summary(start, months=3, currency="NZD").reports[0]
+    assert report.rows[-1].cells[-1].value == "430.00"
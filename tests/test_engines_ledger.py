@@ -0,0 +1,208 @@
+import datetime
+import random
+import typing
+
+import httpx
+import pytest
+
+from xero_accounting_py import AsyncClient
+from xero_accounting_py.core import RateLimiter
+from xero_accounting_py.core.utils import rebuild_model
+from xero_accounting_py.engines import Ledger
+from xero_accounting_py.engines.ledger import Discrepancy
+from xero_accounting_py.types import models
+
+from _xero import xero_date
+
+BANK = ("a-bank", "090", "Business Bank Account", "BANK")
+SALES = ("a-sales", "200", "Sales", "REVENUE")
+EQUITY = ("a-re", "960", "Retained Earnings", "EQUITY")
+START = datetime.date(2023, 12, 1)
+
+
+def _line(
+    account: typing.Tuple[str, str, str, str], amount: float, option: str = ""
+) -> typing.Dict[str, typing.Any]:
+    account_id, code, name, account_type = account
+    line: typing.Dict[str, typing.Any] = {
+        "AccountID": account_id,
+        "AccountCode": code,
+        "AccountName": name,
+        "AccountType": account_type,
+        "NetAmount": amount,
+    }
+    if option:
+        line["TrackingCategories"] = [
+            {"TrackingCategoryID": "region", "TrackingOptionID": option}
+        ]
+    return line
+
+
+def _journal(number: int) -> typing.Dict[str, typing.Any]:
+    # one 10.00 cash sale per day, alternating between two regions
+    day = START + datetime.timedelta(days=number - 1)
+    option = "north" if number % 2 else "south"
+    return {
+        "JournalID": f"j-{number}",
+        "JournalNumber": number,
+        "JournalDate": xero_date(day),
+        "JournalLines": [_line(BANK, 10.0), _line(SALES, -10.0, option)],
+    }
+
+
+def _transport(seen: typing.List[httpx.Request], journals: int) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        if request.url.path.endswith("/Journals"):
+            offset = int(request.url.params.get("offset", 0))
+            numbers = range(offset + 1, min(offset + 100, journals) + 1)
+            return httpx.Response(
+                200, json={"Journals": [_journal(n) for n in numbers]}
+            )
+        # the API trial balance disagrees on the bank account by one cent
+        cells = [
+            [BANK, "", "", "2500.01", ""],
+            [SALES, "", "", "", "2190.00"],
+            [EQUITY, "", "", "", "310.00"],
+        ]
+        rows = [
+            {
+                "RowType": "Row",
+                "Cells": [
+                    {
+                        "Value": value,
+                        "Attributes": [{"Id": "account", "Value": account[0]}],
+                    }
+                    for value in [account[2], *row]
+                ],
+            }
+            for account, *row in cells
+        ]
+        return httpx.Response(
+            200,
+            json={
+                "Reports": [
+                    {
+                        "ReportID": "TrialBalance",
+                        "Rows": [{"RowType": "Section", "Rows": rows}],
+                    }
+                ]
+            },
+        )
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.mark.asyncio
+async def test_sync_trial_balance_and_reconcile() -> None:
+    """Tests incremental journal sync, local balances and reconciliation.
+
+    Validates:
+    - Journals are fetched in concurrent offset windows and applied once
+    - Balances are answered per account, date and tracking option
+    - The trial balance report folds prior-year revenue into equity
+    - Reconciliation reports the accounts that differ from the API
+    """
+    seen: typing.List[httpx.Request] = []
+    client = AsyncClient(
+        oauth_token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=_transport(seen, 230)),
+    )
+    limiter = RateLimiter(calls_per_minute=60_000)
+    ledger = Ledger()
+    applied = await ledger.sync(
+        client.accounting, xero_tenant_id="YOUR_XERO_TENANT_ID", limiter=limiter
+    )
+    assert applied == 230
+    assert ledger.offset == 230
+    assert len(seen) == 5
+
+    as_at = START + datetime.timedelta(days=249)
+    assert ledger.balance("a-bank", as_at) == 230000
+    assert ledger.balance("a-bank", START) == 1000
+    assert ledger.balance("a-sales", as_at, tracking_option_id="north") == -115000
+    assert ledger.balances(START + datetime.timedelta(days=1)) == {
+        "a-bank": 2000,
+        "a-sales": -2000,
+    }
+
+    seen.clear()
+    client = AsyncClient(
+        oauth_token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=_transport(seen, 250)),
+    )
+    assert (
+        await ledger.sync(
+            client.accounting, xero_tenant_id="YOUR_XERO_TENANT_ID", limiter=limiter
+        )
+        == 20
+    )
+    assert seen[0].url.params["offset"] == "230"
+    assert ledger.balance("a-bank", as_at) == 250000
+
+    year_start = datetime.date(2024, 1, 1)
+    report = ledger.trial_balance(
+        as_at, year_start=year_start, retained_earnings_account_id="a-re"
+    ).reports[0]
+    header, *sections, total = report.rows
+    assert [cell.value for cell in header.cells][-2:] == ["YTD Debit", "YTD Credit"]
+    assert [section.title for section in sections] == ["Revenue", "Assets", "Equity"]
+    sales = sections[0].rows[0]
+    assert sales.cells[0].value == "Sales (200)"
+    assert sales.cells[0].attributes[0].value == "a-sales"
+    assert sales.cells[4].value == "2190.00"
+    assert sections[2].rows[0].cells[4].value == "310.00"
+    assert [cell.value for cell in total.rows[0].cells][-2:] == ["2500.00", "2500.00"]
+
+    date, discrepancies = await ledger.reconcile(
+        client.accounting,
+        xero_tenant_id="YOUR_XERO_TENANT_ID",
+        date=as_at,
+        year_start=year_start,
+        retained_earnings_account_id="a-re",
+        limiter=limiter,
+    )
+    assert date == as_at
+    assert seen[-1].url.params["date"] == as_at.isoformat()
+    assert discrepancies == [
+        Discrepancy(
+            account_id="a-bank",
+            name="Business Bank Account",
+            local=250000,
+            remote=250001,
+        )
+    ]
+
+    sampled, _ = await ledger.reconcile(
+        client.accounting,
+        xero_tenant_id="YOUR_XERO_TENANT_ID",
+        limiter=limiter,
+        rng=random.Random(7),
+    )
+    assert START <= sampled <= as_at
+
+
+def test_year_to_date_folds_accounts_that_net_to_zero() -> None:
+    """Tests that prior-year movements of a zero balance reach retained earnings."""
+    rebuild_model(models.Journal)
+    postings = [
+        (1, datetime.date(2023, 6, 1), -1000.0),
+        (2, datetime.date(2024, 3, 1), 1000.0),
+    ]
+    ledger = Ledger()
+    ledger.apply(
+        models.Journal.model_validate(
+            {
+                "JournalNumber": number,
+                "JournalDate": xero_date(day),
+                "JournalLines": [_line(SALES, amount), _line(BANK, -amount)],
+            }
+        )
+        for number, day, amount in postings
+    )
+    assert ledger.balances(datetime.date(2024, 6, 30)) == {}
+    assert ledger.year_to_date(
+        datetime.date(2024, 6, 30),
+        year_start=datetime.date(2024, 1, 1),
+        retained_earnings_account_id="a-re",
+    ) == {"a-sales": 100000, "a-re": -100000}
@@ -0,0 +1,123 @@
+import asyncio
+import datetime
+import typing
+
+import httpx
+import pytest
+from make_api_request import ApiError
+
+from xero_accounting_py import AsyncClient
+from xero_accounting_py.core import RateLimiter
+from xero_accounting_py.core.utils import rebuild_model
+from xero_accounting_py.engines import (
+    OrganisationProfile,
+    OrganisationProfiles,
+    PeriodPlanner,
+)
+from xero_accounting_py.types import models
+
+ORGANISATION = {
+    "OrganisationID": "o-1",
+    "Name": "Kiwi Ltd",
+    "BaseCurrency": "NZD",
+    "FinancialYearEndDay": 30,
+    "FinancialYearEndMonth": 6,
+    "PeriodLockDate": "2024-08-31T00:00:00",
+    "EndOfYearLockDate": "/Date(1727654400000+0000)/",  # 30 September 2024
+    "Timezone": "NEWZEALANDSTANDARDTIME",
+}
+
+
+@pytest.mark.asyncio
+async def test_profiles_are_cached_per_tenant() -> None:
+    """Tests caching organisation profiles.
+
+    Validates:
+    - Concurrent gets for a tenant share one organisation call
+    - Profiles are fetched again once their time to live has passed
+    - Failures are not cached
+    """
+    calls: typing.List[str] = []
+    now = [0.0]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        tenant = request.headers["xero-tenant-id"]
+        calls.append(tenant)
+        if tenant == "broken" and calls.count("broken") == 1:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"Organisations": [ORGANISATION]})
+
+    client = AsyncClient(
+        oauth_token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    limiter = RateLimiter(calls_per_minute=60_000)
+    profiles = OrganisationProfiles(ttl=60.0, clock=lambda: now[0])
+
+    first, second = await asyncio.gather(
+        profiles.get(client.accounting, xero_tenant_id="T", limiter=limiter),
+        profiles.get(client.accounting, xero_tenant_id="T", limiter=limiter),
+    )
+    assert first is second
+    assert calls == ["T"]
+    assert first.base_currency == "NZD"
+    assert first.lock_date == datetime.date(2024, 9, 30)
+
+    now[0] = 61.0
+    await profiles.get(client.accounting, xero_tenant_id="T", limiter=limiter)
+    assert calls == ["T", "T"]
+
+    with pytest.raises(ApiError):
+        await profiles.get(client.accounting, xero_tenant_id="broken", limiter=limiter)
+    profile = await profiles.get(
+        client.accounting, xero_tenant_id="broken", limiter=limiter
+    )
+    assert profile.name == "Kiwi Ltd"
+
+
+def test_planner_windows() -> None:
+    """Tests planning report windows from the financial year and lock dates.
+
+    Validates:
+    - Quarters and year to date follow the financial year end
+    - Periods ending on or before the lock date are locked
+    - Refresh skips locked periods already fetched but keeps unlocked ones
+    """
+    rebuild_model(models.Organisation)
+    profile = OrganisationProfile.from_organisation(
+        models.Organisation.model_validate(ORGANISATION)
+    )
+    planner = PeriodPlanner(profile)
+
+    year = planner.year(datetime.date(2024, 10, 15))
+    assert (year.label, year.from_date, year.to_date) == (
+        "FY2025",
+        datetime.date(2024, 7, 1),
+        datetime.date(2025, 6, 30),
+    )
+    quarters = planner.quarters(datetime.date(2024, 10, 15))
+    assert [(q.label, q.from_date, q.to_date, q.locked) for q in quarters] == [
+        ("Q1 FY2025", datetime.date(2024, 7, 1), datetime.date(2024, 9, 30), True),
+        ("Q2 FY2025", datetime.date(2024, 10, 1), datetime.date(2024, 12, 31), False),
+        ("Q3 FY2025", datetime.date(2025, 1, 1), datetime.date(2025, 3, 31), False),
+        ("Q4 FY2025", datetime.date(2025, 4, 1), datetime.date(2025, 6, 30), False),
+    ]
+    ytd = planner.year_to_date(datetime.date(2024, 6, 30))
+    assert (ytd.label, ytd.from_date, ytd.locked) == (
+        "YTD FY2024",
+        datetime.date(2023, 7, 1),
+        True,
+    )
+    assert ytd.query == {"from_date": "2023-07-01", "to_date": "2024-06-30"}
+
+    months = planner.months(datetime.date(2024, 8, 15), datetime.date(2024, 10, 1))
+    assert [(m.label, m.to_date, m.locked) for m in months] == [
+        ("2024-08", datetime.date(2024, 8, 31), True),
+        ("2024-09", datetime.date(2024, 9, 30), True),
+        ("2024-10", datetime.date(2024, 10, 31), False),
+    ]
+    fetched = {(m.from_date, m.to_date) for m in months[:1]}
+    assert [m.label for m in planner.refresh(months, fetched)] == [
+        "2024-09",
+        "2024-10",
+    ]
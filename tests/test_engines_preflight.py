@@ -0,0 +1,180 @@
+import json
+import typing
+
+import httpx
+import pytest
+
+from xero_accounting_py import AsyncClient
+from xero_accounting_py.core import RateLimiter
+from xero_accounting_py.core.utils import rebuild_model
+from xero_accounting_py.engines import Preflight, ReferenceData
+from xero_accounting_py.types import models
+
+
+def _reference() -> ReferenceData:
+    for model in (models.Account, models.TaxRate, models.Currency):
+        rebuild_model(model)
+    reference = ReferenceData()
+    reference.update(
+        accounts=[
+            models.Account.model_validate(account)
+            for account in [
+                {"AccountID": "a-200", "Code": "200", "Status": "ACTIVE"},
+                {"AccountID": "a-400", "Code": "400", "Status": "ACTIVE"},
+                {
+                    "AccountID": "a-090",
+                    "Code": "090",
+                    "Type": "BANK",
+                    "Status": "ACTIVE",
+                    "CurrencyCode": "NZD",
+                },
+            ]
+        ],
+        tax_rates=[
+            models.TaxRate.model_validate(
+                {"Name": "GST on Income", "TaxType": "OUTPUT2", "Status": "ACTIVE"}
+            )
+        ],
+        currencies=[
+            models.Currency.model_validate({"Code": code}) for code in ("NZD", "AUD")
+        ],
+    )
+    return reference
+
+
+def test_check_bank_transactions_and_invoices() -> None:
+    """Tests validating bank transactions and invoices.
+
+    Validates:
+    - Required keys of the params TypedDict are enforced
+    - Currency must match the bank account and be enabled
+    - Authorised line items need a description and a known account
+    - Draft invoices may have incomplete line items
+    - Status updates of existing invoices do not need a contact
+    - Valid records come back resolved
+    """
+    preflight = Preflight(_reference())
+    line = {"description": "Sale", "account_code": "200", "tax_type": "GST on Income"}
+    checked = preflight.check(
+        "bank_transactions",
+        [
+            {
+                "type_": "RECEIVE",
+                "contact": {"name": "Acme"},
+                "bank_account": {"code": "090"},
+                "line_items": [line],
+            },
+            {
+                "type_": "RECEIVE",
+                "contact": {"name": "Acme"},
+                "bank_account": {"code": "090"},
+                "currency_code": "AUD",
+                "line_items": [{"account_code": "999"}],
+            },
+            {"type_": "SPEND", "bank_account": {"code": "200"}},
+        ],
+    )
+    assert [v["line_items"][0]["tax_type"] for v in checked.valid] == ["OUTPUT2"]
+    assert [(r.position, r.errors) for r in checked.rejected] == [
+        (
+            1,
+            [
+                "currency AUD does not match the bank account's NZD",
+                "line_items[0]: unknown account code '999'",
+                "line_items[0]: description is required",
+            ],
+        ),
+        (
+            2,
+            [
+                "line_items is required",
+                "contact is required",
+                "account '200' is not an active bank account",
+            ],
+        ),
+    ]
+
+    checked = preflight.check(
+        "invoices",
+        [
+            {
+                "type_": "ACCREC",
+                "status": "DRAFT",
+                "contact": {"contact_id": "c-1"},
+                "line_items": [{"description": "To be confirmed"}],
+            },
+            {
+                "type_": "ACCREC",
+                "status": "AUTHORISED",
+                "contact": {"contact_id": "c-1"},
+                "currency_code": "USD",
+                "line_items": [{"description": "To be confirmed"}],
+            },
+            {"invoice_id": "inv-1", "status": "AUTHORISED"},
+            {"invoice_id": "inv-2", "status": "VOIDED"},
+            {"type_": "ACCREC", "status": "DRAFT"},
+        ],
+    )
+    assert [v.get("invoice_id") for v in checked.valid] == [None, "inv-1", "inv-2"]
+    assert checked.rejected[1].errors == ["contact is required"]
+    assert checked.rejected[0].errors == [
+        "currency USD is not enabled",
+        "line_items[0]: account is required",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_send_manual_journals() -> None:
+    """Tests that only balanced manual journals are sent.
+
+    Validates:
+    - Unbalanced journals and journals missing a narration are rejected
+    - The valid journals are sent in one call, resolved
+    """
+    sent: typing.List[typing.Any] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        sent.append(body)
+        return httpx.Response(200, json=body)
+
+    client = AsyncClient(
+        oauth_token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    balanced = {
+        "narration": "Accrual",
+        "journal_lines": [
+            {"account_code": "200", "line_amount": 100.1},
+            {"account_code": "400", "line_amount": -100.1},
+        ],
+    }
+    response, rejected = await Preflight(_reference()).send(
+        client.accounting,
+        "manual_journals",
+        [
+            balanced,
+            dict(balanced, journal_lines=balanced["journal_lines"][:1]),
+            {"narration": "", "journal_lines": balanced["journal_lines"]},
+        ],
+        xero_tenant_id="T",
+        limiter=RateLimiter(calls_per_minute=60_000),
+    )
+    assert [(r.position, r.errors) for r in rejected] == [
+        (
+            1,
+            [
+                "at least two journal lines are required",
+                "journal lines are out of balance by 100.10",
+            ],
+        ),
+        (2, ["narration is required"]),
+    ]
+    assert len(sent) == 1
+    assert [
+        line["AccountID"] for line in sent[0]["ManualJournals"][0]["JournalLines"]
+    ] == [
+        "a-200",
+        "a-400",
+    ]
+    assert len(response.manual_journals) == 1
@@ -0,0 +1,174 @@
+import datetime
+import typing
+
+import httpx
+import pytest
+
+from xero_accounting_py import ApiError, AsyncClient
+from xero_accounting_py.core import RateLimiter
+from xero_accounting_py.engines import ProjectsSync
+from xero_accounting_py.engines.dates import format_utc, parse_utc
+
+START = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def _entries(project_id: str, count: int) -> typing.List[typing.Dict[str, typing.Any]]:
+    return [
+        {
+            "timeEntryId": f"{project_id}-{n}",
+            "projectId": project_id,
+            "dateUtc": format_utc(START + datetime.timedelta(hours=n)),
+            "duration": 60,
+        }
+        for n in range(count)
+    ]
+
+
+TIME = {"p-1": _entries("p-1", 5), "p-2": _entries("p-2", 30)}
+
+
+def _page(
+    items: typing.List[typing.Any], request: httpx.Request
+) -> typing.Dict[str, typing.Any]:
+    page = int(request.url.params.get("page", 1))
+    size = int(request.url.params.get("pageSize", 50))
+    return {
+        "items": items[(page - 1) * size : page * size],
+        "pagination": {
+            "page": page,
+            "pageSize": size,
+            "pageCount": max(1, -(-len(items) // size)),
+            "itemCount": len(items),
+        },
+    }
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    parts = request.url.path.split("/Projects")[-1].strip("/").split("/")
+    if parts == [""]:
+        projects = [{"projectId": pid, "name": pid} for pid in sorted(TIME)]
+        return httpx.Response(200, json=_page(projects, request))
+    if parts[1] == "Tasks":
+        tasks = [{"taskId": f"{parts[0]}-task", "name": "Design"}]
+        return httpx.Response(200, json=_page(tasks, request))
+    entries = TIME[parts[0]]
+    after = request.url.params.get("dateAfterUtc")
+    before = request.url.params.get("dateBeforeUtc")
+    if after:
+        entries = [e for e in entries if parse_utc(e["dateUtc"]) >= parse_utc(after)]
+    if before:
+        entries = [e for e in entries if parse_utc(e["dateUtc"]) <= parse_utc(before)]
+    return httpx.Response(200, json=_page(entries, request))
+
+
+def _transport(seen: typing.List[httpx.Request]) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return _handler(request)
+
+    return httpx.MockTransport(handler)
+
+
+def _client(seen: typing.List[httpx.Request]) -> AsyncClient:
+    return AsyncClient(
+        oauth_token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=_transport(seen)),
+    )
+
+
+def test_parse_utc() -> None:
+    """Tests parsing of the timestamp formats returned by the Projects API."""
+    expected = datetime.datetime(2024, 1, 1, 9, 30, tzinfo=datetime.timezone.utc)
+    assert parse_utc("2024-01-01T09:30:00Z") == expected
+    assert parse_utc("2024-01-01T09:30:00") == expected
+    assert parse_utc("2024-01-01T09:30:00.0000000Z") == expected
+    assert parse_utc("/Date(1704101400000+0000)/") == expected
+    assert format_utc(expected) == "2024-01-01T09:30:00Z"
+
+
+@pytest.mark.asyncio
+async def test_sync_time_entries_windows_and_watermarks() -> None:
+    """Tests a full sync of time entries and tasks across paged projects.
+
+    Validates:
+    - Every entry is yielded exactly once, including across split windows
+    - Tasks are collected per project
+    - Watermarks hold the latest entry date per project
+    - A rerun with the watermarks only fetches entries on or after them
+    """
+    seen: typing.List[httpx.Request] = []
+    sync = ProjectsSync(
+        _client(seen).projects,
+        xero_tenant_id="YOUR_XERO_TENANT_ID",
+        limiter=RateLimiter(max_concurrent=4, calls_per_minute=60_000),
+        start=START,
+        page_size=2,
+        window_pages=3,
+    )
+    entries = [entry async for entry in sync.time_entries()]
+
+    ids = sorted(entry.time_entry_id for entry in entries)
+    assert ids == sorted(e["timeEntryId"] for e in TIME["p-1"] + TIME["p-2"])
+    assert {p.project_id for p in sync.projects} == {"p-1", "p-2"}
+    assert sync.tasks["p-2"][0].task_id == "p-2-task"
+    assert sync.watermarks["p-2"] == START + datetime.timedelta(hours=29)
+    assert all(r.headers["xero-tenant-id"] == "YOUR_XERO_TENANT_ID" for r in seen)
+    assert any("dateBeforeUtc" in r.url.params for r in seen)
+
+    rerun = ProjectsSync(
+        _client(seen).projects,
+        xero_tenant_id="YOUR_XERO_TENANT_ID",
+        since=sync.watermarks,
+        include_tasks=False,
+    )
+    assert sorted([e.time_entry_id async for e in rerun.time_entries()]) == [
+        "p-1-4",
+        "p-2-29",
+    ]
+    assert rerun.tasks == {}
+
+
+@pytest.mark.asyncio
+async def test_first_sync_without_start_is_windowed() -> None:
+    """Tests that a first sync with no start date still splits large projects.
+
+    Validates:
+    - Windows are split from the epoch, the earliest one left open below
+    - Every entry is yielded exactly once
+    """
+    seen: typing.List[httpx.Request] = []
+    sync = ProjectsSync(
+        _client(seen).projects,
+        xero_tenant_id="YOUR_XERO_TENANT_ID",
+        limiter=RateLimiter(max_concurrent=4, calls_per_minute=60_000),
+        page_size=2,
+        window_pages=3,
+        include_tasks=False,
+    )
+    entries = [entry async for entry in sync.time_entries()]
+
+    assert sorted(e.time_entry_id for e in entries) == sorted(
+        e["timeEntryId"] for e in TIME["p-1"] + TIME["p-2"]
+    )
+    windowed = [r for r in seen if "dateBeforeUtc" in r.url.params]
+    assert windowed
+    assert any("dateAfterUtc" not in r.url.params for r in windowed)
+
+
+@pytest.mark.asyncio
+async def test_sync_time_entries_propagates_errors() -> None:
+    """Tests that a failed request ends the stream with an ApiError."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/Time"):
+            return httpx.Response(500, json={"message": "boom"})
+        return _handler(request)
+
+    client = AsyncClient(
+        oauth_token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    sync = ProjectsSync(client.projects, xero_tenant_id="YOUR_XERO_TENANT_ID")
+    with pytest.raises(ApiError) as excinfo:
+        _ = [entry async for entry in sync.time_entries()]
+    assert excinfo.value.status_code == 500
@@ -0,0 +1,132 @@
+import datetime
+import typing
+
+import httpx
+import pytest
+
+from xero_accounting_py import AsyncClient
+from xero_accounting_py.core import RateLimiter
+from xero_accounting_py.engines import ReconciliationMatcher, StatementLine
+
+from _xero import invoice, xero_date
+
+ACME = {"ContactID": "c-1", "Name": "Acme Ltd"}
+
+
+BANK_TRANSACTIONS = [
+    {
+        "BankTransactionID": "bt-1",
+        "Type": "SPEND",
+        "Status": "AUTHORISED",
+        "IsReconciled": False,
+        "Date": xero_date(datetime.date(2024, 6, 3)),
+        "Total": 45.0,
+        "Reference": "Fuel",
+        "BankAccount": {"AccountID": "bank"},
+        "Contact": {"ContactID": "c-2", "Name": "Petrol Co"},
+        "LineItems": [],
+    },
+    {
+        "BankTransactionID": "bt-2",
+        "Type": "SPEND",
+        "Status": "AUTHORISED",
+        "IsReconciled": False,
+        "Date": xero_date(datetime.date(2024, 6, 5)),
+        "Total": 45.0,
+        "Reference": "Parking",
+        "BankAccount": {"AccountID": "bank"},
+        "Contact": {"ContactID": "c-3", "Name": "City Parking"},
+        "LineItems": [],
+    },
+]
+PAYMENTS = [
+    {
+        "PaymentID": "p-1",
+        "PaymentType": "ACCRECPAYMENT",
+        "Status": "AUTHORISED",
+        "IsReconciled": False,
+        "Date": xero_date(datetime.date(2024, 6, 10)),
+        "Amount": 120.0,
+        "Reference": "Remittance 8812",
+        "Invoice": {"InvoiceID": "i-9", "InvoiceNumber": "INV-0009", "Contact": ACME},
+    }
+]
+INVOICES = [
+    invoice(
+        "i-1",
+        ACME,
+        issued=datetime.date(2024, 5, 20),
+        due=datetime.date(2024, 6, 20),
+        amount_due=300.0,
+        InvoiceNumber="INV-0042",
+    )
+]
+
+
+def _transport(seen: typing.List[httpx.Request]) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        endpoint = request.url.path.rsplit("/", 1)[-1]
+        records = {
+            "BankTransactions": BANK_TRANSACTIONS,
+            "Payments": PAYMENTS,
+            "Invoices": INVOICES,
+        }[endpoint]
+        return httpx.Response(
+            200,
+            json={
+                endpoint: records,
+                "pagination": {"page": 1, "pageCount": 1, "itemCount": len(records)},
+            },
+        )
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.mark.asyncio
+async def test_propose() -> None:
+    """Tests proposing matches for statement lines.
+
+    Validates:
+    - Unreconciled records of the bank account are requested
+    - Equal amounts are told apart by date and reference tokens
+    - A partial invoice payment is found through its invoice number
+    - Each candidate is proposed for at most one line
+    - Lines without a good enough candidate are left out
+    """
+    seen: typing.List[httpx.Request] = []
+    client = AsyncClient(
+        oauth_token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=_transport(seen)),
+    )
+    matcher = ReconciliationMatcher()
+    await matcher.load(
+        client.accounting,
+        xero_tenant_id="T",
+        bank_account_id="bank",
+        limiter=RateLimiter(calls_per_minute=60_000),
+    )
+    wheres = {r.url.path.rsplit("/", 1)[-1]: r.url.params.get("where") for r in seen}
+    assert wheres["BankTransactions"] == (
+        'IsReconciled==false&&Status=="AUTHORISED"'
+        '&&BankAccount.AccountID==Guid("bank")'
+    )
+
+    lines = [
+        StatementLine("l-1", datetime.date(2024, 6, 5), -4500, "CITY PARKING 0611"),
+        StatementLine("l-2", datetime.date(2024, 6, 4), -4500, "PETROL CO"),
+        StatementLine("l-3", datetime.date(2024, 6, 11), 12000, "ACME 8812"),
+        StatementLine("l-4", datetime.date(2024, 6, 18), 10000, "ACME INV 42"),
+        StatementLine("l-5", datetime.date(2024, 6, 4), -4500, "PETROL CO"),
+        StatementLine("l-6", datetime.date(2024, 6, 4), 999, "UNKNOWN"),
+    ]
+    matches = {m.line.line_id: m for m in matcher.propose(lines)}
+    assert {k: m.candidate.record_id for k, m in matches.items()} == {
+        "l-1": "bt-2",
+        "l-2": "bt-1",
+        "l-3": "p-1",
+        "l-4": "i-1",
+    }
+    # two of the three line tokens are on the transaction
+    assert matches["l-1"].score == pytest.approx(0.9)
+    assert matches["l-4"].score < matches["l-3"].score
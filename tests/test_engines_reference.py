@@ -0,0 +1,155 @@
+import typing
+
+import httpx
+import pytest
+
+from xero_accounting_py import AsyncClient
+from xero_accounting_py.core import RateLimiter
+from xero_accounting_py.engines import ReferenceData, ResolutionError
+
+ACCOUNTS = [
+    {
+        "AccountID": "a-200",
+        "Code": "200",
+        "Name": "Sales",
+        "Status": "ACTIVE",
+        "UpdatedDateUTC": "/Date(1717200000000+0000)/",
+    },
+    {
+        "AccountID": "a-260",
+        "Code": "260",
+        "Name": "Other Revenue",
+        "Status": "ARCHIVED",
+        "UpdatedDateUTC": "/Date(1717200000000+0000)/",
+    },
+]
+TAX_RATES = [
+    {"Name": "GST on Income", "TaxType": "OUTPUT2", "Status": "ACTIVE"},
+    {"Name": "No GST", "TaxType": "NONE", "Status": "ACTIVE"},
+]
+TRACKING_CATEGORIES = [
+    {
+        "TrackingCategoryID": "tc-1",
+        "Name": "Region",
+        "Status": "ACTIVE",
+        "Options": [
+            {"TrackingOptionID": "to-1", "Name": "North", "Status": "ACTIVE"},
+            {"TrackingOptionID": "to-2", "Name": "South", "Status": "ACTIVE"},
+        ],
+    }
+]
+ITEMS = [
+    {
+        "ItemID": "it-1",
+        "Code": "WIDGET",
+        "Description": "Blue widget",
+        "SalesDetails": {"UnitPrice": 12.5, "AccountCode": "200", "TaxType": "OUTPUT2"},
+        "UpdatedDateUTC": "/Date(1717200000000+0000)/",
+    }
+]
+CURRENCIES = [{"Code": "NZD", "Description": "New Zealand Dollar"}]
+
+
+def _transport(seen: typing.List[httpx.Request]) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        endpoint = request.url.path.rsplit("/", 1)[-1]
+        body = {
+            "Accounts": ACCOUNTS,
+            "TaxRates": TAX_RATES,
+            "TrackingCategories": TRACKING_CATEGORIES,
+            "Items": ITEMS,
+            "Currencies": CURRENCIES,
+        }
+        if "where" in request.url.params:
+            # incremental sync: account 200 was renamed since
+            body = {
+                "Accounts": [dict(ACCOUNTS[0], Code="201")],
+                "TaxRates": TAX_RATES,
+                "TrackingCategories": TRACKING_CATEGORIES,
+                "Items": [],
+                "Currencies": CURRENCIES,
+            }
+        return httpx.Response(200, json={endpoint: body[endpoint]})
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.mark.asyncio
+async def test_sync_and_resolve() -> None:
+    """Tests resolving a batch of line items against synced reference data.
+
+    Validates:
+    - Account codes, tax rate names and tracking names resolve to ids
+    - Item defaults fill in fields the line item leaves out
+    - Every problem in the batch is reported with its line and field
+    - An incremental sync filters on UpdatedDateUTC and re-indexes codes
+    - Syncing is unaffected by a client-wide raw default
+    """
+    seen: typing.List[httpx.Request] = []
+    client = AsyncClient(
+        oauth_token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=_transport(seen)),
+        raw="json",
+    )
+    reference = ReferenceData()
+    limiter = RateLimiter(calls_per_minute=60_000)
+    await reference.sync(client.accounting, xero_tenant_id="T", limiter=limiter)
+
+    resolution = reference.resolve(
+        [
+            {
+                "description": "Consulting",
+                "account_code": "200",
+                "tax_type": "gst on income",
+                "tracking": [{"name": "region", "option": "NORTH"}],
+            },
+            {"item_code": "widget", "quantity": 2.0},
+            {
+                "account_code": "260",
+                "tax_type": "EXEMPT",
+                "tracking": [{"name": "Region", "option": "East"}],
+            },
+        ]
+    )
+    first, second, _ = resolution.line_items
+    assert first == {
+        "description": "Consulting",
+        "account_code": "200",
+        "account_id": "a-200",
+        "tax_type": "OUTPUT2",
+        "tracking": [
+            {
+                "name": "Region",
+                "option": "North",
+                "tracking_category_id": "tc-1",
+                "tracking_option_id": "to-1",
+            }
+        ],
+    }
+    assert second == {
+        "item_code": "WIDGET",
+        "quantity": 2.0,
+        "account_code": "200",
+        "account_id": "a-200",
+        "tax_type": "OUTPUT2",
+        "unit_amount": 12.5,
+        "description": "Blue widget",
+    }
+    assert not resolution.ok
+    assert resolution.errors == [
+        ResolutionError(2, "account_code", "account '260' is archived"),
+        ResolutionError(2, "tax_type", "unknown tax type 'EXEMPT'"),
+        ResolutionError(2, "tracking[0]", "unknown option 'East' of 'Region'"),
+    ]
+
+    await reference.sync(client.accounting, xero_tenant_id="T", limiter=limiter)
+    accounts_request = [r for r in seen if r.url.path.endswith("/Accounts")][-1]
+    assert (
+        accounts_request.url.params["where"]
+        == "UpdatedDateUTC>=DateTime(2024,06,01,00,00,00)"
+    )
+    assert reference.account("200") is None
+    assert reference.account("201").account_id == "a-200"
+    assert "widget" in reference.items
+    assert reference.currencies == {"NZD"}
@@ -0,0 +1,185 @@
+import datetime
+import typing
+
+import httpx
+import pytest
+
+from xero_accounting_py import AsyncClient
+from xero_accounting_py.core import RateLimiter
+from xero_accounting_py.engines import VarianceEngine
+
+from _xero import xero_date
+
+BANK = ("a-bank", "090", "Business Bank Account", "BANK")
+SALES = ("a-sales", "200", "Sales", "REVENUE")
+RENT = ("a-rent", "469", "Rent", "OVERHEADS")
+FUEL = ("a-fuel", "449", "Motor Vehicle Expenses", "OVERHEADS")
+
+
+def _journal(
+    number: int,
+    day: datetime.date,
+    account: typing.Tuple[str, str, str, str],
+    amount: float,
+    option: str = "",
+) -> typing.Dict[str, typing.Any]:
+    account_id, code, name, account_type = account
+    line: typing.Dict[str, typing.Any] = {
+        "AccountID": account_id,
+        "AccountCode": code,
+        "AccountName": name,
+        "AccountType": account_type,
+        "NetAmount": amount,
+    }
+    if option:
+        line["TrackingCategories"] = [
+            {"TrackingCategoryID": "region", "TrackingOptionID": option}
+        ]
+    bank = {"AccountID": BANK[0], "AccountType": "BANK", "NetAmount": -amount}
+    return {
+        "JournalID": f"j-{number}",
+        "JournalNumber": number,
+        "JournalDate": xero_date(day),
+        "JournalLines": [line, bank],
+    }
+
+
+JOURNALS = [
+    _journal(1, datetime.date(2024, 7, 5), SALES, -100.0, "north"),
+    _journal(2, datetime.date(2024, 7, 31), RENT, 40.0),
+    _journal(3, datetime.date(2024, 8, 1), SALES, -50.0, "south"),
+    _journal(4, datetime.date(2024, 8, 1), RENT, 60.0),
+    _journal(5, datetime.date(2024, 8, 20), FUEL, 10.0),
+]
+
+
+def _line(
+    account: typing.Tuple[str, str, str, str], *amounts: float
+) -> typing.Dict[str, typing.Any]:
+    return {
+        "AccountID": account[0],
+        "AccountCode": account[1],
+        "BudgetBalances": [
+            {"Period": f"2024-{month:02}", "Amount": amount}
+            for month, amount in zip((7, 8), amounts)
+        ],
+    }
+
+
+BUDGETS = [
+    {
+        "BudgetID": "b-overall",
+        "Type": "OVERALL",
+        "Description": "Overall Budget",
+        "BudgetLines": [_line(SALES, 120.0, 100.0), _line(RENT, 50.0, 50.0)],
+    },
+    {
+        "BudgetID": "b-north",
+        "Type": "TRACKING",
+        "Description": "North",
+        "Tracking": [{"TrackingCategoryID": "region", "TrackingOptionID": "north"}],
+        "BudgetLines": [_line(SALES, 80.0, 0.0)],
+    },
+]
+
+
+@pytest.mark.asyncio
+async def test_load_variances_and_refresh() -> None:
+    """Tests aligning budgets with journal actuals and refreshing them.
+
+    Validates:
+    - Budgets are listed and fetched for the date range with the journals
+    - Budget and actual tables are aligned by account and calendar month
+    - Revenue actuals are reported positive and unbudgeted expenses included
+    - Tracking budgets only compare the actuals of their option
+    - The report totals each section with variance percentages
+    - A refresh only fetches journals after the last one applied
+    """
+    journals = JOURNALS[:4]
+    seen: typing.List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        path = request.url.path
+        if path.endswith("/Journals"):
+            offset = int(request.url.params.get("offset", 0))
+            return httpx.Response(
+                200,
+                json={"Journals": [j for j in journals if j["JournalNumber"] > offset]},
+            )
+        if path.endswith("/Budgets"):
+            listed = [
+                {k: v for k, v in b.items() if k != "BudgetLines"} for b in BUDGETS
+            ]
+            return httpx.Response(200, json={"Budgets": listed})
+        budget_id = path.rsplit("/", 1)[-1]
+        return httpx.Response(
+            200, json={"Budgets": [b for b in BUDGETS if b["BudgetID"] == budget_id]}
+        )
+
+    client = AsyncClient(
+        oauth_token="API_TOKEN",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    limiter = RateLimiter(calls_per_minute=60_000)
+    engine = VarianceEngine()
+    await engine.load(
+        client.accounting,
+        xero_tenant_id="T",
+        date_from=datetime.date(2024, 7, 1),
+        date_to=datetime.date(2024, 8, 31),
+        limiter=limiter,
+    )
+    gets = [r for r in seen if "/Budgets/" in r.url.path]
+    assert sorted(r.url.path.rsplit("/", 1)[-1] for r in gets) == [
+        "b-north",
+        "b-overall",
+    ]
+    assert {r.url.params["DateFrom"] for r in gets} == {"2024-07-01"}
+
+    tables = engine.variances(datetime.date(2024, 7, 15), months=2)
+    overall = tables["b-overall"]
+    assert overall.months == [datetime.date(2024, 7, 1), datetime.date(2024, 8, 1)]
+    assert overall.account_ids == ["a-sales", "a-rent"]
+    assert overall.budget == [[12000, 10000], [5000, 5000]]
+    assert overall.actual == [[10000, 5000], [4000, 6000]]
+    assert overall.variance == [[-2000, -5000], [-1000, 1000]]
+    north = tables["b-north"]
+    assert north.account_ids == ["a-sales"]
+    assert north.actual == [[10000, 0]]
+
+    seen.clear()
+    journals = JOURNALS
+    assert (
+        await engine.refresh(client.accounting, xero_tenant_id="T", limiter=limiter)
+        == 1
+    )
+    assert seen[0].url.params["offset"] == "4"
+    overall = engine.variances(datetime.date(2024, 7, 1), months=2)["b-overall"]
+    assert overall.account_ids == ["a-sales", "a-fuel", "a-rent"]
+    assert overall.budget[1] == [0, 0]
+    assert overall.actual[1] == [0, 1000]
+
+    report = engine.report("b-overall", datetime.date(2024, 7, 1), months=2)
+    header, revenue, expenses = report.reports[0].rows
+    assert [c.value for c in header.cells] == [
+        "Account",
+        "Budget",
+        "Actual",
+        "Variance",
+        "Variance %",
+    ]
+    assert [c.value for c in revenue.rows[0].cells] == [
+        "Sales (200)",
+        "220.00",
+        "150.00",
+        "-70.00",
+        "-31.8",
+    ]
+    assert [c.value for c in expenses.rows[-1].cells] == [
+        "Total Expenses",
+        "100.00",
+        "110.00",
+        "10.00",
+        "10.0",
+    ]
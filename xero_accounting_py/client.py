@@ -1,7 +1,22 @@
 import httpx
 import typing
 
-from make_api_request import AsyncBaseClient, AuthBearer, SyncBaseClient
+from make_api_request import AuthBearer
+from xero_accounting_py.core import (
+    AdaptiveConcurrency,
+    AsyncBaseClient,
+    CodecName,
+    DecodeMode,
+    JsonCodec,
+    Loader,
+    MetricsHook,
+    PageFetch,
+    PriorityScheduler,
+    RawMode,
+    SyncBaseClient,
+    WriteCoalescer,
+    paginate,
+)
 from xero_accounting_py.environment import (
     DEFAULT,
     Environment,
@@ -23,8 +38,24 @@ class Client:
         httpx_client: typing.Optional[httpx.Client] = None,
         environment: ServerGroup = DEFAULT,
         oauth_token: typing.Optional[str] = None,
+        codec: typing.Union[CodecName, JsonCodec] = "auto",
+        hooks: typing.Sequence[MetricsHook] = (),
+        decode: DecodeMode = "model",
+        raw: typing.Optional[RawMode] = None,
     ):
-        """Initialize root client"""
+        """Initialize root client
+
+        Args:
+            codec: JSON library used for request bodies and untyped responses.
+                `"auto"` uses `orjson` or `msgspec` when installed and falls
+                back to the standard library
+            hooks: Callbacks given per-phase timings and sizes of every
+                request, e.g. `OpenTelemetryHook()` or `PrometheusHook()`
+            decode: Default `decode` request option, e.g. `"lite"` to skip
+                model validation for every call
+            raw: Default `raw` request option. `"bytes"` or `"json"` return a
+                `RawResponse` with the status, headers and undecoded body
+        """
         self._base_client = SyncBaseClient(
             base_url={
                 "accounting": _get_base_url(
@@ -38,6 +69,10 @@ class Client:
             if httpx_client is None
             else httpx_client,
             auths={"OAuth2": AuthBearer(token=oauth_token)},
+            codec=codec,
+            hooks=hooks,
+            decode=decode,
+            raw=raw,
         )
         self.accounting = AccountingClient(base_client=self._base_client)
         self.projects = ProjectsClient(base_client=self._base_client)
@@ -51,8 +86,35 @@ class AsyncClient:
         httpx_client: typing.Optional[httpx.AsyncClient] = None,
         environment: ServerGroup = DEFAULT,
         oauth_token: typing.Optional[str] = None,
+        codec: typing.Union[CodecName, JsonCodec] = "auto",
+        adaptive_concurrency: typing.Union[bool, AdaptiveConcurrency] = False,
+        scheduler: typing.Optional[PriorityScheduler] = None,
+        hooks: typing.Sequence[MetricsHook] = (),
+        decode: DecodeMode = "model",
+        raw: typing.Optional[RawMode] = None,
     ):
-        """Initialize root client"""
+        """Initialize root client
+
+        Args:
+            codec: JSON library used for request bodies and untyped responses.
+                `"auto"` uses `orjson` or `msgspec` when installed and falls
+                back to the standard library
+            adaptive_concurrency: `True`, or an `AdaptiveConcurrency` with
+                custom bounds, to limit requests in flight per tenant and
+                service with an AIMD window that shrinks on 429/503 responses
+                and latency spikes
+            scheduler: Per-tenant request slots that serve calls with
+                `request_options={"priority": "interactive"}` (the default)
+                before `"batch"` calls, with tenants taking turns
+            hooks: Callbacks given per-phase timings and sizes of every
+                request, e.g. `OpenTelemetryHook()` or `PrometheusHook()`
+            decode: Default `decode` request option, e.g. `"lite"` to skip
+                model validation for every call
+            raw: Default `raw` request option. `"bytes"` or `"json"` return a
+                `RawResponse` with the status, headers and undecoded body
+        """
+        if adaptive_concurrency is True:
+            adaptive_concurrency = AdaptiveConcurrency()
         self._base_client = AsyncBaseClient(
             base_url={
                 "accounting": _get_base_url(
@@ -66,6 +128,52 @@ class AsyncClient:
             if httpx_client is None
             else httpx_client,
             auths={"OAuth2": AuthBearer(token=oauth_token)},
+            codec=codec,
+            concurrency=adaptive_concurrency or None,
+            scheduler=scheduler,
+            hooks=hooks,
+            decode=decode,
+            raw=raw,
         )
         self.accounting = AsyncAccountingClient(base_client=self._base_client)
         self.projects = AsyncProjectsClient(base_client=self._base_client)
+
+    @property
+    def concurrency(self) -> typing.Optional[AdaptiveConcurrency]:
+        """The adaptive concurrency limits in use, whose `limits()` report
+        the current window per service and tenant"""
+        return self._base_client.concurrency
+
+    def loader(self, *, max_batch: int = 50) -> Loader:
+        """
+        Returns a new loader that batches single contact, item and account
+        lookups into list calls. Create one per unit of work: its memo lives
+        as long as the loader.
+        """
+        return Loader(self.accounting, max_batch=max_batch)
+
+    def coalescer(self, *, window: float = 0.05, max_batch: int = 50) -> WriteCoalescer:
+        """
+        Returns a coalescer that batches single invoice, contact and payment
+        creates. Share one instance between producers and close it with
+        `aclose()` to send what is still buffered.
+        """
+        return WriteCoalescer(self.accounting, window=window, max_batch=max_batch)
+
+    def paginate(
+        self,
+        fetch: PageFetch,
+        *,
+        window: int = 4,
+        ordered: bool = True,
+        **query: typing.Any,
+    ) -> typing.AsyncGenerator[typing.Any, None]:
+        """
+        Yields every page of a paged list method such as
+        `client.projects.list` or `client.accounting.invoices.list`. After
+        page 1 reports `page_count`, up to `window` further pages are fetched
+        at once and yielded in page order, or as they arrive with
+        `ordered=False`. Other keywords, including `request_options`, are
+        passed to every call.
+        """
+        return paginate(fetch, window=window, ordered=ordered, **query)
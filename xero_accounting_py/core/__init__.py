@@ -0,0 +1,60 @@
+from .base_client import AsyncBaseClient, BaseClient, SyncBaseClient
+from .cassette import CassetteMissError, RecordingTransport, ReplayTransport
+from .coalesce import CoalescedResource, RecordValidationError, WriteCoalescer
+from .codec import CodecName, JsonCodec, MsgspecCodec, OrjsonCodec, get_codec
+from .concurrency import AdaptiveConcurrency, AdaptiveLimiter
+from .instrument import (
+    MetricsHook,
+    OpenTelemetryHook,
+    PrometheusHook,
+    RequestMetrics,
+)
+from .lite import LiteRecord, decode_lite, lite_record_type
+from .loader import Loader, LoaderResource
+from .paginate import PageFetch, page_count, paginate
+from .projection import projected_model
+from .rate_limit import RateLimiter
+from .request import DecodeMode, Priority, RawMode, RequestOptions, to_encodable
+from .response import RawResponse
+from .scheduler import PriorityScheduler
+
+
+__all__ = [
+    "AdaptiveConcurrency",
+    "AdaptiveLimiter",
+    "AsyncBaseClient",
+    "BaseClient",
+    "CassetteMissError",
+    "CoalescedResource",
+    "CodecName",
+    "DecodeMode",
+    "JsonCodec",
+    "LiteRecord",
+    "Loader",
+    "LoaderResource",
+    "MetricsHook",
+    "MsgspecCodec",
+    "OpenTelemetryHook",
+    "OrjsonCodec",
+    "PageFetch",
+    "Priority",
+    "PriorityScheduler",
+    "PrometheusHook",
+    "RateLimiter",
+    "RawMode",
+    "RawResponse",
+    "RecordValidationError",
+    "RecordingTransport",
+    "ReplayTransport",
+    "RequestMetrics",
+    "RequestOptions",
+    "SyncBaseClient",
+    "WriteCoalescer",
+    "decode_lite",
+    "get_codec",
+    "lite_record_type",
+    "page_count",
+    "paginate",
+    "projected_model",
+    "to_encodable",
+]
@@ -0,0 +1,419 @@
+import functools
+import typing
+
+import httpx
+import make_api_request
+from make_api_request import ApiError, AuthProvider, BinaryResponse, QueryParams
+from make_api_request import RequestOptions as _BaseRequestOptions
+from make_api_request.base_client import NoneType, T
+from make_api_request.utils import filter_binary_response, get_response_type
+from xero_accounting_py.core.codec import CodecName, JsonCodec, get_codec
+from xero_accounting_py.core.concurrency import AdaptiveConcurrency
+from xero_accounting_py.core.instrument import MetricsHook, PhaseTimer
+from xero_accounting_py.core.lite import decode_lite
+from xero_accounting_py.core.projection import projected_model
+from xero_accounting_py.core.request import DecodeMode, RawMode, get_option
+from xero_accounting_py.core.response import RawResponse, from_json
+from xero_accounting_py.core.scheduler import PriorityScheduler
+from xero_accounting_py.core.utils import is_model
+
+
+class BaseClient(make_api_request.BaseClient):
+    """
+    Extends the generated base client with a pluggable JSON codec and the
+    response handling options described by `xero_accounting_py.core.RequestOptions`.
+
+    Attributes:
+        codec: JSON codec used for request bodies and untyped responses
+        hooks: Callbacks given the `RequestMetrics` of every request, see
+            `xero_accounting_py.core.instrument`
+        decode: Default of the `decode` request option
+        raw: Default of the `raw` request option
+    """
+
+    codec: JsonCodec
+    hooks: typing.Sequence[MetricsHook] = ()
+    decode: DecodeMode = "model"
+    raw: typing.Optional[RawMode] = None
+
+    def _encode_body(
+        self,
+        *,
+        json: typing.Optional[typing.Any],
+        content: typing.Optional[httpx._types.RequestContent],
+        content_type: typing.Optional[str],
+    ) -> typing.Tuple[
+        typing.Optional[httpx._types.RequestContent], typing.Optional[str]
+    ]:
+        """Serializes a JSON request body with the configured codec"""
+        if json is None:
+            return content, content_type
+        return self.codec.dumps(json), content_type or "application/json"
+
+    def process_response(
+        self,
+        *,
+        response: httpx.Response,
+        cast_to: typing.Union[typing.Type[T], typing.Any],
+        request_options: typing.Optional[_BaseRequestOptions] = None,
+        timer: typing.Optional[PhaseTimer] = None,
+    ) -> T:
+        """Process an HTTP response and convert it to the desired type.
+
+        JSON bodies are validated straight from the response bytes, or parsed
+        with the configured codec when no model validation is wanted.
+
+        Args:
+            response: HTTP response to process
+            cast_to: Type to cast the response data to
+            request_options: Options of the originating request
+            timer: Timer of the request, when it is instrumented
+
+        Returns:
+            Processed response data of the specified type
+        """
+        raw = get_option(request_options, "raw", self.raw)
+        if raw is not None:
+            data = None
+            if (
+                raw == "json"
+                and response.content
+                and get_response_type(response.headers) == "json"
+            ):
+                data = self.codec.loads(response.content)
+                if timer is not None:
+                    timer.mark("decode")
+            return typing.cast(
+                T,
+                RawResponse(
+                    status_code=response.status_code,
+                    headers=response.headers,
+                    content=response.content,
+                    data=data,
+                ),
+            )
+        if (
+            response.status_code == 204
+            or cast_to == NoneType
+            or cast_to == BinaryResponse
+            or get_response_type(response.headers) != "json"
+        ):
+            return super().process_response(response=response, cast_to=cast_to)
+        if cast_to is type(typing.Any):
+            data = self.codec.loads(response.content)
+            if timer is not None:
+                timer.mark("decode")
+            return typing.cast(T, data)
+
+        decode = get_option(request_options, "decode", self.decode)
+        fields = get_option(request_options, "fields", None)
+        load_with = filter_binary_response(cast_to=cast_to)
+        if fields and is_model(load_with):
+            load_with = projected_model(load_with, fields)
+        if decode == "lite":
+            data = self.codec.loads(response.content)
+            if timer is not None:
+                timer.mark("decode")
+            result = decode_lite(data, load_with)
+        else:
+            result = from_json(content=response.content, load_with=load_with)
+        if timer is not None:
+            timer.mark("validate")
+        return typing.cast(T, result)
+
+    def _report(
+        self,
+        timer: PhaseTimer,
+        *,
+        method: str,
+        path: str,
+        service_name: typing.Optional[str],
+        headers: typing.Optional[typing.Dict[str, str]],
+        response: typing.Optional[httpx.Response],
+        error: typing.Optional[BaseException],
+    ) -> None:
+        metrics = timer.finish(
+            method=method,
+            path=path,
+            service_name=service_name,
+            headers=headers,
+            response=response,
+            error=error,
+        )
+        for hook in self.hooks:
+            hook(metrics)
+
+
+class SyncBaseClient(BaseClient, make_api_request.SyncBaseClient):
+    """Synchronous HTTP client used by `xero_accounting_py.Client`"""
+
+    def __init__(
+        self,
+        *,
+        base_url: typing.Union[str, typing.Dict[str, str]],
+        httpx_client: httpx.Client,
+        auths: typing.Optional[typing.Dict[str, AuthProvider]] = None,
+        codec: typing.Union[CodecName, JsonCodec] = "auto",
+        hooks: typing.Sequence[MetricsHook] = (),
+        decode: DecodeMode = "model",
+        raw: typing.Optional[RawMode] = None,
+    ):
+        """Initialize the synchronous client.
+
+        Args:
+            httpx_client: Synchronous HTTPX client instance
+            codec: JSON codec name or instance, see `xero_accounting_py.core.codec`
+            hooks: Metrics hooks, see `xero_accounting_py.core.instrument`
+            decode: Default `decode` option of every request
+            raw: Default `raw` option of every request
+        """
+        super().__init__(base_url=base_url, httpx_client=httpx_client, auths=auths)
+        self.codec = get_codec(codec)
+        self.hooks = tuple(hooks)
+        self.decode = decode
+        self.raw = raw
+
+    def request(
+        self,
+        *,
+        method: str,
+        path: str,
+        cast_to: typing.Union[typing.Type[T], typing.Any],
+        service_name: typing.Optional[str] = None,
+        auth_names: typing.Optional[typing.List[str]] = None,
+        query_params: typing.Optional[QueryParams] = None,
+        headers: typing.Optional[typing.Dict[str, str]] = None,
+        data: typing.Optional[httpx._types.RequestData] = None,
+        files: typing.Optional[httpx._types.RequestFiles] = None,
+        json: typing.Optional[typing.Any] = None,
+        content_type: typing.Optional[str] = None,
+        content: typing.Optional[httpx._types.RequestContent] = None,
+        request_options: typing.Optional[_BaseRequestOptions] = None,
+    ) -> T:
+        """Make a synchronous HTTP request.
+
+        Raises:
+            ApiError: If the request fails
+        """
+        timer = PhaseTimer() if self.hooks else None
+        response: typing.Optional[httpx.Response] = None
+        error: typing.Optional[BaseException] = None
+        try:
+            content, content_type = self._encode_body(
+                json=json, content=content, content_type=content_type
+            )
+            req_cfg = self.build_request(
+                method=method,
+                path=path,
+                service_name=service_name,
+                auth_names=auth_names,
+                query_params=query_params,
+                headers=headers,
+                data=data,
+                files=files,
+                content_type=content_type,
+                content=content,
+                request_options=request_options,
+            )
+            if timer is None:
+                response = self.httpx_client.request(**req_cfg)
+            else:
+                timer.mark("encode")
+                response = self._transmit(req_cfg, timer)
+
+            if not response.is_success:
+                raise ApiError(response=response)
+
+            if self._cast_to_raw_response(res=response, cast_to=cast_to):
+                return response
+
+            return self.process_response(
+                response=response,
+                cast_to=cast_to,
+                request_options=request_options,
+                timer=timer,
+            )
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            if timer is not None:
+                self._report(
+                    timer,
+                    method=method,
+                    path=path,
+                    service_name=service_name,
+                    headers=headers,
+                    response=response,
+                    error=error,
+                )
+
+    def _transmit(self, req_cfg: typing.Any, timer: PhaseTimer) -> httpx.Response:
+        timer.mark("queue")
+        request = self.httpx_client.build_request(
+            **req_cfg, extensions={"trace": timer.trace}
+        )
+        response = self.httpx_client.send(request, stream=True)
+        timer.mark("ttfb")
+        try:
+            response.read()
+        finally:
+            response.close()
+        timer.mark("download")
+        return response
+
+
+class AsyncBaseClient(BaseClient, make_api_request.AsyncBaseClient):
+    """Asynchronous HTTP client used by `xero_accounting_py.AsyncClient`"""
+
+    def __init__(
+        self,
+        *,
+        base_url: typing.Union[str, typing.Dict[str, str]],
+        httpx_client: httpx.AsyncClient,
+        auths: typing.Optional[typing.Dict[str, AuthProvider]] = None,
+        codec: typing.Union[CodecName, JsonCodec] = "auto",
+        concurrency: typing.Optional[AdaptiveConcurrency] = None,
+        scheduler: typing.Optional[PriorityScheduler] = None,
+        hooks: typing.Sequence[MetricsHook] = (),
+        decode: DecodeMode = "model",
+        raw: typing.Optional[RawMode] = None,
+    ):
+        """Initialize the asynchronous client.
+
+        Args:
+            httpx_client: Asynchronous HTTPX client instance
+            codec: JSON codec name or instance, see `xero_accounting_py.core.codec`
+            concurrency: Adaptive per-tenant concurrency limits every request
+                waits on, see `xero_accounting_py.core.concurrency`
+            scheduler: Per-tenant slots that serve interactive requests before
+                batch ones, see `xero_accounting_py.core.scheduler`
+            hooks: Metrics hooks, see `xero_accounting_py.core.instrument`
+            decode: Default `decode` option of every request
+            raw: Default `raw` option of every request
+        """
+        super().__init__(base_url=base_url, httpx_client=httpx_client, auths=auths)
+        self.codec = get_codec(codec)
+        self.concurrency = concurrency
+        self.scheduler = scheduler
+        self.hooks = tuple(hooks)
+        self.decode = decode
+        self.raw = raw
+
+    async def request(
+        self,
+        *,
+        method: str,
+        path: str,
+        cast_to: typing.Union[typing.Type[T], typing.Any],
+        service_name: typing.Optional[str] = None,
+        auth_names: typing.Optional[typing.List[str]] = None,
+        query_params: typing.Optional[QueryParams] = None,
+        headers: typing.Optional[typing.Dict[str, str]] = None,
+        data: typing.Optional[httpx._types.RequestData] = None,
+        files: typing.Optional[httpx._types.RequestFiles] = None,
+        json: typing.Optional[typing.Any] = None,
+        content_type: typing.Optional[str] = None,
+        content: typing.Optional[httpx._types.RequestContent] = None,
+        request_options: typing.Optional[_BaseRequestOptions] = None,
+    ) -> T:
+        """Make an asynchronous HTTP request.
+
+        Raises:
+            ApiError: If the request fails
+        """
+        timer = PhaseTimer() if self.hooks else None
+        response: typing.Optional[httpx.Response] = None
+        error: typing.Optional[BaseException] = None
+        try:
+            content, content_type = self._encode_body(
+                json=json, content=content, content_type=content_type
+            )
+            req_cfg = self.build_request(
+                method=method,
+                path=path,
+                service_name=service_name,
+                auth_names=auth_names,
+                query_params=query_params,
+                headers=headers,
+                data=data,
+                files=files,
+                content_type=content_type,
+                content=content,
+                request_options=request_options,
+            )
+            if timer is not None:
+                timer.mark("encode")
+            if self.scheduler is None:
+                response = await self._send(
+                    req_cfg, service_name=service_name, headers=headers, timer=timer
+                )
+            else:
+                async with self.scheduler.slot(
+                    (headers or {}).get("xero-tenant-id", ""),
+                    get_option(request_options, "priority", "interactive"),
+                ):
+                    response = await self._send(
+                        req_cfg, service_name=service_name, headers=headers, timer=timer
+                    )
+
+            if not response.is_success:
+                raise ApiError(response=response)
+
+            if self._cast_to_raw_response(res=response, cast_to=cast_to):
+                return response
+
+            return self.process_response(
+                response=response,
+                cast_to=cast_to,
+                request_options=request_options,
+                timer=timer,
+            )
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            if timer is not None:
+                self._report(
+                    timer,
+                    method=method,
+                    path=path,
+                    service_name=service_name,
+                    headers=headers,
+                    response=response,
+                    error=error,
+                )
+
+    async def _send(
+        self,
+        req_cfg: typing.Any,
+        *,
+        service_name: typing.Optional[str],
+        headers: typing.Optional[typing.Dict[str, str]],
+        timer: typing.Optional[PhaseTimer],
+    ) -> httpx.Response:
+        if timer is None:
+            transmit = functools.partial(self.httpx_client.request, **req_cfg)
+        else:
+            transmit = functools.partial(self._transmit, req_cfg, timer)
+        if self.concurrency is None:
+            return await transmit()
+        return await self.concurrency.send(
+            transmit,
+            service_name=service_name or "",
+            xero_tenant_id=(headers or {}).get("xero-tenant-id", ""),
+        )
+
+    async def _transmit(self, req_cfg: typing.Any, timer: PhaseTimer) -> httpx.Response:
+        timer.mark("queue")
+        request = self.httpx_client.build_request(
+            **req_cfg, extensions={"trace": timer.atrace}
+        )
+        response = await self.httpx_client.send(request, stream=True)
+        timer.mark("ttfb")
+        try:
+            await response.aread()
+        finally:
+            await response.aclose()
+        timer.mark("download")
+        return response
@@ -0,0 +1,265 @@
+"""
+Record/replay transports for offline tests and benchmarks.
+
+`RecordingTransport` wraps a real httpx transport and saves every
+request/response pair to a gzip-compressed cassette. `ReplayTransport`
+serves a cassette back without network access. Both work with `Client` and
+`AsyncClient`:
+
+    transport = RecordingTransport("invoices.cassette.gz")
+    http = httpx.Client(transport=transport)
+    Client(oauth_token=token, httpx_client=http).accounting.invoices.list(
+        xero_tenant_id=tenant_id
+    )
+    http.close()  # writes the cassette
+
+    transport = ReplayTransport("invoices.cassette.gz", latency="recorded")
+    client = Client(httpx_client=httpx.Client(transport=transport))
+
+Authorization and `xero-tenant-id` header values are replaced before
+anything is written, including where they appear in URLs or bodies.
+"""
+
+import asyncio
+import base64
+import collections
+import gzip
+import hashlib
+import json
+import time
+import typing
+
+import httpx
+import typing_extensions
+
+SCRUBBED = "SCRUBBED"
+SCRUB_HEADERS = ("authorization", "xero-tenant-id")
+# dropped as the stored body is already decoded
+_HOP_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding"})
+
+Latency = typing.Union[typing_extensions.Literal["recorded"], float, None]
+
+
+class CassetteMissError(LookupError):
+    """Raised when a replayed request has no recorded interaction"""
+
+
+def _key(method: str, url: str, body: bytes) -> str:
+    return f"{method} {url} {hashlib.sha1(body).hexdigest()}"
+
+
+def _response_headers(
+    headers: httpx.Headers,
+) -> typing.List[typing.Tuple[str, str]]:
+    return [
+        (name, value) for name, value in headers.items() if name not in _HOP_HEADERS
+    ]
+
+
+class RecordingTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """
+    Transport that forwards requests to `transport` and records them.
+
+    Args:
+        path: Cassette file to write when the transport is closed
+        transport: Transport to forward to, the default httpx transport for
+            the client type if omitted
+        scrub_headers: Request headers whose values are scrubbed
+    """
+
+    def __init__(
+        self,
+        path: str,
+        transport: typing.Union[
+            httpx.BaseTransport, httpx.AsyncBaseTransport, None
+        ] = None,
+        *,
+        scrub_headers: typing.Sequence[str] = SCRUB_HEADERS,
+    ):
+        self.path = path
+        self._transport = transport
+        self._scrub_headers = frozenset(name.lower() for name in scrub_headers)
+        self._secrets: typing.Set[str] = set()
+        self.interactions: typing.List[typing.Dict[str, typing.Any]] = []
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if self._transport is None:
+            self._transport = httpx.HTTPTransport()
+        transport = typing.cast(httpx.BaseTransport, self._transport)
+        started = time.perf_counter()
+        response = transport.handle_request(request)
+        try:
+            response.read()
+        finally:
+            response.close()
+        return self._record(request, response, time.perf_counter() - started)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self._transport is None:
+            self._transport = httpx.AsyncHTTPTransport()
+        transport = typing.cast(httpx.AsyncBaseTransport, self._transport)
+        started = time.perf_counter()
+        response = await transport.handle_async_request(request)
+        try:
+            await response.aread()
+        finally:
+            await response.aclose()
+        return self._record(request, response, time.perf_counter() - started)
+
+    def _record(
+        self, request: httpx.Request, response: httpx.Response, latency: float
+    ) -> httpx.Response:
+        for name in self._scrub_headers:
+            value = request.headers.get(name)
+            if value:
+                self._secrets.add(value)
+                # bearer tokens also appear without their scheme
+                self._secrets.add(value.split(" ", 1)[-1])
+        headers = _response_headers(response.headers)
+        self.interactions.append(
+            {
+                "request": {
+                    "method": request.method,
+                    "url": str(request.url),
+                    "headers": [
+                        [name, SCRUBBED if name in self._scrub_headers else value]
+                        for name, value in request.headers.items()
+                    ],
+                    "body": request.content,
+                },
+                "response": {
+                    "status": response.status_code,
+                    "headers": headers,
+                    "body": response.content,
+                },
+                "latency": latency,
+            }
+        )
+        return httpx.Response(
+            response.status_code,
+            headers=headers,
+            content=response.content,
+            request=request,
+        )
+
+    def save(self) -> None:
+        """Writes the recorded interactions to the cassette"""
+        with gzip.open(self.path, "wt", encoding="utf-8") as cassette:
+            json.dump(
+                {"interactions": [self._scrub(i) for i in self.interactions]},
+                cassette,
+            )
+
+    def _scrub(self, interaction: typing.Dict[str, typing.Any]) -> typing.Any:
+        secrets = sorted((s for s in self._secrets if s), key=len, reverse=True)
+
+        def text(value: str) -> str:
+            for secret in secrets:
+                value = value.replace(secret, SCRUBBED)
+            return value
+
+        def body(value: bytes) -> str:
+            for secret in secrets:
+                value = value.replace(secret.encode(), SCRUBBED.encode())
+            return base64.b64encode(value).decode("ascii")
+
+        request, response = interaction["request"], interaction["response"]
+        return {
+            "request": dict(
+                request, url=text(request["url"]), body=body(request["body"])
+            ),
+            "response": dict(
+                response,
+                headers=[[n, text(v)] for n, v in response["headers"]],
+                body=body(response["body"]),
+            ),
+            "latency": interaction["latency"],
+        }
+
+    def close(self) -> None:
+        self.save()
+        if isinstance(self._transport, httpx.BaseTransport):
+            self._transport.close()
+
+    async def aclose(self) -> None:
+        self.save()
+        if isinstance(self._transport, httpx.AsyncBaseTransport):
+            await self._transport.aclose()
+
+
+class ReplayTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """
+    Transport that answers requests from a cassette.
+
+    Requests are matched on method, URL and body, falling back to method and
+    URL. Repeated requests are answered with the recorded responses in
+    order, the last one being repeated once they run out. Header values
+    scrubbed at recording time are ignored when matching.
+
+    Args:
+        path: Cassette file written by `RecordingTransport`
+        latency: Delay before each response: `None` for none, a number of
+            seconds, or `"recorded"` for the latency observed when recording
+        speed: Divides recorded latencies, e.g. 2.0 replays twice as fast
+
+    Raises:
+        CassetteMissError: If a request was never recorded
+    """
+
+    def __init__(self, path: str, *, latency: Latency = None, speed: float = 1.0):
+        self.latency = latency
+        self.speed = speed
+        with gzip.open(path, "rt", encoding="utf-8") as cassette:
+            interactions = json.load(cassette)["interactions"]
+        self._exact: typing.Dict[str, typing.Deque[typing.Any]] = {}
+        self._loose: typing.Dict[str, typing.Deque[typing.Any]] = {}
+        for interaction in interactions:
+            request = interaction["request"]
+            body = base64.b64decode(request["body"])
+            exact = _key(request["method"], request["url"], body)
+            loose = f"{request['method']} {request['url']}"
+            self._exact.setdefault(exact, collections.deque()).append(interaction)
+            self._loose.setdefault(loose, collections.deque()).append(interaction)
+
+    def _lookup(self, request: httpx.Request) -> typing.Any:
+        url = str(request.url)
+        for index, key in (
+            (self._exact, _key(request.method, url, request.read())),
+            (self._loose, f"{request.method} {url}"),
+        ):
+            queue = index.get(key)
+            if queue:
+                return queue.popleft() if len(queue) > 1 else queue[0]
+        raise CassetteMissError(f"no recorded response for {request.method} {url}")
+
+    def _delay(self, interaction: typing.Any) -> float:
+        if self.latency is None:
+            return 0.0
+        if self.latency == "recorded":
+            return float(interaction["latency"]) / self.speed
+        return float(self.latency)
+
+    def _response(
+        self, request: httpx.Request, interaction: typing.Any
+    ) -> httpx.Response:
+        response = interaction["response"]
+        return httpx.Response(
+            response["status"],
+            headers=[(name, value) for name, value in response["headers"]],
+            content=base64.b64decode(response["body"]),
+            request=request,
+        )
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        interaction = self._lookup(request)
+        delay = self._delay(interaction)
+        if delay:
+            time.sleep(delay)
+        return self._response(request, interaction)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        interaction = self._lookup(request)
+        delay = self._delay(interaction)
+        if delay:
+            await asyncio.sleep(delay)
+        return self._response(request, interaction)
@@ -0,0 +1,188 @@
+"""
+Coalescing of single-record creates into batched calls.
+"""
+
+import asyncio
+import typing
+
+import typing_extensions
+
+from xero_accounting_py.core.request import model_options, to_encodable
+from xero_accounting_py.types import params
+
+if typing.TYPE_CHECKING:
+    from xero_accounting_py.resources.accounting import AsyncAccountingClient
+
+CoalescedResource = typing_extensions.Literal["invoices", "contacts", "payments"]
+
+_Key = typing.Tuple[str, str]  # (resource, xero_tenant_id)
+_Pending = typing.List[typing.Tuple[typing.Any, "asyncio.Future[typing.Any]"]]
+
+_SERIALIZERS: typing.Dict[str, typing.Type[typing.Any]] = {
+    "invoices": params._SerializerInvoice,
+    "contacts": params._SerializerContact,
+    "payments": params._SerializerPayment,
+}
+
+
+class RecordValidationError(Exception):
+    """
+    Raised to the caller of a coalesced create whose record was rejected.
+
+    Attributes:
+        record: The element returned by the API for this caller
+        validation_errors: The `ValidationError`s reported for the element
+    """
+
+    def __init__(self, record: typing.Any):
+        self.record = record
+        self.validation_errors = list(record.validation_errors or [])
+        messages = "; ".join(
+            e.message or "" for e in self.validation_errors if e.message
+        )
+        super().__init__(messages or "record failed validation")
+
+
+def _has_errors(record: typing.Any) -> bool:
+    return bool(
+        getattr(record, "has_errors", None)
+        or getattr(record, "has_validation_errors", None)
+        or record.validation_errors
+    )
+
+
+class WriteCoalescer:
+    """
+    Buffers single-record creates and sends them as batched calls.
+
+    Records passed to `create()` are buffered per resource and tenant until
+    `window` seconds have passed since the first of them, or `max_batch`
+    are waiting, and then sent in one `create` call with
+    `summarize_errors=False`. Each record is encoded when it is buffered,
+    so a malformed record fails only its own future and is never sent.
+    Each caller's future resolves with its own element of the response, or
+    raises `RecordValidationError` carrying that element's
+    `validation_errors`; a failed call is raised to every caller in the
+    batch. Sharing one coalescer across producers lets sustained
+    ingest use one rate-limit slot per batch rather than per record.
+
+    Usage:
+        coalescer = client.coalescer(window=0.05)
+        invoice = await coalescer.create_invoice(
+            {"type_": "ACCREC", "contact": {"contact_id": contact_id}},
+            xero_tenant_id=tenant_id,
+        )
+        ...
+        await coalescer.aclose()
+    """
+
+    def __init__(
+        self,
+        accounting: "AsyncAccountingClient",
+        *,
+        window: float = 0.05,
+        max_batch: int = 50,
+    ):
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        self._accounting = accounting
+        self.window = window
+        self.max_batch = max_batch
+        self._buffers: typing.Dict[_Key, _Pending] = {}
+        self._timers: typing.Dict[_Key, asyncio.TimerHandle] = {}
+        self._in_flight: typing.Set["asyncio.Future[None]"] = set()
+
+    def create(
+        self, resource: CoalescedResource, record: typing.Any, *, xero_tenant_id: str
+    ) -> "asyncio.Future[typing.Any]":
+        """Buffers `record` and returns a future for the created element"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        serializer = _SERIALIZERS[resource]
+        serializer.model_rebuild(_types_namespace=params._types_namespace)
+        try:
+            record = to_encodable(item=record, dump_with=serializer)
+        except Exception as exc:
+            future.set_exception(exc)
+            return future
+        key = (resource, xero_tenant_id)
+        buffer = self._buffers.setdefault(key, [])
+        buffer.append((record, future))
+        if len(buffer) >= self.max_batch:
+            self._send(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.window, self._send, key)
+        return future
+
+    def create_invoice(
+        self, invoice: typing.Any, *, xero_tenant_id: str
+    ) -> "asyncio.Future[typing.Any]":
+        return self.create("invoices", invoice, xero_tenant_id=xero_tenant_id)
+
+    def create_contact(
+        self, contact: typing.Any, *, xero_tenant_id: str
+    ) -> "asyncio.Future[typing.Any]":
+        return self.create("contacts", contact, xero_tenant_id=xero_tenant_id)
+
+    def create_payment(
+        self, payment: typing.Any, *, xero_tenant_id: str
+    ) -> "asyncio.Future[typing.Any]":
+        return self.create("payments", payment, xero_tenant_id=xero_tenant_id)
+
+    async def flush(self) -> None:
+        """Sends every buffered record now and waits for all calls in flight"""
+        for key in list(self._buffers):
+            self._send(key)
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+    async def aclose(self) -> None:
+        await self.flush()
+
+    def _send(self, key: _Key) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        pending = self._buffers.pop(key, [])
+        for start in range(0, len(pending), self.max_batch):
+            call = asyncio.ensure_future(
+                self._send_batch(key, pending[start : start + self.max_batch])
+            )
+            self._in_flight.add(call)
+            call.add_done_callback(self._in_flight.discard)
+
+    async def _send_batch(self, key: _Key, pending: _Pending) -> None:
+        resource, xero_tenant_id = key
+        records = [record for record, _ in pending]
+        client = getattr(self._accounting, resource)
+        try:
+            response = await client.create(
+                xero_tenant_id=xero_tenant_id,
+                summarize_errors=False,
+                request_options=model_options(),
+                **{resource: records},
+            )
+        except BaseException as exc:
+            for _, future in pending:
+                if future.done():
+                    continue
+                if isinstance(exc, Exception):
+                    future.set_exception(exc)
+                else:
+                    future.cancel()
+            if not isinstance(exc, Exception):
+                raise
+            return
+        # elements come back in request order
+        elements = getattr(response, resource) or []
+        for index, (_, future) in enumerate(pending):
+            if future.done():
+                continue
+            if index >= len(elements):
+                future.set_exception(
+                    RuntimeError(f"no {resource} element returned for record {index}")
+                )
+            elif _has_errors(elements[index]):
+                future.set_exception(RecordValidationError(elements[index]))
+            else:
+                future.set_result(elements[index])
@@ -0,0 +1,99 @@
+"""
+Pluggable JSON codecs.
+
+Responses decoded into models are always validated straight from the
+response bytes by pydantic-core (`TypeAdapter.validate_json`), so no
+intermediate `dict` is built. The codec handles everything else: encoding
+request bodies and parsing responses that are returned untyped or as lite
+records. `orjson` and `msgspec` are used when installed.
+"""
+
+import json
+import typing
+
+import typing_extensions
+
+CodecName = typing_extensions.Literal["auto", "json", "orjson", "msgspec"]
+
+
+class JsonCodec:
+    """
+    JSON codec backed by the standard library.
+
+    Subclass and override `loads`/`dumps` to plug in another implementation.
+    """
+
+    name = "json"
+
+    def loads(self, content: bytes) -> typing.Any:
+        return json.loads(content)
+
+    def dumps(self, obj: typing.Any) -> bytes:
+        # matches the compact, non-ASCII-escaping encoding httpx applies to `json=`
+        return json.dumps(
+            obj, ensure_ascii=False, separators=(",", ":"), allow_nan=False
+        ).encode("utf-8")
+
+
+class OrjsonCodec(JsonCodec):
+    """JSON codec backed by `orjson`"""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._orjson = orjson
+
+    def loads(self, content: bytes) -> typing.Any:
+        return self._orjson.loads(content)
+
+    def dumps(self, obj: typing.Any) -> bytes:
+        return self._orjson.dumps(obj)  # type: ignore[no-any-return]
+
+
+class MsgspecCodec(JsonCodec):
+    """JSON codec backed by `msgspec`"""
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        import msgspec
+
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder()
+
+    def loads(self, content: bytes) -> typing.Any:
+        return self._decoder.decode(content)
+
+    def dumps(self, obj: typing.Any) -> bytes:
+        return self._encoder.encode(obj)  # type: ignore[no-any-return]
+
+
+_CODECS: typing.Dict[str, typing.Type[JsonCodec]] = {
+    "json": JsonCodec,
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+}
+
+
+def get_codec(codec: typing.Union[CodecName, JsonCodec] = "auto") -> JsonCodec:
+    """
+    Resolves a codec setting.
+
+    `"auto"` picks the fastest installed library (`orjson`, then `msgspec`)
+    and falls back to the standard library. Naming a library explicitly
+    raises `ImportError` if it is not installed.
+    """
+    if isinstance(codec, JsonCodec):
+        return codec
+    if codec == "auto":
+        for name in ("orjson", "msgspec"):
+            try:
+                return _CODECS[name]()
+            except ImportError:
+                continue
+        return JsonCodec()
+    if codec not in _CODECS:
+        raise ValueError(f"unknown JSON codec {codec!r}")
+    return _CODECS[codec]()
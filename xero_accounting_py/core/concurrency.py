@@ -0,0 +1,189 @@
+"""
+Adaptive (AIMD) concurrency limits per tenant and service.
+"""
+
+import asyncio
+import collections
+import time
+import typing
+
+import httpx
+
+# statuses that mean the tenant or service is over its limit
+OVERLOAD_STATUSES = frozenset({429, 503})
+
+_Key = typing.Tuple[str, str]  # (service_name, xero_tenant_id)
+
+
+class AdaptiveLimiter:
+    """
+    Additive-increase, multiplicative-decrease concurrency window.
+
+    Each response that arrives within `latency_tolerance` times the smoothed
+    baseline latency widens the window by one slot per window's worth of
+    responses, as long as at least half of the window is in use. A 429 or
+    503, a timeout, or a latency spike multiplies the window by `backoff`;
+    every latency, spikes included, is folded into the baseline.
+    Only responses to requests started since the last decrease can shrink it
+    again, so one burst of failures shrinks it once.
+
+    Attributes:
+        limit: Current number of requests allowed in flight
+        in_flight: Number of requests currently in flight
+    """
+
+    def __init__(
+        self,
+        *,
+        initial: int = 2,
+        min_limit: int = 1,
+        max_limit: int = 5,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+        smoothing: float = 0.1,
+    ):
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise ValueError("expected 1 <= min_limit <= initial <= max_limit")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.smoothing = smoothing
+        self._window = float(initial)
+        self._baseline: typing.Optional[float] = None
+        self._epoch = 0
+        self.in_flight = 0
+        self._waiters: typing.Deque["asyncio.Future[None]"] = collections.deque()
+
+    @property
+    def limit(self) -> int:
+        return int(self._window)
+
+    async def acquire(self) -> int:
+        """Waits for a free slot and returns a token to pass to `release()`"""
+        if self.in_flight >= self.limit or self._waiters:
+            waiter = asyncio.get_event_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except BaseException:
+                if waiter.done() and not waiter.cancelled():
+                    # the slot was handed over just before cancellation
+                    self.in_flight -= 1
+                    self._wake()
+                else:
+                    self._waiters.remove(waiter)
+                raise
+        else:
+            self.in_flight += 1
+        return self._epoch
+
+    def release(
+        self,
+        token: int,
+        *,
+        latency: typing.Optional[float] = None,
+        overloaded: bool = False,
+    ) -> None:
+        """
+        Frees a slot and adjusts the window from the outcome of the request.
+
+        Args:
+            token: Value returned by the matching `acquire()`
+            latency: Seconds the request took, or None to leave the window
+                unchanged (for example on a connection error)
+            overloaded: Whether the service signalled it is over its limit
+        """
+        if latency is not None or overloaded:
+            self._observe(token, latency, overloaded)
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # the slot is taken on the waiter's behalf
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def _observe(
+        self, token: int, latency: typing.Optional[float], overloaded: bool
+    ) -> None:
+        spike = (
+            latency is not None
+            and self._baseline is not None
+            and latency > self._baseline * self.latency_tolerance
+        )
+        if latency is not None:
+            # spikes move the baseline too, so a slower mix of requests
+            # becomes the new normal instead of pinning the window at its minimum
+            self._baseline = (
+                latency
+                if self._baseline is None
+                else self._baseline + self.smoothing * (latency - self._baseline)
+            )
+        if overloaded or spike:
+            if token == self._epoch:
+                self._epoch += 1
+                self._window = max(float(self.min_limit), self._window * self.backoff)
+            return
+        if self.in_flight * 2 >= self.limit:
+            # an idle window says nothing about how much more it could carry
+            self._window = min(float(self.max_limit), self._window + 1 / self._window)
+
+
+class AdaptiveConcurrency:
+    """
+    Keeps one `AdaptiveLimiter` per service (`accounting`, `projects`) and
+    tenant, and sends requests through them.
+
+    Passed to `AsyncClient(adaptive_concurrency=...)`; every request made by
+    that client then waits for a slot of its tenant and service. The keyword
+    arguments are used for each new `AdaptiveLimiter`.
+
+    Usage:
+        client = AsyncClient(oauth_token=token, adaptive_concurrency=True)
+        ...
+        client.concurrency.limits()
+        # {("accounting", "tenant-id"): 4}
+    """
+
+    def __init__(self, **limiter_options: typing.Any):
+        self._limiter_options = limiter_options
+        self._limiters: typing.Dict[_Key, AdaptiveLimiter] = {}
+
+    def limiter(self, service_name: str, xero_tenant_id: str) -> AdaptiveLimiter:
+        key = (service_name, xero_tenant_id)
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            limiter = self._limiters[key] = AdaptiveLimiter(**self._limiter_options)
+        return limiter
+
+    def limits(self) -> typing.Dict[_Key, int]:
+        """Returns the current limit of every (service, tenant) seen so far"""
+        return {key: limiter.limit for key, limiter in self._limiters.items()}
+
+    async def send(
+        self,
+        transmit: typing.Callable[[], typing.Awaitable[httpx.Response]],
+        *,
+        service_name: str,
+        xero_tenant_id: str,
+    ) -> httpx.Response:
+        """Awaits `transmit()` within the limiter of the service and tenant"""
+        limiter = self.limiter(service_name, xero_tenant_id)
+        token = await limiter.acquire()
+        started = time.monotonic()
+        latency: typing.Optional[float] = None
+        overloaded = False
+        try:
+            response = await transmit()
+            latency = time.monotonic() - started
+            overloaded = response.status_code in OVERLOAD_STATUSES
+            return response
+        except httpx.TimeoutException:
+            overloaded = True
+            raise
+        finally:
+            limiter.release(token, latency=latency, overloaded=overloaded)
@@ -0,0 +1,239 @@
+"""
+Per-phase timing of requests, reported to metrics hooks.
+
+A client created with `hooks=[...]` times each request as it moves through
+its phases and calls every hook once with a `RequestMetrics` record. With no
+hooks the request path is unchanged apart from a few `None` checks.
+
+Phases, in order, all in seconds:
+
+- `encode`: building the request, including JSON encoding of the body
+- `queue`: waiting for a slot of the priority scheduler or adaptive limiter
+- `ttfb`: sending the request until the response headers arrive. `connect`
+  is the part of it spent opening a connection, when the transport reports
+  it (0 for pooled connections)
+- `download`: reading the response body
+- `decode`: parsing JSON into Python objects (untyped and lite responses)
+- `validate`: validating into models, or building lite records. Model
+  validation parses the bytes itself, so it includes JSON parsing
+"""
+
+import re
+import time
+import typing
+import weakref
+
+import httpx
+
+_GUID = re.compile(
+    r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$"
+)
+_NUMBER = re.compile(r"^\d+$")
+
+# labels, phase histogram, bytes histogram
+_Collectors = typing.Tuple[typing.List[str], typing.Any, typing.Any]
+# registry -> namespace -> collectors
+_COLLECTORS: "weakref.WeakKeyDictionary[typing.Any, typing.Dict[str, _Collectors]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+PHASES = ("encode", "queue", "ttfb", "download", "decode", "validate")
+
+
+def path_template(path: str) -> str:
+    """Replaces ids in a request path, e.g. `/Invoices/{id}/History`"""
+    return "/".join(
+        "{id}" if _GUID.match(segment) or _NUMBER.match(segment) else segment
+        for segment in path.split("/")
+    )
+
+
+class RequestMetrics(typing.NamedTuple):
+    """Timings and sizes of one request, as reported to metrics hooks"""
+
+    method: str
+    path: str
+    service_name: str
+    xero_tenant_id: str
+    status_code: typing.Optional[int]
+    # wall-clock start, seconds since the epoch
+    started: float
+    total: float
+    encode: float
+    queue: float
+    connect: float
+    ttfb: float
+    download: float
+    decode: float
+    validate: float
+    response_bytes: int
+    # type name of the exception the request raised, if any
+    error: typing.Optional[str]
+
+
+MetricsHook = typing.Callable[[RequestMetrics], None]
+
+
+class PhaseTimer:
+    """Accumulates the time between successive phase marks of one request"""
+
+    __slots__ = ("started", "_start", "_last", "phases", "connect", "_connecting")
+
+    def __init__(self) -> None:
+        self.started = time.time()
+        self._start = self._last = time.perf_counter()
+        self.phases: typing.Dict[str, float] = {}
+        self.connect = 0.0
+        self._connecting: typing.Optional[float] = None
+
+    def mark(self, phase: str) -> None:
+        """Attributes the time since the previous mark to `phase`"""
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self._last
+        self._last = now
+
+    def trace(self, event_name: str, info: typing.Any) -> None:
+        """httpcore trace callback recording connection setup time"""
+        if event_name == "connection.connect_tcp.started":
+            self._connecting = time.perf_counter()
+        elif event_name in (
+            "connection.connect_tcp.complete",
+            "connection.start_tls.complete",
+        ):
+            if self._connecting is not None:
+                now = time.perf_counter()
+                self.connect += now - self._connecting
+                self._connecting = now
+
+    async def atrace(self, event_name: str, info: typing.Any) -> None:
+        self.trace(event_name, info)
+
+    def finish(
+        self,
+        *,
+        method: str,
+        path: str,
+        service_name: typing.Optional[str],
+        headers: typing.Optional[typing.Dict[str, str]],
+        response: typing.Optional[httpx.Response],
+        error: typing.Optional[BaseException],
+    ) -> RequestMetrics:
+        phases = self.phases
+        return RequestMetrics(
+            method=method,
+            path=path_template(path),
+            service_name=service_name or "",
+            xero_tenant_id=(headers or {}).get("xero-tenant-id", ""),
+            status_code=None if response is None else response.status_code,
+            started=self.started,
+            total=time.perf_counter() - self._start,
+            encode=phases.get("encode", 0.0),
+            queue=phases.get("queue", 0.0),
+            connect=self.connect,
+            ttfb=phases.get("ttfb", 0.0),
+            download=phases.get("download", 0.0),
+            decode=phases.get("decode", 0.0),
+            validate=phases.get("validate", 0.0),
+            response_bytes=(
+                len(response.content)
+                if response is not None and response.is_stream_consumed
+                else 0
+            ),
+            error=None if error is None else type(error).__name__,
+        )
+
+
+class OpenTelemetryHook:
+    """
+    Metrics hook that records each request as an OpenTelemetry span, with
+    the phase timings as `xero.*` attributes. Requires `opentelemetry-api`.
+    """
+
+    def __init__(self, tracer: typing.Any = None):
+        from opentelemetry import trace
+
+        self._tracer = tracer or trace.get_tracer("xero_accounting_py")
+        self._error = trace.Status(trace.StatusCode.ERROR)
+
+    def __call__(self, metrics: RequestMetrics) -> None:
+        start = int(metrics.started * 1e9)
+        span = self._tracer.start_span(
+            f"{metrics.method} {metrics.path}",
+            start_time=start,
+            attributes={
+                "http.request.method": metrics.method,
+                "url.path": metrics.path,
+                "http.response.status_code": metrics.status_code or 0,
+                "xero.service": metrics.service_name,
+                "xero.tenant_id": metrics.xero_tenant_id,
+                "xero.response_bytes": metrics.response_bytes,
+                "xero.connect": metrics.connect,
+                **{f"xero.{phase}": getattr(metrics, phase) for phase in PHASES},
+            },
+        )
+        if metrics.error is not None:
+            span.set_status(self._error)
+            span.set_attribute("error.type", metrics.error)
+        span.end(end_time=start + int(metrics.total * 1e9))
+
+
+class PrometheusHook:
+    """
+    Metrics hook that observes Prometheus histograms of phase durations and
+    response sizes, labelled by service, method, path template and phase.
+    Requires `prometheus_client`. Tenants are only used as a label with
+    `tenant_label=True`, as they can make the series count grow quickly.
+
+    Histograms are registered in `registry` (the default registry if None)
+    once per namespace; later hooks for the same registry and namespace
+    observe the same histograms.
+    """
+
+    def __init__(
+        self,
+        *,
+        registry: typing.Any = None,
+        namespace: str = "xero",
+        tenant_label: bool = False,
+    ):
+        import prometheus_client
+
+        if registry is None:
+            registry = prometheus_client.REGISTRY
+        self._tenant_label = tenant_label
+        labels = ["service", "method", "path"] + (["tenant"] if tenant_label else [])
+        # hooks sharing a registry and namespace share its histograms, as
+        # registering the same names twice is an error
+        collectors = _COLLECTORS.setdefault(registry, {})
+        if namespace in collectors:
+            registered, self._phases, self._bytes = collectors[namespace]
+            if registered != labels:
+                raise ValueError(
+                    f"metrics in namespace {namespace!r} are already registered "
+                    f"with labels {registered}"
+                )
+            return
+        self._phases = prometheus_client.Histogram(
+            "request_phase_seconds",
+            "Time spent in each phase of a request",
+            labels + ["phase"],
+            namespace=namespace,
+            registry=registry,
+        )
+        self._bytes = prometheus_client.Histogram(
+            "response_bytes",
+            "Size of response bodies",
+            labels,
+            buckets=(1e3, 1e4, 1e5, 1e6, 1e7, float("inf")),
+            namespace=namespace,
+            registry=registry,
+        )
+        collectors[namespace] = (labels, self._phases, self._bytes)
+
+    def __call__(self, metrics: RequestMetrics) -> None:
+        labels = [metrics.service_name, metrics.method, metrics.path]
+        if self._tenant_label:
+            labels.append(metrics.xero_tenant_id)
+        for phase in ("total", "connect") + PHASES:
+            self._phases.labels(*labels, phase).observe(getattr(metrics, phase))
+        self._bytes.labels(*labels).observe(metrics.response_bytes)
@@ -0,0 +1,169 @@
+"""
+Compact read-only records for bulk decoding.
+
+Lite records mirror the field names of the generated pydantic models but are
+built directly from the decoded JSON without validation. Each record class
+uses `__slots__` and is frozen, which makes a page of lite invoices a
+fraction of the size of the equivalent `models.Invoices`.
+"""
+
+import typing
+
+import pydantic
+from xero_accounting_py.core.utils import (
+    is_model,
+    rebuild_model,
+    resolve_annotation,
+)
+
+_Converter = typing.Callable[[typing.Any], typing.Any]
+_PlanEntry = typing.Tuple[
+    typing.Callable[[typing.Any, typing.Any], None], typing.Optional[_Converter]
+]
+
+_RECORD_TYPES: typing.Dict[
+    typing.Type[pydantic.BaseModel], typing.Type["LiteRecord"]
+] = {}
+
+
+class LiteRecord:
+    """
+    Base class for frozen, slotted records generated from pydantic models.
+
+    Attributes are the snake_case field names of the source model. Only the
+    keys present in the payload are stored; absent fields read as `None`.
+    """
+
+    __slots__ = ()
+
+    _fields: typing.ClassVar[typing.Tuple[str, ...]] = ()
+    _model: typing.ClassVar[typing.Type[pydantic.BaseModel]]
+    _plan: typing.ClassVar[typing.Dict[str, _PlanEntry]]
+
+    def __setattr__(self, name: str, value: typing.Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self._fields)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        values = ", ".join(
+            f"{f}={getattr(self, f)!r}"
+            for f in self._fields
+            if getattr(self, f) is not None
+        )
+        return f"{type(self).__name__}({values})"
+
+    def _asdict(self) -> typing.Dict[str, typing.Any]:
+        """Returns the non-null fields as a dict keyed by field name"""
+        return {
+            f: getattr(self, f) for f in self._fields if getattr(self, f) is not None
+        }
+
+    def __getattr__(self, name: str) -> typing.Any:
+        # only reached for slots that were never set, i.e. absent from the payload
+        if name in self._fields:
+            return None
+        raise AttributeError(f"{type(self).__name__!r} has no attribute {name!r}")
+
+    @classmethod
+    def _from_data(cls, data: typing.Mapping[str, typing.Any]) -> "LiteRecord":
+        record = object.__new__(cls)
+        plan = cls._plan
+        for key, value in data.items():
+            entry = plan.get(key)
+            if entry is None or value is None:
+                continue
+            set_slot, convert = entry
+            set_slot(record, value if convert is None else convert(value))
+        return record
+
+
+def _converter_for(annotation: typing.Any) -> typing.Optional[_Converter]:
+    """Builds the conversion applied to a raw JSON value of the given annotation"""
+    annotation = resolve_annotation(annotation)
+    if is_model(annotation):
+        model = annotation
+
+        def convert(value: typing.Any) -> typing.Any:
+            # resolved on first use so self-referencing models terminate
+            return lite_record_type(model)._from_data(value)
+
+        return convert
+
+    origin = typing.get_origin(annotation)
+    if origin is not typing.Union and origin is not list:
+        return None
+    args = [resolve_annotation(a) for a in typing.get_args(annotation)]
+    if origin is typing.Union:
+        candidates = [a for a in args if a is not type(None)]
+        if len(candidates) == 1:
+            return _converter_for(candidates[0])
+        return None
+    if args:
+        item_converter = _converter_for(args[0])
+        if item_converter is None:
+            return None
+        return lambda value: [item_converter(v) for v in value]
+    return None
+
+
+def lite_record_type(
+    model: typing.Type[pydantic.BaseModel],
+) -> typing.Type[LiteRecord]:
+    """
+    Returns the lite record class generated for a pydantic model.
+
+    Classes are generated once per model and cached; nested models are
+    generated lazily the first time a payload contains them.
+    """
+    record_type = _RECORD_TYPES.get(model)
+    if record_type is not None:
+        return record_type
+
+    rebuild_model(model)
+    fields = tuple(model.model_fields)
+    record_type = typing.cast(
+        typing.Type[LiteRecord],
+        type(
+            model.__name__,
+            (LiteRecord,),
+            {
+                "__slots__": fields,
+                "__module__": __name__,
+                "__qualname__": model.__name__,
+                "_fields": fields,
+                "_model": model,
+            },
+        ),
+    )
+    _RECORD_TYPES[model] = record_type
+    record_type._plan = {
+        info.alias
+        or name: (
+            getattr(record_type, name).__set__,
+            _converter_for(info.annotation),
+        )
+        for name, info in model.model_fields.items()
+    }
+    return record_type
+
+
+def decode_lite(data: typing.Any, load_with: typing.Any) -> typing.Any:
+    """
+    Converts decoded JSON into lite records described by `load_with`.
+
+    `load_with` may be a model class or a `List[...]`/`Optional[...]` of one;
+    values of any other type are returned unchanged.
+    """
+    if data is None:
+        return None
+    converter = _converter_for(load_with)
+    return data if converter is None else converter(data)
@@ -0,0 +1,213 @@
+"""
+DataLoader-style batching of single-record gets.
+"""
+
+import asyncio
+import typing
+
+import typing_extensions
+
+from xero_accounting_py.core.request import model_options
+
+if typing.TYPE_CHECKING:
+    from xero_accounting_py.resources.accounting import AsyncAccountingClient
+
+LoaderResource = typing_extensions.Literal["contacts", "items", "accounts"]
+
+# ids per list call, keeping the query string well inside URL length limits
+MAX_BATCH = 50
+
+
+def _where_ids(field: str, ids: typing.List[str]) -> str:
+    return " OR ".join(f'{field}==Guid("{record_id}")' for record_id in ids)
+
+
+async def _fetch_contacts(
+    accounting: "AsyncAccountingClient", xero_tenant_id: str, ids: typing.List[str]
+) -> typing.List[typing.Any]:
+    response = await accounting.contacts.list(
+        xero_tenant_id=xero_tenant_id,
+        i_ds=ids,
+        include_archived=True,
+        request_options=model_options(),
+    )
+    return response.contacts or []
+
+
+async def _fetch_items(
+    accounting: "AsyncAccountingClient", xero_tenant_id: str, ids: typing.List[str]
+) -> typing.List[typing.Any]:
+    response = await accounting.items.list(
+        xero_tenant_id=xero_tenant_id,
+        where=_where_ids("ItemID", ids),
+        request_options=model_options(),
+    )
+    return response.items or []
+
+
+async def _fetch_accounts(
+    accounting: "AsyncAccountingClient", xero_tenant_id: str, ids: typing.List[str]
+) -> typing.List[typing.Any]:
+    response = await accounting.accounts.list(
+        xero_tenant_id=xero_tenant_id,
+        where=_where_ids("AccountID", ids),
+        request_options=model_options(),
+    )
+    return response.accounts or []
+
+
+_SOURCES: typing.Dict[
+    str,
+    typing.Tuple[
+        typing.Callable[
+            ["AsyncAccountingClient", str, typing.List[str]],
+            typing.Awaitable[typing.List[typing.Any]],
+        ],
+        str,
+    ],
+] = {
+    "contacts": (_fetch_contacts, "contact_id"),
+    "items": (_fetch_items, "item_id"),
+    "accounts": (_fetch_accounts, "account_id"),
+}
+
+_Key = typing.Tuple[str, str]  # (resource, xero_tenant_id)
+
+
+class Loader:
+    """
+    Batches and memoizes single-record lookups of contacts, items and
+    accounts.
+
+    Every `load()` issued in the same event-loop tick is collected and sent
+    as one `list` call per resource and tenant (contacts by `IDs`, items and
+    accounts by a `where` filter), split into chunks of `max_batch` ids.
+    Each caller receives its own record, or None if the id does not exist.
+    Results are memoized for the lifetime of the loader, so create one per
+    unit of work (for example per GraphQL request) with
+    `AsyncClient.loader()`.
+
+    Usage:
+        loader = client.loader()
+        contacts = await asyncio.gather(
+            *(loader.contact(i.contact_id, xero_tenant_id=tenant) for i in invoices)
+        )
+    """
+
+    def __init__(
+        self, accounting: "AsyncAccountingClient", *, max_batch: int = MAX_BATCH
+    ):
+        self._accounting = accounting
+        self.max_batch = max_batch
+        self._memo: typing.Dict[
+            typing.Tuple[str, str, str], "asyncio.Future[typing.Any]"
+        ] = {}
+        self._queue: typing.Dict[
+            _Key, typing.Dict[str, "asyncio.Future[typing.Any]"]
+        ] = {}
+        self._scheduled = False
+        # strong references, as the event loop only keeps weak ones to tasks
+        self._batches: typing.Set["asyncio.Future[None]"] = set()
+
+    def load(
+        self, resource: LoaderResource, record_id: str, *, xero_tenant_id: str
+    ) -> "asyncio.Future[typing.Any]":
+        """
+        Returns a future for the record with id `record_id`.
+
+        Callers sharing an id each get their own view of the memoized
+        future, so one caller being cancelled or timing out does not cancel
+        the load for the others.
+        """
+        memo_key = (resource, xero_tenant_id, record_id)
+        future = self._memo.get(memo_key)
+        if future is not None:
+            return asyncio.shield(future)
+        loop = asyncio.get_running_loop()
+        future = self._memo[memo_key] = loop.create_future()
+        future.add_done_callback(lambda done: self._forget(memo_key, done))
+        self._queue.setdefault((resource, xero_tenant_id), {})[record_id] = future
+        if not self._scheduled:
+            self._scheduled = True
+            # runs after every task that is ready in this tick has queued its ids
+            loop.call_soon(self._dispatch)
+        return asyncio.shield(future)
+
+    def _forget(
+        self,
+        memo_key: typing.Tuple[str, str, str],
+        future: "asyncio.Future[typing.Any]",
+    ) -> None:
+        # cancelled and failed loads are not memoized, so a later load retries
+        if future.cancelled() or future.exception() is not None:
+            if self._memo.get(memo_key) is future:
+                del self._memo[memo_key]
+
+    def contact(
+        self, contact_id: str, *, xero_tenant_id: str
+    ) -> "asyncio.Future[typing.Any]":
+        return self.load("contacts", contact_id, xero_tenant_id=xero_tenant_id)
+
+    def item(
+        self, item_id: str, *, xero_tenant_id: str
+    ) -> "asyncio.Future[typing.Any]":
+        return self.load("items", item_id, xero_tenant_id=xero_tenant_id)
+
+    def account(
+        self, account_id: str, *, xero_tenant_id: str
+    ) -> "asyncio.Future[typing.Any]":
+        return self.load("accounts", account_id, xero_tenant_id=xero_tenant_id)
+
+    def prime(
+        self, resource: LoaderResource, record: typing.Any, *, xero_tenant_id: str
+    ) -> None:
+        """Seeds the memo with a record that is already known"""
+        record_id = getattr(record, _SOURCES[resource][1])
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(record)
+        self._memo.setdefault((resource, xero_tenant_id, record_id), future)
+
+    def clear(self) -> None:
+        """Forgets every memoized record"""
+        self._memo = {
+            key: future for key, future in self._memo.items() if not future.done()
+        }
+
+    def _dispatch(self) -> None:
+        self._scheduled = False
+        queue, self._queue = self._queue, {}
+        for (resource, xero_tenant_id), futures in queue.items():
+            ids = list(futures)
+            for start in range(0, len(ids), self.max_batch):
+                chunk = {i: futures[i] for i in ids[start : start + self.max_batch]}
+                batch = asyncio.ensure_future(
+                    self._load_batch(resource, xero_tenant_id, chunk)
+                )
+                self._batches.add(batch)
+                batch.add_done_callback(self._batches.discard)
+
+    async def _load_batch(
+        self,
+        resource: str,
+        xero_tenant_id: str,
+        futures: typing.Dict[str, "asyncio.Future[typing.Any]"],
+    ) -> None:
+        fetch, id_field = _SOURCES[resource]
+        try:
+            records = await fetch(self._accounting, xero_tenant_id, list(futures))
+        except BaseException as exc:
+            for future in futures.values():
+                if future.done():
+                    continue
+                if isinstance(exc, Exception):
+                    future.set_exception(exc)
+                else:
+                    future.cancel()
+            if not isinstance(exc, Exception):
+                raise
+            return
+        # the API may not echo ids in the case they were requested in
+        found = {str(getattr(record, id_field)).lower(): record for record in records}
+        for record_id, future in futures.items():
+            if not future.done():
+                future.set_result(found.get(record_id.lower()))
@@ -0,0 +1,97 @@
+"""
+Concurrent fetching of the pages of a paged list endpoint.
+"""
+
+import asyncio
+import collections
+import json
+import typing
+
+from xero_accounting_py.core.rate_limit import RateLimiter
+from xero_accounting_py.core.response import RawResponse
+
+PageFetch = typing.Callable[..., typing.Awaitable[typing.Any]]
+
+
+def page_count(response: typing.Any) -> int:
+    """
+    Returns `pagination.page_count` of a paged response, or 1 if absent.
+    Raw responses are read from their parsed `data`, or their body.
+    """
+    if isinstance(response, RawResponse):
+        data = response.data
+        if data is None and response.content:
+            data = json.loads(response.content)
+        pagination = data.get("pagination") if isinstance(data, dict) else None
+        count = pagination.get("pageCount") if isinstance(pagination, dict) else None
+    else:
+        pagination = getattr(response, "pagination", None)
+        count = None if pagination is None else pagination.page_count
+    return int(count) if count else 1
+
+
+async def paginate(
+    fetch: PageFetch,
+    *,
+    window: int = 4,
+    ordered: bool = True,
+    limiter: typing.Optional[RateLimiter] = None,
+    **query: typing.Any,
+) -> typing.AsyncGenerator[typing.Any, None]:
+    """
+    Yields every page of a paged list endpoint.
+
+    Page 1 is fetched alone to read `pagination.page_count`; the remaining
+    pages are then requested concurrently, at most `window` at a time, and
+    yielded in page order or, with `ordered=False`, as they arrive (use
+    `response.pagination.page` to tell them apart). Every other keyword,
+    including `request_options`, is passed to each `fetch` call. Pages still
+    in flight are cancelled when iteration stops early or a page fails.
+
+    Usage:
+        async for page in paginate(
+            client.projects.list, xero_tenant_id=tenant_id, page_size=500
+        ):
+            ...
+    """
+    if window < 1:
+        raise ValueError("window must be at least 1")
+
+    async def fetch_page(page: int) -> typing.Any:
+        if limiter is None:
+            return await fetch(page=page, **query)
+        async with limiter:
+            return await fetch(page=page, **query)
+
+    first = await fetch_page(1)
+    yield first
+    pages = iter(range(2, page_count(first) + 1))
+    in_flight: typing.Deque["asyncio.Future[typing.Any]"] = collections.deque()
+
+    def refill() -> None:
+        while len(in_flight) < window:
+            page = next(pages, None)
+            if page is None:
+                return
+            in_flight.append(asyncio.ensure_future(fetch_page(page)))
+
+    try:
+        refill()
+        while in_flight:
+            if ordered:
+                response = await in_flight[0]
+                in_flight.popleft()
+                refill()
+                yield response
+                continue
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                in_flight.remove(task)
+            refill()
+            for task in done:
+                yield task.result()
+    finally:
+        for task in in_flight:
+            task.cancel()
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
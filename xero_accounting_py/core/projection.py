@@ -0,0 +1,119 @@
+"""
+Field projection for response decoding.
+
+A projection is a list of dotted field paths such as
+`["invoice_id", "contact.name", "line_items.line_amount"]`. Each distinct
+projection of a model compiles once into a trimmed pydantic model that only
+declares the selected fields, so unselected keys and nested subtrees are
+skipped by the validator instead of being built and validated.
+"""
+
+import functools
+import typing
+
+import pydantic
+from xero_accounting_py.core.utils import (
+    map_annotation,
+    rebuild_model,
+    record_list_field,
+)
+
+_FieldTree = typing.Dict[str, typing.Optional["_FieldTree"]]
+
+
+def _field_tree(fields: typing.Iterable[str]) -> _FieldTree:
+    """Turns dotted paths into a nested tree, `None` marking a whole subtree"""
+    tree: _FieldTree = {}
+    for path in fields:
+        node = tree
+        parts = path.split(".")
+        for depth, part in enumerate(parts):
+            if part in node and node[part] is None:
+                break
+            if depth == len(parts) - 1:
+                node[part] = None
+            else:
+                node = node.setdefault(part, {})  # type: ignore[assignment]
+    return tree
+
+
+def _freeze(tree: typing.Optional[_FieldTree]) -> typing.Any:
+    if tree is None:
+        return None
+    return tuple(sorted((k, _freeze(v)) for k, v in tree.items()))
+
+
+def _thaw(frozen: typing.Any) -> typing.Optional[_FieldTree]:
+    if frozen is None:
+        return None
+    return {k: _thaw(v) for k, v in frozen}
+
+
+@functools.lru_cache(maxsize=512)
+def _build(
+    model: typing.Type[pydantic.BaseModel], frozen_tree: typing.Any
+) -> typing.Type[pydantic.BaseModel]:
+    rebuild_model(model)
+    tree = typing.cast(_FieldTree, _thaw(frozen_tree))
+    unknown = sorted(set(tree) - set(model.model_fields))
+    if unknown:
+        raise ValueError(
+            f"{model.__name__} has no field(s) {', '.join(map(repr, unknown))}"
+        )
+
+    definitions: typing.Dict[str, typing.Any] = {}
+    for name, subtree in tree.items():
+        info = model.model_fields[name]
+        if subtree is None:
+            annotation = map_annotation(info.annotation, _rebuilt)
+        else:
+            frozen_subtree = _freeze(subtree)
+            annotation = map_annotation(
+                info.annotation, lambda nested: _build(nested, frozen_subtree)
+            )
+        definitions[name] = (
+            annotation,
+            pydantic.Field(alias=info.alias, default=info.default),
+        )
+
+    return pydantic.create_model(  # type: ignore[no-any-return, call-overload]
+        model.__name__,
+        __config__=pydantic.ConfigDict(
+            arbitrary_types_allowed=True,
+            populate_by_name=True,
+        ),
+        __module__=__name__,
+        **definitions,
+    )
+
+
+def _rebuilt(
+    model: typing.Type[pydantic.BaseModel],
+) -> typing.Type[pydantic.BaseModel]:
+    rebuild_model(model)
+    return model
+
+
+def projected_model(
+    model: typing.Type[pydantic.BaseModel], fields: typing.Iterable[str]
+) -> typing.Type[pydantic.BaseModel]:
+    """
+    Returns a cached pydantic model declaring only the selected fields of `model`.
+
+    Paths are resolved against `model`. For list response wrappers such as
+    `models.Invoices`, paths that are not fields of the wrapper are resolved
+    against its records, and the wrapper's own fields (`pagination`,
+    `warnings`) are kept.
+
+    Raises:
+        ValueError: If a path names a field the model does not declare
+    """
+    tree = _field_tree(fields)
+    rebuild_model(model)
+    if not set(tree) <= set(model.model_fields):
+        records = record_list_field(model)
+        if records is not None:
+            wrapper: _FieldTree = {name: None for name in model.model_fields}
+            wrapper[records[0]] = tree
+            tree = wrapper
+    return _build(model, _freeze(tree))
@@ -0,0 +1,75 @@
+import asyncio
+import time
+import types
+import typing
+
+
+class RateLimiter:
+    """
+    Async limiter for the calls made against a single Xero tenant.
+
+    Bounds the number of requests in flight and spaces request starts with a
+    token bucket. The defaults follow Xero's published per-tenant limits of
+    5 concurrent calls and 60 calls per minute.
+
+    Usage:
+        async with limiter:
+            await client.projects.list(...)
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrent: int = 5,
+        calls_per_minute: float = 60,
+        clock: typing.Callable[[], float] = time.monotonic,
+    ):
+        self.max_concurrent = max_concurrent
+        self.calls_per_minute = calls_per_minute
+        self._clock = clock
+        # created on first use so they bind to the running event loop on 3.8/3.9
+        self._semaphore: typing.Optional[asyncio.Semaphore] = None
+        self._lock: typing.Optional[asyncio.Lock] = None
+        self._tokens = float(calls_per_minute)
+        self._updated = clock()
+
+    def _primitives(self) -> typing.Tuple[asyncio.Semaphore, asyncio.Lock]:
+        if self._semaphore is None or self._lock is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._lock = asyncio.Lock()
+        return self._semaphore, self._lock
+
+    async def _take_token(self) -> None:
+        _, lock = self._primitives()
+        async with lock:
+            rate = self.calls_per_minute / 60.0
+            while True:
+                now = self._clock()
+                self._tokens = min(
+                    float(self.calls_per_minute),
+                    self._tokens + (now - self._updated) * rate,
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / rate)
+
+    async def __aenter__(self) -> "RateLimiter":
+        semaphore, _ = self._primitives()
+        await semaphore.acquire()
+        try:
+            await self._take_token()
+        except BaseException:
+            semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: typing.Optional[typing.Type[BaseException]],
+        exc: typing.Optional[BaseException],
+        tb: typing.Optional[types.TracebackType],
+    ) -> None:
+        semaphore, _ = self._primitives()
+        semaphore.release()
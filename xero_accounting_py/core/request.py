@@ -0,0 +1,116 @@
+import typing
+
+import pydantic
+import typing_extensions
+from make_api_request import RequestOptions as _BaseRequestOptions
+from make_api_request import filter_not_given
+from make_api_request.request import model_dump
+
+DecodeMode = typing_extensions.Literal["model", "lite"]
+RawMode = typing_extensions.Literal["bytes", "json"]
+Priority = typing_extensions.Literal["interactive", "batch"]
+
+
+class RequestOptions(_BaseRequestOptions):
+    """
+    Additional options for customizing request behavior.
+
+    Extends the generated `RequestOptions` with settings understood by the
+    xero_accounting_py base clients. Any generated resource method accepts
+    these through its `request_options` argument.
+
+    Attributes:
+        decode: How JSON responses are decoded. `"model"` (default) validates
+            into the pydantic models, `"lite"` builds frozen slotted records
+            without validation (see `xero_accounting_py.core.lite`)
+        fields: Dotted field paths to decode, e.g. `["invoice_id", "contact.name"]`.
+            Only the selected fields are validated (see
+            `xero_accounting_py.core.projection`)
+        raw: Return a `RawResponse` with the status, headers and body
+            instead of decoding it: `"bytes"` leaves the body as received,
+            `"json"` also parses it into Python objects
+        priority: Lane of the request when the client has a priority
+            scheduler. `"interactive"` (default) calls are always served
+            before `"batch"` ones (see `xero_accounting_py.core.scheduler`)
+    """
+
+    decode: typing_extensions.NotRequired[DecodeMode]
+    fields: typing_extensions.NotRequired[typing.List[str]]
+    raw: typing_extensions.NotRequired[RawMode]
+    priority: typing_extensions.NotRequired[Priority]
+
+
+def get_option(
+    request_options: typing.Optional[_BaseRequestOptions], key: str, default: typing.Any
+) -> typing.Any:
+    """Reads an extended option from request options that may be a plain dict"""
+    if not request_options:
+        return default
+    return typing.cast(typing.Dict[str, typing.Any], request_options).get(key, default)
+
+
+def model_options(
+    request_options: typing.Optional[_BaseRequestOptions] = None,
+) -> RequestOptions:
+    """
+    Returns `request_options` with `decode="model"` and no `raw`, for calls
+    whose results are read as models whatever the client's defaults are.
+    """
+    options = dict(request_options or {})
+    options.update(decode="model", raw=None)
+    return typing.cast(RequestOptions, options)
+
+
+_Encoder = typing.Callable[[typing.Any], typing.Any]
+_ENCODERS: typing.Dict[typing.Any, _Encoder] = {}
+_SCALARS = (str, int, float, bool)
+
+
+def _adapter_encoder(dump_with: typing.Any) -> _Encoder:
+    adapter: pydantic.TypeAdapter[typing.Any] = pydantic.TypeAdapter(dump_with)
+
+    def encode(item: typing.Any) -> typing.Any:
+        return model_dump(adapter.validate_python(filter_not_given(item)))
+
+    return encode
+
+
+def _compile_encoder(dump_with: typing.Any) -> _Encoder:
+    """
+    Specializes encoding for a `dump_with` type. Values that already have the
+    exact target type (`str`, `int`, `float`, `bool`, `List[str]`) are passed
+    through; anything else is validated by a TypeAdapter built once per type.
+    """
+    fallback = _adapter_encoder(dump_with)
+    if dump_with in _SCALARS:
+
+        def encode_scalar(item: typing.Any) -> typing.Any:
+            return item if type(item) is dump_with else fallback(item)
+
+        return encode_scalar
+    if dump_with == typing.List[str]:
+
+        def encode_str_list(item: typing.Any) -> typing.Any:
+            if type(item) is list and all(type(v) is str for v in item):
+                return item
+            return fallback(item)
+
+        return encode_str_list
+    return fallback
+
+
+def to_encodable(*, item: typing.Any, dump_with: typing.Any) -> typing.Any:
+    """
+    Validates and converts an item to an encodable format using a specified type.
+
+    Drop-in replacement for `make_api_request.to_encodable` that compiles one
+    encoder per `dump_with` type and reuses it for every later call, instead of
+    building a new TypeAdapter per value.
+    """
+    try:
+        encoder = _ENCODERS.get(dump_with)
+    except TypeError:  # unhashable type expressions are encoded uncached
+        return _adapter_encoder(dump_with)(item)
+    if encoder is None:
+        encoder = _ENCODERS[dump_with] = _compile_encoder(dump_with)
+    return encoder(item)
@@ -0,0 +1,46 @@
+import typing
+
+import httpx
+import pydantic
+
+_ADAPTERS: typing.Dict[typing.Any, "pydantic.TypeAdapter[typing.Any]"] = {}
+
+
+def type_adapter(load_with: typing.Any) -> "pydantic.TypeAdapter[typing.Any]":
+    """Returns a TypeAdapter for `load_with`, built once per type"""
+    try:
+        adapter = _ADAPTERS.get(load_with)
+    except TypeError:  # unhashable type expressions are not cached
+        return pydantic.TypeAdapter(load_with)
+    if adapter is None:
+        adapter = _ADAPTERS[load_with] = pydantic.TypeAdapter(load_with)
+    return adapter
+
+
+def from_json(*, content: bytes, load_with: typing.Any) -> typing.Any:
+    """
+    Validates a JSON document into the specified type.
+
+    Unlike `make_api_request.from_encodable`, the bytes are handed straight to
+    pydantic-core, so no intermediate Python `dict` is built, and the
+    validator is reused across calls.
+    """
+    return type_adapter(load_with).validate_json(content)
+
+
+class RawResponse(typing.NamedTuple):
+    """
+    Undecoded response, returned for requests made with a `raw` option.
+
+    Attributes:
+        status_code: HTTP status of the response
+        headers: Response headers
+        content: Response body as received
+        data: The body parsed with the client's JSON codec for `raw="json"`,
+            otherwise None
+    """
+
+    status_code: int
+    headers: httpx.Headers
+    content: bytes
+    data: typing.Any = None
@@ -0,0 +1,147 @@
+"""
+Priority scheduling of requests across tenants.
+"""
+
+import asyncio
+import collections
+import contextlib
+import typing
+
+from xero_accounting_py.core.request import Priority
+
+PRIORITIES: typing.Tuple[Priority, ...] = ("interactive", "batch")
+
+
+class PriorityScheduler:
+    """
+    Admits requests to per-tenant slots, interactive calls first.
+
+    Each tenant has `per_tenant` slots. At most `per_tenant - reserved` of
+    them go to batch calls, so an interactive call never waits for a batch
+    backlog to drain. When a slot frees up, waiting interactive calls are
+    admitted before batch calls. Within a priority, tenants take turns, so a
+    tenant with a deep queue cannot delay the others. `max_total` optionally
+    caps the slots used across all tenants, for example to match the HTTP
+    connection pool.
+
+    Usage:
+        client = AsyncClient(oauth_token=token, scheduler=PriorityScheduler())
+        await client.accounting.invoices.update_or_create(
+            ..., request_options={"priority": "batch"}
+        )
+    """
+
+    def __init__(
+        self,
+        *,
+        per_tenant: int = 5,
+        reserved: int = 1,
+        max_total: typing.Optional[int] = None,
+    ):
+        if not 0 <= reserved < per_tenant:
+            raise ValueError("expected 0 <= reserved < per_tenant")
+        self.per_tenant = per_tenant
+        self.reserved = reserved
+        self.max_total = max_total
+        self._active: typing.Dict[
+            typing.Tuple[str, Priority], int
+        ] = collections.Counter()
+        self._total = 0
+        # tenants with waiters per priority, in turn order
+        self._queues: typing.Dict[
+            Priority,
+            "collections.OrderedDict[str, typing.Deque[asyncio.Future[None]]]",
+        ] = {priority: collections.OrderedDict() for priority in PRIORITIES}
+
+    def active(self, xero_tenant_id: str) -> typing.Dict[Priority, int]:
+        """Returns the slots in use by a tenant per priority"""
+        return {
+            priority: self._active[(xero_tenant_id, priority)]
+            for priority in PRIORITIES
+        }
+
+    def waiting(self, priority: Priority) -> int:
+        """Returns the number of calls of `priority` waiting for a slot"""
+        return sum(len(queue) for queue in self._queues[priority].values())
+
+    @contextlib.asynccontextmanager
+    async def slot(
+        self, xero_tenant_id: str, priority: Priority = "interactive"
+    ) -> typing.AsyncIterator[None]:
+        """Holds one slot of `xero_tenant_id` for the duration of the block"""
+        await self.acquire(xero_tenant_id, priority)
+        try:
+            yield
+        finally:
+            self.release(xero_tenant_id, priority)
+
+    async def acquire(
+        self, xero_tenant_id: str, priority: Priority = "interactive"
+    ) -> None:
+        if priority not in self._queues:
+            raise ValueError(f"unknown priority {priority!r}")
+        waiter = asyncio.get_event_loop().create_future()
+        self._queues[priority].setdefault(xero_tenant_id, collections.deque()).append(
+            waiter
+        )
+        self._dispatch()
+        try:
+            await waiter
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # admitted just before cancellation
+                self.release(xero_tenant_id, priority)
+            else:
+                self._discard(xero_tenant_id, priority, waiter)
+            raise
+
+    def release(self, xero_tenant_id: str, priority: Priority = "interactive") -> None:
+        self._active[(xero_tenant_id, priority)] -= 1
+        self._total -= 1
+        self._dispatch()
+
+    def _admits(self, xero_tenant_id: str, priority: Priority) -> bool:
+        if self.max_total is not None and self._total >= self.max_total:
+            return False
+        batch = self._active[(xero_tenant_id, "batch")]
+        interactive = self._active[(xero_tenant_id, "interactive")]
+        if priority == "batch" and batch >= self.per_tenant - self.reserved:
+            return False
+        return batch + interactive < self.per_tenant
+
+    def _dispatch(self) -> None:
+        for priority in PRIORITIES:
+            queues = self._queues[priority]
+            admitted = True
+            while admitted and queues:
+                admitted = False
+                for xero_tenant_id in list(queues):
+                    if not self._admits(xero_tenant_id, priority):
+                        continue
+                    queue = queues.pop(xero_tenant_id)
+                    waiter = queue.popleft()
+                    if queue:
+                        # back of the line behind the other tenants
+                        queues[xero_tenant_id] = queue
+                    if waiter.done():
+                        admitted = True
+                        continue
+                    self._active[(xero_tenant_id, priority)] += 1
+                    self._total += 1
+                    waiter.set_result(None)
+                    admitted = True
+            if self.max_total is not None and self._total >= self.max_total:
+                return
+
+    def _discard(
+        self,
+        xero_tenant_id: str,
+        priority: Priority,
+        waiter: "asyncio.Future[None]",
+    ) -> None:
+        queue = self._queues[priority].get(xero_tenant_id)
+        if queue is None or waiter not in queue:
+            return
+        queue.remove(waiter)
+        if not queue:
+            del self._queues[priority][xero_tenant_id]
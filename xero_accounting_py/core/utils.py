@@ -0,0 +1,76 @@
+import typing
+
+import pydantic
+from xero_accounting_py.types import models
+
+
+def resolve_annotation(annotation: typing.Any) -> typing.Any:
+    """Resolves forward references to generated models by name"""
+    if isinstance(annotation, typing.ForwardRef):
+        annotation = annotation.__forward_arg__
+    if isinstance(annotation, str):
+        return models._types_namespace.get(annotation, getattr(models, annotation))
+    return annotation
+
+
+def is_model(annotation: typing.Any) -> bool:
+    """Check if a type hint is a pydantic model class."""
+    return isinstance(annotation, type) and issubclass(annotation, pydantic.BaseModel)
+
+
+def rebuild_model(model: typing.Type[pydantic.BaseModel]) -> None:
+    """Resolves the forward references of a generated model"""
+    if not model.__pydantic_complete__:
+        model.model_rebuild(_types_namespace=models._types_namespace)
+
+
+def map_annotation(
+    annotation: typing.Any,
+    fn: typing.Callable[[typing.Type[pydantic.BaseModel]], typing.Any],
+) -> typing.Any:
+    """
+    Rebuilds an `Optional`/`List` annotation, replacing every model class it
+    wraps with `fn(model)`. Any other annotation is returned as is.
+    """
+    annotation = resolve_annotation(annotation)
+    if is_model(annotation):
+        return fn(annotation)
+    origin = typing.get_origin(annotation)
+    if origin is typing.Union:
+        return typing.Union[
+            tuple(map_annotation(a, fn) for a in typing.get_args(annotation))
+        ]
+    if origin is list:
+        return typing.List[map_annotation(typing.get_args(annotation)[0], fn)]  # type: ignore[misc]
+    return annotation
+
+
+def unwrap_optional(annotation: typing.Any) -> typing.Any:
+    """Strips `Optional[...]` from an annotation"""
+    annotation = resolve_annotation(annotation)
+    if typing.get_origin(annotation) is typing.Union:
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        if len(args) == 1:
+            return resolve_annotation(args[0])
+    return annotation
+
+
+def record_list_field(
+    model: typing.Type[pydantic.BaseModel],
+) -> typing.Optional[typing.Tuple[str, typing.Type[pydantic.BaseModel]]]:
+    """
+    Finds the field holding the records of a list response wrapper such as
+    `models.Invoices.invoices` or `models.TimeEntries.items`.
+
+    Returns:
+        The field name and record model, or None if `model` is not a wrapper
+    """
+    rebuild_model(model)
+    for name, info in model.model_fields.items():
+        annotation = unwrap_optional(info.annotation)
+        if name == "warnings" or typing.get_origin(annotation) is not list:
+            continue
+        item = resolve_annotation(typing.get_args(annotation)[0])
+        if is_model(item):
+            return name, item
+    return None
@@ -0,0 +1,56 @@
+from .aging import AgingEngine
+from .allocations import (
+    AllocationEngine,
+    AllocationOutcome,
+    OpenCredit,
+    OpenInvoice,
+    PlannedAllocation,
+)
+from .batch_payments import Batch, PaymentBatcher, PaymentIntent, PaymentOutcome
+from .consolidation import Consolidation, TenantReport
+from .cube import TrackingCube
+from .forecast import Occurrence, RepeatingForecast
+from .ledger import Ledger
+from .periods import OrganisationProfile, OrganisationProfiles, Period, PeriodPlanner
+from .preflight import Checked, Preflight, Rejection
+from .projects_sync import ProjectsSync
+from .reconcile import Candidate, Match, ReconciliationMatcher, StatementLine
+from .reference import ReferenceData, Resolution, ResolutionError
+from .variance import VarianceEngine, VarianceTable
+
+
+__all__ = [
+    "AgingEngine",
+    "AllocationEngine",
+    "AllocationOutcome",
+    "Batch",
+    "Candidate",
+    "Checked",
+    "Consolidation",
+    "Ledger",
+    "Match",
+    "Occurrence",
+    "OpenCredit",
+    "OpenInvoice",
+    "OrganisationProfile",
+    "OrganisationProfiles",
+    "PaymentBatcher",
+    "PaymentIntent",
+    "PaymentOutcome",
+    "Period",
+    "PeriodPlanner",
+    "PlannedAllocation",
+    "Preflight",
+    "ProjectsSync",
+    "ReconciliationMatcher",
+    "ReferenceData",
+    "Rejection",
+    "RepeatingForecast",
+    "Resolution",
+    "ResolutionError",
+    "StatementLine",
+    "TenantReport",
+    "TrackingCube",
+    "VarianceEngine",
+    "VarianceTable",
+]
@@ -0,0 +1,81 @@
+"""
+Concurrent, rate-limited fetching shared by the engines.
+"""
+
+import asyncio
+import typing
+
+from xero_accounting_py.core.paginate import paginate
+from xero_accounting_py.core.rate_limit import RateLimiter
+from xero_accounting_py.core.request import model_options
+
+Fetch = typing.Callable[..., typing.Awaitable[typing.Any]]
+
+# the Journals endpoint returns at most this many journals per call
+JOURNALS_PER_PAGE = 100
+
+
+async def gather(*aws: typing.Awaitable[typing.Any]) -> typing.List[typing.Any]:
+    """Like `asyncio.gather`, but cancels the remaining awaitables on failure"""
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+async def call(limiter: RateLimiter, fetch: Fetch, **kwargs: typing.Any) -> typing.Any:
+    """
+    Awaits `fetch(**kwargs)` within `limiter`, decoded into models whatever
+    the client's `decode` and `raw` defaults are.
+    """
+    kwargs["request_options"] = model_options(kwargs.get("request_options"))
+    async with limiter:
+        return await fetch(**kwargs)
+
+
+async def fetch_pages(
+    fetch: Fetch, *, limiter: RateLimiter, **query: typing.Any
+) -> typing.List[typing.Any]:
+    """
+    Fetches every page of a paged list endpoint, in page order.
+
+    The first page is fetched alone to read `pagination.page_count`; the
+    remaining pages are then requested concurrently, as many at a time as
+    `limiter` admits.
+    """
+    query["request_options"] = model_options(query.get("request_options"))
+    return [
+        page
+        async for page in paginate(
+            fetch, window=limiter.max_concurrent, limiter=limiter, **query
+        )
+    ]
+
+
+async def fetch_journals(
+    fetch: Fetch, *, limiter: RateLimiter, offset: int, window: int, **query: typing.Any
+) -> typing.AsyncIterator[typing.List[typing.Any]]:
+    """
+    Yields the journals numbered after `offset`, `window` pages at a time.
+
+    Journal numbers are sequential, so the pages of a window are requested
+    concurrently at consecutive offsets; a full page ends at least
+    `JOURNALS_PER_PAGE` numbers past its offset, so pages may overlap but
+    never leave gaps. Consumers must skip journals they already applied.
+    """
+    while True:
+        pages = await gather(
+            *(
+                call(limiter, fetch, offset=offset + n * JOURNALS_PER_PAGE, **query)
+                for n in range(window)
+            )
+        )
+        journals = [j for page in pages for j in page.journals or []]
+        yield journals
+        offset = max([offset, *(j.journal_number or 0 for j in journals)])
+        if any(len(page.journals or []) < JOURNALS_PER_PAGE for page in pages):
+            return
@@ -0,0 +1,22 @@
+"""
+Conversion between Xero amounts and the integer cents the engines sum.
+"""
+
+import typing
+
+
+def cents(value: typing.Optional[float], rate: float = 1.0) -> int:
+    """Returns an amount in cents, divided by a currency rate if given"""
+    return int(round((value or 0.0) / rate * 100))
+
+
+def parse_cents(value: typing.Optional[str]) -> int:
+    """Returns the cents of a report cell value like "1,234.50" """
+    if not value:
+        return 0
+    return int(round(float(value.replace(",", "")) * 100))
+
+
+def format_cents(value: int) -> str:
+    """Returns cents formatted as a report cell value"""
+    return f"{value / 100:.2f}"
@@ -0,0 +1,67 @@
+"""
+Builders for locally computed reports shaped like `models.ReportWithRows`.
+
+Reports are assembled as the JSON document the API would return and
+validated once at the end, which is several times faster than constructing
+each row and cell model separately, or decoded into lite records.
+"""
+
+import typing
+
+from xero_accounting_py.core.lite import decode_lite
+from xero_accounting_py.core.request import DecodeMode
+from xero_accounting_py.core.response import type_adapter
+from xero_accounting_py.core.utils import rebuild_model
+from xero_accounting_py.types import models
+
+Json = typing.Dict[str, typing.Any]
+
+
+def cell(value: str, attributes: typing.Optional[typing.List[Json]] = None) -> Json:
+    if attributes is None:
+        return {"Value": value}
+    return {"Value": value, "Attributes": attributes}
+
+
+def attribute(id_: str, value: str) -> Json:
+    return {"Id": id_, "Value": value}
+
+
+def row(cells: typing.List[Json], *, row_type: str = "Row") -> Json:
+    return {"RowType": row_type, "Cells": cells}
+
+
+def header(labels: typing.Iterable[str]) -> Json:
+    return row([cell(label) for label in labels], row_type="Header")
+
+
+def section(rows: typing.List[Json], *, title: str = "") -> Json:
+    return {"RowType": "Section", "Title": title, "Rows": rows}
+
+
+def report(
+    *,
+    report_id: str,
+    name: str,
+    titles: typing.List[str],
+    date: str,
+    rows: typing.List[Json],
+    decode: DecodeMode = "model",
+) -> typing.Any:
+    """Wraps `rows` into a single-report `ReportWithRows` document and decodes it"""
+    data = {
+        "Reports": [
+            {
+                "ReportID": report_id,
+                "ReportName": name,
+                "ReportType": report_id,
+                "ReportTitles": titles,
+                "ReportDate": date,
+                "Rows": rows,
+            }
+        ]
+    }
+    if decode == "lite":
+        return decode_lite(data, models.ReportWithRows)
+    rebuild_model(models.ReportWithRows)
+    return type_adapter(models.ReportWithRows).validate_python(data)
@@ -0,0 +1,45 @@
+"""
+Classification of account and document types shared by the engines.
+"""
+
+import typing
+
+import typing_extensions
+
+ContactLedger = typing_extensions.Literal["receivables", "payables"]
+
+# report section of each account type
+SECTIONS: typing.Dict[str, str] = {
+    "REVENUE": "Revenue",
+    "SALES": "Revenue",
+    "OTHERINCOME": "Revenue",
+    "EXPENSE": "Expenses",
+    "DIRECTCOSTS": "Expenses",
+    "OVERHEADS": "Expenses",
+    "DEPRECIATN": "Expenses",
+    "BANK": "Assets",
+    "CURRENT": "Assets",
+    "FIXED": "Assets",
+    "INVENTORY": "Assets",
+    "NONCURRENT": "Assets",
+    "PREPAYMENT": "Assets",
+    "CURRLIAB": "Liabilities",
+    "LIABILITY": "Liabilities",
+    "TERMLIAB": "Liabilities",
+    "PAYG": "Liabilities",
+    "EQUITY": "Equity",
+}
+# sections reported in the profit and loss rather than the balance sheet
+PROFIT_AND_LOSS = {"Revenue", "Expenses"}
+
+# ledger of each invoice, credit note, overpayment and prepayment type
+LEDGER_OF_TYPE: typing.Dict[str, ContactLedger] = {
+    "ACCREC": "receivables",
+    "ACCRECCREDIT": "receivables",
+    "RECEIVE-OVERPAYMENT": "receivables",
+    "RECEIVE-PREPAYMENT": "receivables",
+    "ACCPAY": "payables",
+    "ACCPAYCREDIT": "payables",
+    "SPEND-OVERPAYMENT": "payables",
+    "SPEND-PREPAYMENT": "payables",
+}
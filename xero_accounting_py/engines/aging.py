@@ -0,0 +1,372 @@
+"""
+Aged receivables and payables computed locally for every contact.
+"""
+
+import datetime
+import typing
+
+from xero_accounting_py.core.rate_limit import RateLimiter
+from xero_accounting_py.core.request import DecodeMode
+from xero_accounting_py.engines import _reports
+from xero_accounting_py.engines._fetch import fetch_pages, gather
+from xero_accounting_py.engines._money import cents, format_cents
+from xero_accounting_py.engines.accounts import LEDGER_OF_TYPE, ContactLedger
+from xero_accounting_py.engines.dates import (
+    format_report_date,
+    parse_date,
+    parse_utc,
+    where_updated_since,
+)
+from xero_accounting_py.resources.accounting import AsyncAccountingClient
+from xero_accounting_py.types import models
+
+_CREDIT_TYPES = {
+    "ACCRECCREDIT",
+    "RECEIVE-OVERPAYMENT",
+    "RECEIVE-PREPAYMENT",
+    "ACCPAYCREDIT",
+    "SPEND-OVERPAYMENT",
+    "SPEND-PREPAYMENT",
+}
+# documents in these states no longer affect any balance
+_DROPPED = {"DRAFT", "SUBMITTED", "DELETED", "VOIDED"}
+
+
+class _Document(typing.NamedTuple):
+    ledger: ContactLedger
+    contact_id: str
+    contact_name: str
+    date: int  # proleptic ordinals, so ageing is integer arithmetic
+    due: int
+    reference: str
+    sign: int
+    total: int  # all amounts in cents of the base currency
+    outstanding: int
+
+
+class AgingEngine:
+    """
+    Ages the open receivables and payables of a tenant without per-contact
+    report calls.
+
+    Invoices, credit notes, overpayments, prepayments and payments are
+    fetched once with `sync()` (every list page concurrently) and afterwards
+    incrementally, using an `UpdatedDateUTC` filter from the latest change
+    seen. Records can also be fed directly with `update()`.
+
+    Amounts are converted to the base currency with each document's
+    `CurrencyRate` and aged by due date (issue date for overpayments and
+    prepayments) into a "Current" column, `periods` columns of
+    `period_days` each, and "Older". Credits are negative. Ageing as at an
+    earlier date adds back the payments dated after it, so documents paid
+    since the first sync are kept (with nothing outstanding) rather than
+    dropped. Credit allocations are not dated by the API and are taken as
+    of the sync.
+
+    Usage:
+        engine = AgingEngine()
+        await engine.sync(client.accounting, xero_tenant_id=tenant_id)
+        report = engine.summary("receivables", as_at=datetime.date(2024, 6, 30))
+    """
+
+    def __init__(self, *, periods: int = 4, period_days: int = 30):
+        if periods < 1 or period_days < 1:
+            raise ValueError("periods and period_days must be at least 1")
+        self.periods = periods
+        self.period_days = period_days
+        self.updated_since: typing.Optional[datetime.datetime] = None
+        self._documents: typing.Dict[str, _Document] = {}
+        # document id -> payment id -> (date ordinal, base cents)
+        self._payments: typing.Dict[str, typing.Dict[str, typing.Tuple[int, int]]] = {}
+
+    @property
+    def columns(self) -> typing.List[str]:
+        """Bucket labels, from "Current" to "Older" """
+        labels = ["Current"]
+        for n in range(self.periods):
+            labels.append(
+                f"{n * self.period_days + 1} - {(n + 1) * self.period_days} days"
+            )
+        labels.append("Older")
+        return labels
+
+    async def sync(
+        self,
+        accounting: AsyncAccountingClient,
+        *,
+        xero_tenant_id: str,
+        limiter: typing.Optional[RateLimiter] = None,
+        page_size: int = 1000,
+    ) -> None:
+        """
+        Fetches the documents changed since the last sync, or every open
+        document on the first call, and applies them.
+        """
+        limiter = limiter or RateLimiter()
+        query: typing.Dict[str, typing.Any] = {
+            "xero_tenant_id": xero_tenant_id,
+            "page_size": page_size,
+            "limiter": limiter,
+        }
+        if self.updated_since is None:
+            where = 'Status=="AUTHORISED"'
+            invoice_filter: typing.Dict[str, typing.Any] = {"statuses": ["AUTHORISED"]}
+        else:
+            where = where_updated_since(self.updated_since)
+            invoice_filter = {"where": where}
+        invoices, credit_notes, overpayments, prepayments, payments = await gather(
+            fetch_pages(accounting.invoices.list, **invoice_filter, **query),
+            fetch_pages(accounting.credit_notes.list, where=where, **query),
+            fetch_pages(accounting.overpayments.list, where=where, **query),
+            fetch_pages(accounting.prepayments.list, where=where, **query),
+            fetch_pages(accounting.payments.list, where=where, **query),
+        )
+        self.update(
+            invoices=[i for page in invoices for i in page.invoices or []],
+            credit_notes=[c for page in credit_notes for c in page.credit_notes or []],
+            overpayments=[o for page in overpayments for o in page.overpayments or []],
+            prepayments=[p for page in prepayments for p in page.prepayments or []],
+            payments=[p for page in payments for p in page.payments or []],
+        )
+
+    def update(
+        self,
+        *,
+        invoices: typing.Iterable[models.Invoice] = (),
+        credit_notes: typing.Iterable[models.CreditNote] = (),
+        overpayments: typing.Iterable[models.Overpayment] = (),
+        prepayments: typing.Iterable[models.Prepayment] = (),
+        payments: typing.Iterable[models.Payment] = (),
+    ) -> None:
+        """Applies new or changed records, replacing earlier versions"""
+        for invoice in invoices:
+            self._apply(
+                invoice.invoice_id,
+                invoice,
+                invoice.amount_due,
+                parse_date(invoice.due_date),
+            )
+        for credit_note in credit_notes:
+            self._apply(
+                credit_note.credit_note_id,
+                credit_note,
+                credit_note.remaining_credit,
+                parse_date(credit_note.due_date),
+            )
+        for overpayment in overpayments:
+            self._apply(
+                overpayment.overpayment_id,
+                overpayment,
+                overpayment.remaining_credit,
+                None,
+            )
+        for prepayment in prepayments:
+            self._apply(
+                prepayment.prepayment_id, prepayment, prepayment.remaining_credit, None
+            )
+        for payment in payments:
+            self._apply_payment(payment)
+
+    def _apply(
+        self,
+        document_id: typing.Optional[str],
+        record: typing.Any,
+        outstanding: typing.Optional[float],
+        due: typing.Optional[datetime.date],
+    ) -> None:
+        if document_id is None:
+            return
+        self._seen(record.updated_date_utc)
+        ledger = LEDGER_OF_TYPE.get(record.type_ or "")
+        date = parse_date(record.date)
+        if record.status in _DROPPED or ledger is None or date is None:
+            self._documents.pop(document_id, None)
+            return
+        if record.status != "AUTHORISED" and document_id not in self._documents:
+            # a document closed before it was ever tracked never ages
+            return
+        contact = record.contact
+        rate = record.currency_rate or 1.0
+        self._documents[document_id] = _Document(
+            ledger=ledger,
+            contact_id=(contact and contact.contact_id) or "",
+            contact_name=(contact and contact.name) or "",
+            date=date.toordinal(),
+            due=(due or date).toordinal(),
+            reference=getattr(record, "invoice_number", None)
+            or getattr(record, "credit_note_number", None)
+            or record.reference
+            or "",
+            sign=-1 if record.type_ in _CREDIT_TYPES else 1,
+            total=cents(record.total, rate),
+            outstanding=cents(outstanding, rate),
+        )
+
+    def _apply_payment(self, payment: models.Payment) -> None:
+        self._seen(payment.updated_date_utc)
+        target = (
+            (payment.invoice and payment.invoice.invoice_id)
+            or (payment.credit_note and payment.credit_note.credit_note_id)
+            or (payment.overpayment and payment.overpayment.overpayment_id)
+            or (payment.prepayment and payment.prepayment.prepayment_id)
+        )
+        date = parse_date(payment.date)
+        if not target or payment.payment_id is None or date is None:
+            return
+        applied = self._payments.setdefault(target, {})
+        if payment.status == "DELETED":
+            applied.pop(payment.payment_id, None)
+            return
+        # payment amounts are in the document currency
+        rate = payment.currency_rate or 1.0
+        applied[payment.payment_id] = (date.toordinal(), cents(payment.amount, rate))
+
+    def _seen(self, updated_date_utc: typing.Optional[str]) -> None:
+        if updated_date_utc:
+            updated = parse_utc(updated_date_utc)
+            if self.updated_since is None or updated > self.updated_since:
+                self.updated_since = updated
+
+    def buckets(
+        self, ledger: ContactLedger, *, as_at: typing.Optional[datetime.date] = None
+    ) -> typing.Dict[str, typing.List[int]]:
+        """
+        Returns the aged balance per contact id, in cents, one value per
+        column in `columns`.
+        """
+        as_at_ord = (as_at or datetime.date.today()).toordinal()
+        width = self.periods + 2
+        totals: typing.Dict[str, typing.List[int]] = {}
+        for document_id, document in self._documents.items():
+            if document.ledger != ledger or document.date > as_at_ord:
+                continue
+            outstanding = document.outstanding
+            for paid_on, amount in self._payments.get(document_id, {}).values():
+                if paid_on > as_at_ord:
+                    outstanding += amount
+            if not outstanding:
+                continue
+            overdue = as_at_ord - document.due
+            if overdue <= 0:
+                column = 0
+            else:
+                column = min((overdue - 1) // self.period_days + 1, width - 1)
+            row = totals.get(document.contact_id)
+            if row is None:
+                row = totals[document.contact_id] = [0] * width
+            row[column] += document.sign * outstanding
+        return totals
+
+    def summary(
+        self,
+        ledger: ContactLedger,
+        *,
+        as_at: typing.Optional[datetime.date] = None,
+        decode: DecodeMode = "model",
+    ) -> models.ReportWithRows:
+        """
+        Returns the aged balances of all contacts, shaped like an aged
+        summary report: one row per contact and a totals row.
+        """
+        as_at = as_at or datetime.date.today()
+        names = {d.contact_id: d.contact_name for d in self._documents.values()}
+        balances = self.buckets(ledger, as_at=as_at)
+        rows = []
+        grand = [0] * (self.periods + 2)
+        for contact_id, balance in sorted(
+            balances.items(), key=lambda item: names.get(item[0], "").lower()
+        ):
+            attributes = [_reports.attribute("contactID", contact_id)]
+            cells = [_reports.cell(names.get(contact_id, ""), attributes)]
+            cells.extend(
+                _reports.cell(format_cents(v), attributes)
+                for v in [*balance, sum(balance)]
+            )
+            rows.append(_reports.row(cells))
+            grand = [a + b for a, b in zip(grand, balance)]
+        totals = [_reports.cell(format_cents(v)) for v in [*grand, sum(grand)]]
+        rows.append(
+            _reports.row([_reports.cell("Total"), *totals], row_type="SummaryRow")
+        )
+        return self._report(
+            ledger, as_at, ["Contact", *self.columns, "Total"], rows, decode
+        )
+
+    def by_contact(
+        self,
+        ledger: ContactLedger,
+        contact_id: str,
+        *,
+        as_at: typing.Optional[datetime.date] = None,
+        decode: DecodeMode = "model",
+    ) -> models.ReportWithRows:
+        """
+        Returns the open documents of one contact, shaped like
+        `get_aged_receivables_by_contact`/`get_aged_payables_by_contact`.
+        """
+        as_at = as_at or datetime.date.today()
+        as_at_ord = as_at.toordinal()
+        rows = []
+        total_sum = due_sum = 0
+        for document_id, document in sorted(
+            self._documents.items(), key=lambda item: (item[1].date, item[0])
+        ):
+            if (
+                document.ledger != ledger
+                or document.contact_id != contact_id
+                or document.date > as_at_ord
+            ):
+                continue
+            due = document.outstanding + sum(
+                amount
+                for paid_on, amount in self._payments.get(document_id, {}).values()
+                if paid_on > as_at_ord
+            )
+            if not due:
+                continue
+            total, due = document.sign * document.total, document.sign * due
+            total_sum += total
+            due_sum += due
+            attributes = [_reports.attribute("invoiceID", document_id)]
+            values = (
+                datetime.date.fromordinal(document.date).isoformat(),
+                document.reference,
+                datetime.date.fromordinal(document.due).isoformat(),
+                format_cents(total),
+                format_cents(total - due),
+                format_cents(due),
+            )
+            rows.append(_reports.row([_reports.cell(v, attributes) for v in values]))
+        totals = (total_sum, total_sum - due_sum, due_sum)
+        rows.append(
+            _reports.row(
+                [_reports.cell(v) for v in ("Total", "", "")]
+                + [_reports.cell(format_cents(v)) for v in totals],
+                row_type="SummaryRow",
+            )
+        )
+        return self._report(
+            ledger,
+            as_at,
+            ["Date", "Reference", "Due Date", "Total", "Paid", "Due"],
+            rows,
+            decode,
+        )
+
+    def _report(
+        self,
+        ledger: ContactLedger,
+        as_at: datetime.date,
+        columns: typing.List[str],
+        rows: typing.List[_reports.Json],
+        decode: DecodeMode,
+    ) -> typing.Any:
+        name = "Aged Receivables" if ledger == "receivables" else "Aged Payables"
+        return _reports.report(
+            report_id=name.replace(" ", ""),
+            name=name,
+            titles=[name, f"As at {format_report_date(as_at)}"],
+            date=format_report_date(as_at),
+            rows=[_reports.header(columns), _reports.section(rows)],
+            decode=decode,
+        )
@@ -0,0 +1,561 @@
+"""
+Bulk allocation of credit notes, overpayments and prepayments to invoices.
+"""
+
+import asyncio
+import collections
+import datetime
+import typing
+
+import httpx
+import typing_extensions
+from make_api_request import ApiError
+
+from xero_accounting_py.core.concurrency import OVERLOAD_STATUSES
+from xero_accounting_py.core.rate_limit import RateLimiter
+from xero_accounting_py.core.request import DecodeMode
+from xero_accounting_py.engines import _reports
+from xero_accounting_py.engines._fetch import call, fetch_pages, gather
+from xero_accounting_py.engines._money import cents, format_cents
+from xero_accounting_py.engines.accounts import LEDGER_OF_TYPE
+from xero_accounting_py.engines.dates import format_report_date, parse_date
+from xero_accounting_py.resources.accounting import AsyncAccountingClient
+from xero_accounting_py.types import models
+
+Strategy = typing_extensions.Literal["oldest_first", "exact_match"]
+CreditKind = typing_extensions.Literal["credit_note", "overpayment", "prepayment"]
+
+# credit kind -> (resource and response attribute, id argument)
+_RESOURCES: typing.Dict[CreditKind, typing.Tuple[str, str]] = {
+    "credit_note": ("credit_notes", "credit_note_id"),
+    "overpayment": ("overpayments", "overpayment_id"),
+    "prepayment": ("prepayments", "prepayment_id"),
+}
+
+
+class OpenCredit(typing.NamedTuple):
+    """A credit with an unallocated remainder"""
+
+    kind: CreditKind
+    credit_id: str
+    number: str
+    contact_id: str
+    contact_name: str
+    currency: str
+    ledger: str  # "receivables" or "payables"
+    date: int  # ordinal
+    remaining: int  # cents of the credit's currency
+
+
+class OpenInvoice(typing.NamedTuple):
+    """An invoice with an amount due"""
+
+    invoice_id: str
+    number: str
+    contact_id: str
+    currency: str
+    ledger: str
+    date: int
+    due: int
+    amount_due: int
+
+
+class PlannedAllocation(typing.NamedTuple):
+    """Part of a credit applied to one invoice"""
+
+    kind: CreditKind
+    credit_id: str
+    invoice_id: str
+    contact_id: str
+    amount: int  # cents
+    date: datetime.date
+
+
+class AllocationOutcome(typing.NamedTuple):
+    """Result of one planned allocation after `apply()`"""
+
+    allocation: PlannedAllocation
+    errors: typing.List[str]
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+def _transient(error: Exception) -> bool:
+    if isinstance(error, ApiError):
+        return error.status_code in OVERLOAD_STATUSES or (error.status_code or 0) >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+class AllocationEngine:
+    """
+    Plans and applies allocations of open credits to open invoices in bulk.
+
+    `load()` fetches the open invoices, credit notes, overpayments and
+    prepayments of a tenant (every list page concurrently); records can also
+    be fed with `update()`. `plan()` then matches credits to invoices of the
+    same contact, currency and ledger locally:
+
+    - `"oldest_first"` applies the oldest credits to the invoices due
+      first until either runs out
+    - `"exact_match"` only allocates a credit to an invoice whose amount due
+      equals its remaining credit, oldest invoice first
+
+    `report()` renders a plan as a dry-run report. `apply()` sends one call
+    per credit, all credits concurrently within the rate limit. Calls that
+    fail with a rate limit, server or connection error are retried after
+    re-reading the credit, so allocations the API applied before the error
+    are not sent twice.
+
+    Usage:
+        engine = AllocationEngine(strategy="oldest_first")
+        await engine.load(client.accounting, xero_tenant_id=tenant_id)
+        plan = engine.plan(contact_ids=[contact_id])
+        preview = engine.report(plan)
+        outcomes = await engine.apply(client.accounting, plan, xero_tenant_id=tenant_id)
+    """
+
+    def __init__(
+        self,
+        *,
+        strategy: Strategy = "oldest_first",
+        retries: int = 3,
+        backoff: float = 1.0,
+    ):
+        if strategy not in ("oldest_first", "exact_match"):
+            raise ValueError(f"unknown strategy {strategy!r}")
+        self.strategy = strategy
+        self.retries = retries
+        self.backoff = backoff
+        self.credits: typing.Dict[str, OpenCredit] = {}
+        self.invoices: typing.Dict[str, OpenInvoice] = {}
+        # credit id -> allocation ids that existed when it was loaded
+        self._allocated: typing.Dict[str, typing.Set[str]] = {}
+
+    async def load(
+        self,
+        accounting: AsyncAccountingClient,
+        *,
+        xero_tenant_id: str,
+        limiter: typing.Optional[RateLimiter] = None,
+        page_size: int = 1000,
+    ) -> None:
+        """Fetches every open invoice and credit of the tenant"""
+        query: typing.Dict[str, typing.Any] = {
+            "xero_tenant_id": xero_tenant_id,
+            "page_size": page_size,
+            "limiter": limiter or RateLimiter(),
+        }
+        where = 'Status=="AUTHORISED"'
+        invoices, credit_notes, overpayments, prepayments = await gather(
+            fetch_pages(accounting.invoices.list, statuses=["AUTHORISED"], **query),
+            fetch_pages(accounting.credit_notes.list, where=where, **query),
+            fetch_pages(accounting.overpayments.list, where=where, **query),
+            fetch_pages(accounting.prepayments.list, where=where, **query),
+        )
+        self.update(
+            invoices=[i for page in invoices for i in page.invoices or []],
+            credit_notes=[c for page in credit_notes for c in page.credit_notes or []],
+            overpayments=[o for page in overpayments for o in page.overpayments or []],
+            prepayments=[p for page in prepayments for p in page.prepayments or []],
+        )
+
+    def update(
+        self,
+        *,
+        invoices: typing.Iterable[models.Invoice] = (),
+        credit_notes: typing.Iterable[models.CreditNote] = (),
+        overpayments: typing.Iterable[models.Overpayment] = (),
+        prepayments: typing.Iterable[models.Prepayment] = (),
+    ) -> None:
+        """Applies new or changed records, dropping those no longer open"""
+        for invoice in invoices:
+            self._apply_invoice(invoice)
+        for credit_note in credit_notes:
+            self._apply_credit(
+                "credit_note",
+                credit_note.credit_note_id,
+                credit_note,
+                credit_note.credit_note_number,
+            )
+        for overpayment in overpayments:
+            self._apply_credit(
+                "overpayment", overpayment.overpayment_id, overpayment, None
+            )
+        for prepayment in prepayments:
+            self._apply_credit("prepayment", prepayment.prepayment_id, prepayment, None)
+
+    def _apply_invoice(self, invoice: models.Invoice) -> None:
+        if invoice.invoice_id is None:
+            return
+        ledger = LEDGER_OF_TYPE.get(invoice.type_ or "")
+        date = parse_date(invoice.date)
+        amount_due = cents(invoice.amount_due)
+        if (
+            invoice.status != "AUTHORISED"
+            or ledger is None
+            or date is None
+            or amount_due <= 0
+        ):
+            self.invoices.pop(invoice.invoice_id, None)
+            return
+        due = parse_date(invoice.due_date) or date
+        self.invoices[invoice.invoice_id] = OpenInvoice(
+            invoice_id=invoice.invoice_id,
+            number=invoice.invoice_number or "",
+            contact_id=(invoice.contact and invoice.contact.contact_id) or "",
+            currency=str(invoice.currency_code or ""),
+            ledger=ledger,
+            date=date.toordinal(),
+            due=due.toordinal(),
+            amount_due=amount_due,
+        )
+
+    def _apply_credit(
+        self,
+        kind: CreditKind,
+        credit_id: typing.Optional[str],
+        record: typing.Any,
+        number: typing.Optional[str],
+    ) -> None:
+        if credit_id is None:
+            return
+        ledger = LEDGER_OF_TYPE.get(record.type_ or "")
+        date = parse_date(record.date)
+        remaining = cents(record.remaining_credit)
+        if (
+            record.status != "AUTHORISED"
+            or ledger is None
+            or date is None
+            or remaining <= 0
+        ):
+            self.credits.pop(credit_id, None)
+            self._allocated.pop(credit_id, None)
+            return
+        contact = record.contact
+        self.credits[credit_id] = OpenCredit(
+            kind=kind,
+            credit_id=credit_id,
+            number=number or record.reference or "",
+            contact_id=(contact and contact.contact_id) or "",
+            contact_name=(contact and contact.name) or "",
+            currency=str(record.currency_code or ""),
+            ledger=ledger,
+            date=date.toordinal(),
+            remaining=remaining,
+        )
+        self._allocated[credit_id] = {
+            a.allocation_id for a in record.allocations or [] if a.allocation_id
+        }
+
+    def plan(
+        self,
+        *,
+        contact_ids: typing.Optional[typing.Iterable[str]] = None,
+        date: typing.Optional[datetime.date] = None,
+    ) -> typing.List[PlannedAllocation]:
+        """
+        Matches open credits to open invoices with the engine's strategy.
+
+        Allocations are dated `date`, or today, but never before the
+        credit or the invoice.
+        """
+        contacts = None if contact_ids is None else set(contact_ids)
+        floor = (date or datetime.date.today()).toordinal()
+        Group = typing.Tuple[str, str, str]
+        credits: typing.Dict[Group, typing.List[OpenCredit]] = collections.defaultdict(
+            list
+        )
+        invoices: typing.Dict[
+            Group, typing.List[OpenInvoice]
+        ] = collections.defaultdict(list)
+        for credit in self.credits.values():
+            if contacts is None or credit.contact_id in contacts:
+                credits[(credit.contact_id, credit.currency, credit.ledger)].append(
+                    credit
+                )
+        for invoice in self.invoices.values():
+            if contacts is None or invoice.contact_id in contacts:
+                invoices[(invoice.contact_id, invoice.currency, invoice.ledger)].append(
+                    invoice
+                )
+        planned = []
+        for group, group_credits in credits.items():
+            group_credits.sort(key=lambda c: (c.date, c.credit_id))
+            group_invoices = sorted(
+                invoices.get(group, ()), key=lambda i: (i.due, i.date, i.invoice_id)
+            )
+            if self.strategy == "exact_match":
+                pairs = self._exact(group_credits, group_invoices)
+            else:
+                pairs = self._oldest_first(group_credits, group_invoices)
+            for credit, invoice, amount in pairs:
+                planned.append(
+                    PlannedAllocation(
+                        kind=credit.kind,
+                        credit_id=credit.credit_id,
+                        invoice_id=invoice.invoice_id,
+                        contact_id=credit.contact_id,
+                        amount=amount,
+                        date=datetime.date.fromordinal(
+                            max(floor, credit.date, invoice.date)
+                        ),
+                    )
+                )
+        return planned
+
+    @staticmethod
+    def _oldest_first(
+        credits: typing.List[OpenCredit], invoices: typing.List[OpenInvoice]
+    ) -> typing.Iterator[typing.Tuple[OpenCredit, OpenInvoice, int]]:
+        due = [invoice.amount_due for invoice in invoices]
+        index = 0
+        for credit in credits:
+            remaining = credit.remaining
+            while remaining and index < len(invoices):
+                amount = min(remaining, due[index])
+                yield credit, invoices[index], amount
+                remaining -= amount
+                due[index] -= amount
+                if not due[index]:
+                    index += 1
+
+    @staticmethod
+    def _exact(
+        credits: typing.List[OpenCredit], invoices: typing.List[OpenInvoice]
+    ) -> typing.Iterator[typing.Tuple[OpenCredit, OpenInvoice, int]]:
+        by_amount: typing.Dict[int, typing.Deque[OpenInvoice]] = {}
+        for invoice in invoices:
+            by_amount.setdefault(invoice.amount_due, collections.deque()).append(
+                invoice
+            )
+        for credit in credits:
+            candidates = by_amount.get(credit.remaining)
+            if candidates:
+                yield credit, candidates.popleft(), credit.remaining
+
+    def report(
+        self,
+        plan: typing.Sequence[PlannedAllocation],
+        *,
+        decode: DecodeMode = "model",
+    ) -> models.ReportWithRows:
+        """
+        Renders a plan as a dry-run report: a section per contact with one
+        row per allocation, and the credit left unallocated after it.
+        """
+        sections: typing.Dict[str, typing.List[_reports.Json]] = {}
+        left = {
+            credit_id: credit.remaining for credit_id, credit in self.credits.items()
+        }
+        totals: typing.Dict[str, int] = collections.Counter()
+        for allocation in plan:
+            credit = self.credits.get(allocation.credit_id)
+            invoice = self.invoices.get(allocation.invoice_id)
+            left[allocation.credit_id] = (
+                left.get(allocation.credit_id, 0) - allocation.amount
+            )
+            totals[allocation.contact_id] += allocation.amount
+            sections.setdefault(allocation.contact_id, []).append(
+                _reports.row(
+                    [
+                        _reports.cell(
+                            credit.number if credit else "",
+                            [_reports.attribute(allocation.kind, allocation.credit_id)],
+                        ),
+                        _reports.cell(
+                            invoice.number if invoice else "",
+                            [_reports.attribute("invoice", allocation.invoice_id)],
+                        ),
+                        _reports.cell(allocation.date.isoformat()),
+                        _reports.cell(format_cents(allocation.amount)),
+                        _reports.cell(format_cents(left[allocation.credit_id])),
+                    ]
+                )
+            )
+        names = {c.contact_id: c.contact_name for c in self.credits.values()}
+        rows = [_reports.header(["Credit", "Invoice", "Date", "Amount", "Credit Left"])]
+        for contact_id, contact_rows in sections.items():
+            contact_rows.append(
+                _reports.row(
+                    [
+                        _reports.cell("Total"),
+                        _reports.cell(""),
+                        _reports.cell(""),
+                        _reports.cell(format_cents(totals[contact_id])),
+                        _reports.cell(""),
+                    ],
+                    row_type="SummaryRow",
+                )
+            )
+            rows.append(_reports.section(contact_rows, title=names.get(contact_id, "")))
+        today = format_report_date(datetime.date.today())
+        return _reports.report(
+            report_id="AllocationPlan",
+            name="Allocation Plan",
+            titles=["Allocation Plan", f"Prepared {today}"],
+            date=today,
+            rows=rows,
+            decode=decode,
+        )
+
+    async def apply(
+        self,
+        accounting: AsyncAccountingClient,
+        plan: typing.Sequence[PlannedAllocation],
+        *,
+        xero_tenant_id: str,
+        limiter: typing.Optional[RateLimiter] = None,
+    ) -> typing.List[AllocationOutcome]:
+        """
+        Creates the planned allocations and returns one outcome per
+        allocation, in plan order. Successful allocations are deducted from
+        the loaded credits and invoices.
+        """
+        limiter = limiter or RateLimiter()
+        by_credit: typing.Dict[
+            typing.Tuple[CreditKind, str], typing.List[PlannedAllocation]
+        ] = {}
+        for allocation in plan:
+            by_credit.setdefault((allocation.kind, allocation.credit_id), []).append(
+                allocation
+            )
+        results = await gather(
+            *(
+                self._allocate(
+                    accounting, kind, credit_id, group, xero_tenant_id, limiter
+                )
+                for (kind, credit_id), group in by_credit.items()
+            )
+        )
+        errors = {
+            id(allocation): messages
+            for result in results
+            for allocation, messages in result
+        }
+        outcomes = [
+            AllocationOutcome(allocation, errors[id(allocation)]) for allocation in plan
+        ]
+        for outcome in outcomes:
+            if outcome.ok:
+                self._deduct(outcome.allocation)
+        return outcomes
+
+    async def _allocate(
+        self,
+        accounting: AsyncAccountingClient,
+        kind: CreditKind,
+        credit_id: str,
+        allocations: typing.List[PlannedAllocation],
+        xero_tenant_id: str,
+        limiter: RateLimiter,
+    ) -> typing.List[typing.Tuple[PlannedAllocation, typing.List[str]]]:
+        resource_name, id_name = _RESOURCES[kind]
+        resource = getattr(accounting, resource_name)
+        done: typing.List[typing.Tuple[PlannedAllocation, typing.List[str]]] = []
+        pending = list(allocations)
+        for attempt in range(self.retries + 1):
+            try:
+                if attempt:
+                    applied = await self._applied(
+                        resource,
+                        resource_name,
+                        id_name,
+                        credit_id,
+                        xero_tenant_id,
+                        limiter,
+                    )
+                    for allocation in list(pending):
+                        ids = applied.get(
+                            (allocation.invoice_id.lower(), allocation.amount)
+                        )
+                        if ids:
+                            self._allocated.setdefault(credit_id, set()).add(ids.pop())
+                            pending.remove(allocation)
+                            done.append((allocation, []))
+                    if not pending:
+                        return done
+                response = await call(
+                    limiter,
+                    resource.allocations.create,
+                    **{id_name: credit_id},
+                    xero_tenant_id=xero_tenant_id,
+                    allocations=[
+                        {
+                            "invoice": {"invoice_id": allocation.invoice_id},
+                            "amount": round(allocation.amount / 100, 2),
+                            "date": allocation.date.isoformat(),
+                        }
+                        for allocation in pending
+                    ],
+                    summarize_errors=False,
+                )
+            except (ApiError, httpx.TransportError) as error:
+                if attempt < self.retries and _transient(error):
+                    await asyncio.sleep(self.backoff * 2**attempt)
+                    continue
+                return done + [(allocation, [str(error)]) for allocation in pending]
+            created = response.allocations or []
+            for index, allocation in enumerate(pending):
+                record = created[index] if index < len(created) else None
+                if record is None:
+                    done.append((allocation, ["no allocation returned"]))
+                    continue
+                errors = [e.message or "" for e in record.validation_errors or []]
+                if not errors and record.allocation_id:
+                    self._allocated.setdefault(credit_id, set()).add(
+                        record.allocation_id
+                    )
+                done.append((allocation, errors))
+            return done
+        return done  # unreachable, the last attempt returns
+
+    async def _applied(
+        self,
+        resource: typing.Any,
+        resource_name: str,
+        id_name: str,
+        credit_id: str,
+        xero_tenant_id: str,
+        limiter: RateLimiter,
+    ) -> typing.Dict[typing.Tuple[str, int], typing.List[str]]:
+        """
+        Returns the ids of allocations made to a credit that this engine
+        has not seen, by invoice id and amount
+        """
+        response = await call(
+            limiter, resource.get, **{id_name: credit_id}, xero_tenant_id=xero_tenant_id
+        )
+        known = self._allocated.get(credit_id, set())
+        applied: typing.Dict[typing.Tuple[str, int], typing.List[str]] = {}
+        for record in getattr(response, resource_name) or []:
+            for allocation in record.allocations or []:
+                if allocation.is_deleted or allocation.allocation_id in known:
+                    continue
+                key = (
+                    str(allocation.invoice.invoice_id).lower(),
+                    cents(allocation.amount),
+                )
+                applied.setdefault(key, []).append(allocation.allocation_id or "")
+        return applied
+
+    def _deduct(self, allocation: PlannedAllocation) -> None:
+        credit = self.credits.get(allocation.credit_id)
+        if credit is not None:
+            remaining = credit.remaining - allocation.amount
+            if remaining > 0:
+                self.credits[allocation.credit_id] = credit._replace(
+                    remaining=remaining
+                )
+            else:
+                del self.credits[allocation.credit_id]
+        invoice = self.invoices.get(allocation.invoice_id)
+        if invoice is not None:
+            amount_due = invoice.amount_due - allocation.amount
+            if amount_due > 0:
+                self.invoices[allocation.invoice_id] = invoice._replace(
+                    amount_due=amount_due
+                )
+            else:
+                del self.invoices[allocation.invoice_id]
@@ -0,0 +1,281 @@
+"""
+Planning and submission of payments as batch payments.
+"""
+
+import datetime
+import typing
+
+from xero_accounting_py.core.rate_limit import RateLimiter
+from xero_accounting_py.engines._fetch import call, gather
+from xero_accounting_py.resources.accounting import AsyncAccountingClient
+
+
+class PaymentIntent(typing.NamedTuple):
+    """One invoice payment to be made"""
+
+    invoice_id: str
+    amount: int  # cents in the invoice currency
+    date: datetime.date
+    account_id: str  # bank account the money is paid into or out of
+    reference: str = ""
+    # caller's own identifier, echoed in the outcome
+    key: typing.Optional[str] = None
+
+
+class Batch(typing.NamedTuple):
+    """Intents settled by one batch payment, i.e. one bank statement line"""
+
+    account_id: str
+    date: datetime.date
+    reference: str
+    intents: typing.List[PaymentIntent]
+
+    @property
+    def amount(self) -> int:
+        return sum(intent.amount for intent in self.intents)
+
+
+class PaymentOutcome(typing.NamedTuple):
+    """Result of one intent after submission"""
+
+    intent: PaymentIntent
+    payment_id: typing.Optional[str]
+    # None if the intent was paid individually after its batch was rejected
+    batch_payment_id: typing.Optional[str]
+    errors: typing.List[str]
+
+    @property
+    def ok(self) -> bool:
+        return self.payment_id is not None and not self.errors
+
+
+def _amount(cents: int) -> float:
+    return round(cents / 100, 2)
+
+
+def _messages(record: typing.Any) -> typing.List[str]:
+    return [e.message or "" for e in record.validation_errors or []]
+
+
+def _failed(
+    intents: typing.Iterable[PaymentIntent], exc: Exception
+) -> typing.List[PaymentOutcome]:
+    """Outcomes of intents whose call failed"""
+    message = str(exc) or type(exc).__name__
+    return [
+        PaymentOutcome(
+            intent=intent, payment_id=None, batch_payment_id=None, errors=[message]
+        )
+        for intent in intents
+    ]
+
+
+class PaymentBatcher:
+    """
+    Folds individual invoice payments into batch payments.
+
+    `plan()` groups intents by bank account, date and reference, the fields
+    a batch payment shares, so each group settles as one bank statement
+    line. An invoice paid twice in a group, and groups over `max_payments`,
+    are split into further batches. `submit()` creates the batches with up
+    to `batches_per_call` per `BatchPayments` call, concurrently, and
+    reports an outcome per intent. When `fallback` is set, the intents of a
+    rejected batch are retried as individual payments in one `Payments`
+    call, so one bad invoice does not hold back the rest.
+
+    Usage:
+        batcher = PaymentBatcher()
+        outcomes = await batcher.submit(
+            client.accounting, batcher.plan(intents), xero_tenant_id=tenant_id
+        )
+        failed = [o for o in outcomes if not o.ok]
+    """
+
+    def __init__(
+        self,
+        *,
+        max_payments: int = 100,
+        batches_per_call: int = 10,
+        fallback: bool = True,
+    ):
+        if max_payments < 1 or batches_per_call < 1:
+            raise ValueError("max_payments and batches_per_call must be at least 1")
+        self.max_payments = max_payments
+        self.batches_per_call = batches_per_call
+        self.fallback = fallback
+
+    def plan(self, intents: typing.Iterable[PaymentIntent]) -> typing.List[Batch]:
+        """Groups intents into batches, in order of each group's first intent"""
+        groups: typing.Dict[
+            typing.Tuple[str, datetime.date, str],
+            typing.List[typing.List[PaymentIntent]],
+        ] = {}
+        for intent in intents:
+            if intent.amount <= 0:
+                raise ValueError(
+                    f"payment of invoice {intent.invoice_id} is not positive"
+                )
+            batches = groups.setdefault(
+                (intent.account_id, intent.date, intent.reference), []
+            )
+            for batch in batches:
+                if len(batch) < self.max_payments and all(
+                    other.invoice_id != intent.invoice_id for other in batch
+                ):
+                    batch.append(intent)
+                    break
+            else:
+                batches.append([intent])
+        return [
+            Batch(account_id=account_id, date=date, reference=reference, intents=batch)
+            for (account_id, date, reference), batches in groups.items()
+            for batch in batches
+        ]
+
+    async def submit(
+        self,
+        accounting: AsyncAccountingClient,
+        batches: typing.Sequence[Batch],
+        *,
+        xero_tenant_id: str,
+        limiter: typing.Optional[RateLimiter] = None,
+    ) -> typing.List[PaymentOutcome]:
+        """
+        Creates the batch payments and returns one outcome per intent, in
+        the order of `batches`, including intents paid individually. A call
+        that fails reports its error on the intents it carried only,
+        leaving the outcomes of other calls and accepted batches intact.
+        """
+        limiter = limiter or RateLimiter()
+        chunks = [
+            batches[start : start + self.batches_per_call]
+            for start in range(0, len(batches), self.batches_per_call)
+        ]
+        results = await gather(
+            *(
+                self._submit_chunk(accounting, chunk, xero_tenant_id, limiter)
+                for chunk in chunks
+            )
+        )
+        return [outcome for result in results for outcome in result]
+
+    async def _submit_chunk(
+        self,
+        accounting: AsyncAccountingClient,
+        batches: typing.Sequence[Batch],
+        xero_tenant_id: str,
+        limiter: RateLimiter,
+    ) -> typing.List[PaymentOutcome]:
+        try:
+            response = await call(
+                limiter,
+                accounting.batch_payments.create,
+                xero_tenant_id=xero_tenant_id,
+                batch_payments=[
+                    {
+                        "account": {"account_id": batch.account_id},
+                        "date": batch.date.isoformat(),
+                        "reference": batch.reference,
+                        "payments": [
+                            {
+                                "invoice": {"invoice_id": intent.invoice_id},
+                                "amount": _amount(intent.amount),
+                            }
+                            for intent in batch.intents
+                        ],
+                    }
+                    for batch in batches
+                ],
+                summarize_errors=False,
+            )
+        except Exception as exc:
+            # other chunks may already have been created, so they are kept
+            return _failed([i for batch in batches for i in batch.intents], exc)
+        created = response.batch_payments or []
+        # one slot per intent in plan order; None until paid individually
+        outcomes: typing.List[typing.Optional[PaymentOutcome]] = []
+        rejected: typing.List[int] = []
+        # elements come back in request order
+        for index, batch in enumerate(batches):
+            record = created[index] if index < len(created) else None
+            errors = (
+                ["no batch payment returned"] if record is None else _messages(record)
+            )
+            if errors and self.fallback:
+                rejected.extend(
+                    range(len(outcomes), len(outcomes) + len(batch.intents))
+                )
+                outcomes.extend([None] * len(batch.intents))
+                continue
+            payments = {
+                str(p.invoice.invoice_id).lower(): p
+                for p in (record.payments if record is not None else None) or []
+                if p.invoice is not None
+            }
+            for intent in batch.intents:
+                payment = payments.get(intent.invoice_id.lower())
+                outcomes.append(
+                    PaymentOutcome(
+                        intent=intent,
+                        payment_id=None
+                        if errors or payment is None
+                        else payment.payment_id,
+                        batch_payment_id=None
+                        if errors or record is None
+                        else record.batch_payment_id,
+                        errors=errors + (_messages(payment) if payment else []),
+                    )
+                )
+        if rejected:
+            intents = [i for batch in batches for i in batch.intents]
+            retried = [intents[position] for position in rejected]
+            try:
+                paid = await self._pay_individually(
+                    accounting, retried, xero_tenant_id, limiter
+                )
+            except Exception as exc:
+                # only the rejected intents failed; accepted batches stand
+                paid = _failed(retried, exc)
+            for position, outcome in zip(rejected, paid):
+                outcomes[position] = outcome
+        return [outcome for outcome in outcomes if outcome is not None]
+
+    async def _pay_individually(
+        self,
+        accounting: AsyncAccountingClient,
+        intents: typing.List[PaymentIntent],
+        xero_tenant_id: str,
+        limiter: RateLimiter,
+    ) -> typing.List[PaymentOutcome]:
+        response = await call(
+            limiter,
+            accounting.payments.create,
+            xero_tenant_id=xero_tenant_id,
+            payments=[
+                {
+                    "invoice": {"invoice_id": intent.invoice_id},
+                    "account": {"account_id": intent.account_id},
+                    "date": intent.date.isoformat(),
+                    "amount": _amount(intent.amount),
+                    "reference": intent.reference,
+                }
+                for intent in intents
+            ],
+            summarize_errors=False,
+        )
+        payments = response.payments or []
+        outcomes = []
+        for index, intent in enumerate(intents):
+            payment = payments[index] if index < len(payments) else None
+            errors = ["no payment returned"] if payment is None else _messages(payment)
+            outcomes.append(
+                PaymentOutcome(
+                    intent=intent,
+                    payment_id=None
+                    if errors or payment is None
+                    else payment.payment_id,
+                    batch_payment_id=None,
+                    errors=errors,
+                )
+            )
+        return outcomes
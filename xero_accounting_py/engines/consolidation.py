@@ -0,0 +1,226 @@
+"""
+Consolidation of one report across several organisations.
+"""
+
+import datetime
+import typing
+
+import typing_extensions
+
+from xero_accounting_py.core.rate_limit import RateLimiter
+from xero_accounting_py.core.request import DecodeMode
+from xero_accounting_py.engines import _reports
+from xero_accounting_py.engines._fetch import call, gather
+from xero_accounting_py.engines._money import format_cents, parse_cents
+from xero_accounting_py.engines.dates import format_report_date
+from xero_accounting_py.resources.accounting import AsyncAccountingClient
+from xero_accounting_py.types import models
+
+ConsolidatedReport = typing_extensions.Literal["profit_and_loss", "balance_sheet"]
+
+_NAMES = {"profit_and_loss": "Profit and Loss", "balance_sheet": "Balance Sheet"}
+
+
+class TenantReport(typing.NamedTuple):
+    """One organisation's report, with the records needed to consolidate it"""
+
+    organisation: models.Organisation
+    accounts: typing.List[models.Account]
+    report: models.ReportWithRows
+
+
+class Consolidation:
+    """
+    Consolidates a profit and loss or balance sheet across organisations.
+
+    `run()` requests the report, the organisation and the chart of
+    accounts of every tenant concurrently, as many at a time as the
+    limiter admits. Account rows are then mapped to consolidated lines
+    through `chart`, by account code (overridden per tenant by `charts`);
+    unmapped accounts keep their own name. Each organisation's amounts are
+    converted from its base currency with `rates`, the units of the
+    presentation currency per unit of each currency.
+
+    The consolidated report keeps the sections of the source reports, with
+    a column per organisation, a consolidated column and a total per
+    section. Only the first value column of each source report, its
+    current period, is consolidated; computed rows such as gross or net
+    profit are left out.
+
+    Usage:
+        consolidation = Consolidation(tenant_ids, chart={"200": "Sales"})
+        report = await consolidation.run(
+            client.accounting,
+            "profit_and_loss",
+            currency="NZD",
+            rates={"AUD": 1.08, "USD": 1.65},
+            from_date="2024-07-01",
+            to_date="2024-09-30",
+        )
+    """
+
+    def __init__(
+        self,
+        tenant_ids: typing.Iterable[str],
+        *,
+        chart: typing.Optional[typing.Mapping[str, str]] = None,
+        charts: typing.Optional[typing.Mapping[str, typing.Mapping[str, str]]] = None,
+    ):
+        self.tenant_ids = list(tenant_ids)
+        self.chart = dict(chart or {})
+        self.charts = {t: dict(c) for t, c in (charts or {}).items()}
+
+    async def fetch(
+        self,
+        accounting: AsyncAccountingClient,
+        report: ConsolidatedReport,
+        *,
+        limiter: typing.Optional[RateLimiter] = None,
+        **query: typing.Any,
+    ) -> typing.Dict[str, TenantReport]:
+        """Fetches the report of every tenant, passing `query` to the report call"""
+        limiter = limiter or RateLimiter()
+        get: typing.Callable[..., typing.Awaitable[models.ReportWithRows]]
+        if report == "profit_and_loss":
+            get = accounting.reports.get_profit_and_loss
+        elif report == "balance_sheet":
+            get = accounting.reports.get_balance_sheet
+        else:
+            raise ValueError(f"unknown report {report!r}")
+
+        async def tenant(xero_tenant_id: str) -> TenantReport:
+            organisations, accounts, response = await gather(
+                call(
+                    limiter, accounting.organisation.list, xero_tenant_id=xero_tenant_id
+                ),
+                call(limiter, accounting.accounts.list, xero_tenant_id=xero_tenant_id),
+                call(limiter, get, xero_tenant_id=xero_tenant_id, **query),
+            )
+            found = organisations.organisations or [models.Organisation()]
+            return TenantReport(
+                organisation=found[0],
+                accounts=accounts.accounts or [],
+                report=response,
+            )
+
+        fetched = await gather(*(tenant(t) for t in self.tenant_ids))
+        return dict(zip(self.tenant_ids, fetched))
+
+    async def run(
+        self,
+        accounting: AsyncAccountingClient,
+        report: ConsolidatedReport,
+        *,
+        currency: str,
+        rates: typing.Mapping[str, float],
+        limiter: typing.Optional[RateLimiter] = None,
+        decode: DecodeMode = "model",
+        **query: typing.Any,
+    ) -> models.ReportWithRows:
+        """Fetches and consolidates the report of every tenant"""
+        fetched = await self.fetch(accounting, report, limiter=limiter, **query)
+        return self.consolidate(
+            report, fetched, currency=currency, rates=rates, decode=decode
+        )
+
+    def consolidate(
+        self,
+        report: ConsolidatedReport,
+        tenants: typing.Mapping[str, TenantReport],
+        *,
+        currency: str,
+        rates: typing.Mapping[str, float],
+        decode: DecodeMode = "model",
+    ) -> models.ReportWithRows:
+        """
+        Consolidates fetched reports, raising `ValueError` when a tenant's
+        base currency has no rate.
+        """
+        factors = {}
+        for tenant_id, fetched in tenants.items():
+            base = str(fetched.organisation.base_currency or currency)
+            if base == currency:
+                factors[tenant_id] = 1.0
+            elif base in rates:
+                factors[tenant_id] = rates[base]
+            else:
+                raise ValueError(f"no rate from {base} to {currency}")
+
+        # section title -> line -> tenant id -> cents, in first seen order
+        sections: typing.Dict[str, typing.Dict[str, typing.Dict[str, int]]] = {}
+        date = ""
+        for tenant_id, fetched in tenants.items():
+            chart = dict(self.chart)
+            chart.update(self.charts.get(tenant_id, {}))
+            codes = {a.account_id: a.code or "" for a in fetched.accounts}
+            for source in fetched.report.reports or []:
+                date = date or source.report_date or ""
+                for section in source.rows or []:
+                    for row in section.rows or []:
+                        cells = row.cells or []
+                        if row.row_type != "Row" or len(cells) < 2:
+                            continue
+                        account_id = next(
+                            (
+                                a.value
+                                for a in cells[0].attributes or []
+                                if a.id == "account" and a.value
+                            ),
+                            None,
+                        )
+                        if account_id is None:
+                            continue
+                        line = chart.get(codes.get(account_id, "")) or (
+                            cells[0].value or account_id
+                        )
+                        lines = sections.setdefault(section.title or "", {})
+                        amounts = lines.setdefault(line, {})
+                        amounts[tenant_id] = amounts.get(tenant_id, 0) + int(
+                            round(parse_cents(cells[1].value) * factors[tenant_id])
+                        )
+
+        labels = [tenants[t].organisation.name or t for t in tenants]
+        rows = [_reports.header(["Account", *labels, "Consolidated"])]
+        for title, lines in sections.items():
+            totals = dict.fromkeys(tenants, 0)
+            section_rows = []
+            for line, amounts in lines.items():
+                values = [amounts.get(t, 0) for t in tenants]
+                for tenant_id, value in zip(tenants, values):
+                    totals[tenant_id] += value
+                section_rows.append(
+                    _reports.row(
+                        [
+                            _reports.cell(line),
+                            *(
+                                _reports.cell(format_cents(v))
+                                for v in [*values, sum(values)]
+                            ),
+                        ]
+                    )
+                )
+            section_rows.append(
+                _reports.row(
+                    [
+                        _reports.cell(f"Total {title}" if title else "Total"),
+                        *(
+                            _reports.cell(format_cents(v))
+                            for v in [*totals.values(), sum(totals.values())]
+                        ),
+                    ],
+                    row_type="SummaryRow",
+                )
+            )
+            rows.append(_reports.section(section_rows, title=title))
+        name = _NAMES[report]
+        return _reports.report(
+            report_id=f"Consolidated{name.replace(' ', '')}",
+            name=f"Consolidated {name}",
+            titles=[
+                f"Consolidated {name}",
+                f"{len(tenants)} organisations in {currency}",
+            ],
+            date=date or format_report_date(datetime.date.today()),
+            rows=rows,
+            decode=decode,
+        )
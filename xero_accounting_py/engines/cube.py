@@ -0,0 +1,249 @@
+"""
+A dimensional cube of journal amounts by account, month and tracking option.
+"""
+
+import array
+import datetime
+import typing
+
+from xero_accounting_py.core.rate_limit import RateLimiter
+from xero_accounting_py.engines._fetch import call, fetch_journals, gather
+from xero_accounting_py.engines._money import cents
+from xero_accounting_py.engines.dates import month_date, month_index, parse_date
+from xero_accounting_py.resources.accounting import AsyncAccountingClient
+from xero_accounting_py.types import models
+
+# dictionary-encoded (account, month index, tracking options)
+_Key = typing.Tuple[int, int, typing.FrozenSet[int]]
+_Dimension = typing.Tuple[typing.Sequence[int], typing.Callable[[int], str]]
+
+
+def _month_label(month: int) -> str:
+    return f"{month_date(month, 1):%Y-%m}"
+
+
+def _parse_month(label: str) -> int:
+    year, month = label.split("-")[:2]
+    return month_index(datetime.date(int(year), int(month), 1))
+
+
+class TrackingCube:
+    """
+    Journal amounts in cents (debits positive) by account, calendar month
+    and tracking option, rolled up locally along any of them.
+
+    `sync()` applies the journals after `offset`, like `Ledger`, together
+    with the tracking category catalogue, which names the categories and
+    options. Journals can also be fed with `apply()`.
+
+    Journal lines are summed into one row per account, month and set of
+    tracking options, stored column by column: dictionary-encoded account
+    and month columns, an amount column and one option column per tracking
+    category, holding 0 for untagged rows. `rollup()` groups the rows by
+    any dimensions, such as two tracking categories at once, in a single
+    pass over the columns it needs, without a request per slice.
+
+    Usage:
+        cube = TrackingCube()
+        await cube.sync(client.accounting, xero_tenant_id=tenant_id)
+        by_region = cube.rollup(
+            ["account", "Region", "Department"], start="2024-07", end="2024-09"
+        )
+    """
+
+    def __init__(self) -> None:
+        self.offset = 0
+        self.categories: typing.Dict[str, str] = {}  # category id -> name
+        self.options: typing.Dict[str, str] = {}  # option id -> name
+        self.account_codes: typing.Dict[str, str] = {}  # account id -> code
+        self._accounts: typing.List[str] = []  # account id by encoded value
+        self._account_index: typing.Dict[str, int] = {}
+        self._options: typing.List[str] = [""]  # by encoded value, 0 is untagged
+        self._option_index: typing.Dict[str, int] = {"": 0}
+        self._rows: typing.Dict[_Key, int] = {}
+        self._account = array.array("l")
+        self._month = array.array("l")
+        self._amount = array.array("q")
+        self._tracking: typing.Dict[str, array.array] = {}  # by category id
+
+    def __len__(self) -> int:
+        return len(self._amount)
+
+    async def sync(
+        self,
+        accounting: AsyncAccountingClient,
+        *,
+        xero_tenant_id: str,
+        limiter: typing.Optional[RateLimiter] = None,
+        window: int = 5,
+    ) -> int:
+        """
+        Fetches the tracking categories and applies the journals after
+        `offset`, returning how many were applied.
+        """
+        limiter = limiter or RateLimiter()
+
+        async def journals() -> int:
+            applied = 0
+            async for page in fetch_journals(
+                accounting.journals.list,
+                limiter=limiter,
+                offset=self.offset,
+                window=window,
+                xero_tenant_id=xero_tenant_id,
+            ):
+                applied += self.apply(page)
+            return applied
+
+        categories, applied = await gather(
+            call(
+                limiter,
+                accounting.tracking_categories.list,
+                xero_tenant_id=xero_tenant_id,
+                include_archived=True,
+            ),
+            journals(),
+        )
+        self.update_catalogue(categories.tracking_categories or [])
+        return applied
+
+    def update_catalogue(
+        self, tracking_categories: typing.Iterable[models.TrackingCategory]
+    ) -> None:
+        """Names the tracking categories and their options"""
+        for category in tracking_categories:
+            if category.tracking_category_id and category.name:
+                self.categories[category.tracking_category_id] = category.name
+            for option in category.options or []:
+                if option.tracking_option_id and option.name:
+                    self.options[option.tracking_option_id] = option.name
+
+    def apply(self, journals: typing.Iterable[models.Journal]) -> int:
+        """Applies journals numbered after `offset`, returning how many were applied"""
+        applied = 0
+        for journal in sorted(
+            (j for j in journals if (j.journal_number or 0) > self.offset),
+            key=lambda j: j.journal_number or 0,
+        ):
+            if (journal.journal_number or 0) <= self.offset:
+                continue  # duplicate from overlapping pages
+            self.offset = journal.journal_number or 0
+            applied += 1
+            day = parse_date(journal.journal_date)
+            if day is None:
+                continue
+            month = month_index(day)
+            for line in journal.journal_lines or []:
+                if line.account_id:
+                    self._add(line, month)
+        return applied
+
+    def _add(self, line: models.JournalLine, month: int) -> None:
+        account_id = typing.cast(str, line.account_id)
+        account = self._account_index.get(account_id)
+        if account is None:
+            account = self._account_index[account_id] = len(self._accounts)
+            self._accounts.append(account_id)
+        if line.account_code:
+            self.account_codes[account_id] = line.account_code
+        tagged: typing.Dict[str, int] = {}
+        for tracking in line.tracking_categories or []:
+            category_id = tracking.tracking_category_id
+            option_id = tracking.tracking_option_id
+            if not category_id or not option_id:
+                continue
+            # journal lines name their options, in case the catalogue does not
+            if tracking.name:
+                self.categories.setdefault(category_id, tracking.name)
+            if tracking.option:
+                self.options.setdefault(option_id, tracking.option)
+            option = self._option_index.get(option_id)
+            if option is None:
+                option = self._option_index[option_id] = len(self._options)
+                self._options.append(option_id)
+            tagged[category_id] = option
+        key = (account, month, frozenset(tagged.values()))
+        row = self._rows.get(key)
+        if row is None:
+            for category_id in tagged:
+                if category_id not in self._tracking:
+                    # rows added before the category was seen are untagged
+                    self._tracking[category_id] = array.array("l", [0]) * len(
+                        self._amount
+                    )
+            row = self._rows[key] = len(self._amount)
+            self._account.append(account)
+            self._month.append(month)
+            self._amount.append(0)
+            for category_id, column in self._tracking.items():
+                column.append(tagged.get(category_id, 0))
+        self._amount[row] += cents(line.net_amount)
+
+    def _category(self, name: str) -> typing.Optional[str]:
+        if name in self._tracking:
+            return name
+        wanted = name.strip().casefold()
+        return next(
+            (
+                category_id
+                for category_id in self._tracking
+                if self.categories.get(category_id, "").casefold() == wanted
+            ),
+            None,
+        )
+
+    def _dimension(self, name: str) -> _Dimension:
+        if name == "account":
+            return self._account, lambda code: self.account_codes.get(
+                self._accounts[code], self._accounts[code]
+            )
+        if name == "month":
+            return self._month, _month_label
+        category_id = self._category(name)
+        if category_id is None:
+            raise ValueError(f"unknown dimension {name!r}")
+        return self._tracking[category_id], lambda code: self.options.get(
+            self._options[code], self._options[code]
+        )
+
+    def rollup(
+        self,
+        by: typing.Sequence[str],
+        *,
+        start: typing.Optional[str] = None,
+        end: typing.Optional[str] = None,
+        where: typing.Optional[typing.Mapping[str, typing.Iterable[str]]] = None,
+    ) -> typing.Dict[typing.Tuple[str, ...], int]:
+        """
+        Returns the non-zero amounts in cents grouped by the dimensions in
+        `by`.
+
+        Dimensions are "account" (by code), "month" (like "2024-07") and
+        tracking categories, by name or id, whose untagged rows group under
+        "". `start` and `end` bound the months, inclusive, and `where`
+        keeps the rows whose dimensions have one of the given values.
+        """
+        rows: typing.Iterable[int] = range(len(self._amount))
+        months = self._month
+        if start is not None or end is not None:
+            low = _parse_month(start) if start else -1
+            high = _parse_month(end) if end else 1 << 30
+            rows = [row for row in rows if low <= months[row] <= high]
+        for name, values in (where or {}).items():
+            column, label = self._dimension(name)
+            wanted = set(values)
+            allowed = {code for code in set(column) if label(code) in wanted}
+            rows = [row for row in rows if column[row] in allowed]
+        dimensions = [self._dimension(name) for name in by]
+        columns = [column for column, _ in dimensions]
+        totals: typing.Dict[typing.Tuple[int, ...], int] = {}
+        amounts = self._amount
+        for row in rows:
+            key = tuple(column[row] for column in columns)
+            totals[key] = totals.get(key, 0) + amounts[row]
+        result: typing.Dict[typing.Tuple[str, ...], int] = {}
+        for key, total in totals.items():
+            labels = tuple(label(code) for (_, label), code in zip(dimensions, key))
+            # codes of one account or option can share a label
+            result[labels] = result.get(labels, 0) + total
+        return {labels: total for labels, total in result.items() if total}
@@ -0,0 +1,86 @@
+"""
+Parsing and formatting of the date representations used by the Xero APIs.
+"""
+
+import calendar
+import datetime
+import functools
+import re
+import typing
+
+# Accounting API dates are serialised as "/Date(1710115200000+0000)/"
+_MS_JSON = re.compile(r"^/Date\((-?\d+)([+-]\d{4})?\)/$")
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_utc(value: str) -> datetime.datetime:
+    """
+    Parses a timestamp from the Xero APIs into an aware UTC datetime.
+
+    Accepts ISO 8601 strings (with or without offset, `Z` suffix or 7-digit
+    fractions, as the Projects API returns) and the `/Date(ms+zzzz)/` form
+    used by the Accounting API. Naive values are taken as UTC.
+    """
+    value = value.strip()
+    match = _MS_JSON.match(value)
+    if match:
+        millis = int(match.group(1))
+        return datetime.datetime(
+            1970, 1, 1, tzinfo=datetime.timezone.utc
+        ) + datetime.timedelta(milliseconds=millis)
+    if value.endswith(("Z", "z")):
+        value = value[:-1] + "+00:00"
+    head, sep, tail = value.partition(".")
+    if sep:
+        # fromisoformat only accepts 3 or 6 fractional digits before 3.11
+        digits = len(tail) - len(tail.lstrip("0123456789"))
+        tail = tail[:digits][:6].ljust(6, "0") + tail[digits:]
+        value = f"{head}.{tail}"
+    parsed = datetime.datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed.astimezone(datetime.timezone.utc)
+
+
+def parse_date(value: typing.Optional[str]) -> typing.Optional[datetime.date]:
+    """
+    Parses a Xero date into a calendar date, or returns None.
+
+    `/Date(ms+zzzz)/` values carry the organisation's calendar date at
+    midnight UTC, so the offset is ignored.
+    """
+    if not value:
+        return None
+    return parse_utc(value).date()
+
+
+def format_utc(value: datetime.datetime) -> str:
+    """Formats a datetime as the ISO 8601 UTC string the Projects API filters on"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return value.astimezone(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def format_report_date(value: datetime.date) -> str:
+    """Formats a date the way Xero reports do, e.g. "31 December 2024" """
+    return f"{value.day} {value:%B %Y}"
+
+
+def where_updated_since(value: datetime.datetime) -> str:
+    """Builds an Accounting API `where` clause for records updated at or after `value`"""
+    if value.tzinfo is not None:
+        value = value.astimezone(datetime.timezone.utc)
+    return f"UpdatedDateUTC>=DateTime({value:%Y,%m,%d,%H,%M,%S})"
+
+
+def month_index(day: datetime.date) -> int:
+    """Numbers the month of `day` consecutively across years, for month arithmetic"""
+    return day.year * 12 + day.month - 1
+
+
+def month_date(index: int, day: int) -> datetime.date:
+    """Returns `day` of the month numbered `index`, clamped to the month's last day"""
+    year, month = divmod(index, 12)
+    return datetime.date(
+        year, month + 1, min(day, calendar.monthrange(year, month + 1)[1])
+    )
@@ -0,0 +1,361 @@
+"""
+Forecasts of the invoices repeating invoice templates will generate.
+"""
+
+import calendar
+import datetime
+import typing
+
+import typing_extensions
+
+from xero_accounting_py.core.rate_limit import RateLimiter
+from xero_accounting_py.core.request import DecodeMode
+from xero_accounting_py.engines import _reports
+from xero_accounting_py.engines._fetch import call
+from xero_accounting_py.engines._money import cents, format_cents
+from xero_accounting_py.engines.dates import (
+    format_report_date,
+    month_date,
+    month_index,
+    parse_date,
+)
+from xero_accounting_py.resources.accounting import AsyncAccountingClient
+from xero_accounting_py.types import models
+
+GroupBy = typing_extensions.Literal["contact", "account", "tracking"]
+
+
+class Occurrence(typing.NamedTuple):
+    """One invoice a template will generate"""
+
+    repeating_invoice_id: str
+    contact_id: str
+    date: datetime.date
+    due_date: datetime.date
+    total: int  # cents of the template's currency
+    currency: str
+
+
+class _Line(typing.NamedTuple):
+    account_code: str
+    tracking: typing.Tuple[str, ...]  # "Category: Option" per category
+    amount: int
+
+
+class _Template(typing.NamedTuple):
+    repeating_invoice_id: str
+    type_: str
+    contact_id: str
+    contact_name: str
+    currency: str
+    unit: str  # "WEEKLY" or "MONTHLY"
+    period: int
+    anchor_day: int  # day of month monthly schedules fall on
+    first: int  # ordinal of the next scheduled date
+    last: typing.Optional[int]  # ordinal of the end date
+    due_type: str
+    due_days: int
+    total: int
+    lines: typing.Tuple[_Line, ...]
+
+
+class RepeatingForecast:
+    """
+    Expands repeating invoice schedules into a forecast.
+
+    `load()` fetches the authorised templates (and drafts, with
+    `include_drafts=True`); templates can also be fed with `update()`.
+    Each schedule runs from its next scheduled date, every `period` weeks
+    or months, until its end date. Monthly schedules keep their day of the
+    month, clamped to shorter months.
+
+    `forecast()` aggregates the line amounts of every occurrence by month
+    and by contact, account code or tracking option in one pass: each
+    template's occurrences are counted per month once, and each line
+    amount is multiplied by those counts, so the work does not grow with
+    the number of occurrences times lines. Line amounts are as entered,
+    i.e. tax exclusive for templates with exclusive line amounts, in the
+    template's currency. Amounts in different currencies are never added
+    up: when the templates in the window use several, pick one with
+    `currency`. `occurrences()` lists the individual invoices with
+    their totals and due dates.
+
+    Usage:
+        forecast = RepeatingForecast()
+        await forecast.load(client.accounting, xero_tenant_id=tenant_id)
+        by_account = forecast.forecast(datetime.date(2024, 7, 1), by="account")
+        report = forecast.summary(datetime.date(2024, 7, 1), by="contact")
+    """
+
+    def __init__(self, *, include_drafts: bool = False):
+        self.include_drafts = include_drafts
+        self._templates: typing.Dict[str, _Template] = {}
+
+    async def load(
+        self,
+        accounting: AsyncAccountingClient,
+        *,
+        xero_tenant_id: str,
+        limiter: typing.Optional[RateLimiter] = None,
+    ) -> None:
+        """Fetches every repeating invoice template of the tenant"""
+        response = await call(
+            limiter or RateLimiter(),
+            accounting.repeating_invoices.list,
+            xero_tenant_id=xero_tenant_id,
+        )
+        self.update(response.repeating_invoices or [])
+
+    def update(
+        self, repeating_invoices: typing.Iterable[models.RepeatingInvoice]
+    ) -> None:
+        """Adds or replaces templates, dropping deleted ones"""
+        statuses = {"AUTHORISED", "DRAFT"} if self.include_drafts else {"AUTHORISED"}
+        for template in repeating_invoices:
+            template_id = template.repeating_invoice_id or template.id
+            if template_id is None:
+                continue
+            schedule = template.schedule
+            first = None
+            if schedule is not None:
+                first = parse_date(schedule.next_scheduled_date) or parse_date(
+                    schedule.start_date
+                )
+            if (
+                template.status not in statuses
+                or schedule is None
+                or schedule.unit is None
+                or not schedule.period
+                or first is None
+            ):
+                self._templates.pop(template_id, None)
+                continue
+            start = parse_date(schedule.start_date) or first
+            anchor_day = first.day
+            if start.day > first.day == calendar.monthrange(first.year, first.month)[1]:
+                # next date clamped to a short month, e.g. 28 Feb for the 31st
+                anchor_day = start.day
+            end = parse_date(schedule.end_date)
+            contact = template.contact
+            lines = []
+            for line in template.line_items or []:
+                lines.append(
+                    _Line(
+                        account_code=line.account_code or "",
+                        tracking=tuple(
+                            f"{t.name}: {t.option}" for t in line.tracking or []
+                        ),
+                        amount=cents(line.line_amount),
+                    )
+                )
+            self._templates[template_id] = _Template(
+                repeating_invoice_id=template_id,
+                type_=template.type_ or "ACCREC",
+                contact_id=(contact and contact.contact_id) or "",
+                contact_name=(contact and contact.name) or "",
+                currency=str(template.currency_code or ""),
+                unit=schedule.unit,
+                period=schedule.period,
+                anchor_day=anchor_day,
+                first=first.toordinal(),
+                last=None if end is None else end.toordinal(),
+                due_type=schedule.due_date_type or "",
+                due_days=schedule.due_date or 0,
+                total=cents(template.total),
+                lines=tuple(lines),
+            )
+
+    def _dates(self, template: _Template, start: int, end: int) -> typing.Iterator[int]:
+        """Yields the ordinals of a template's occurrences in [start, end)"""
+        if template.last is not None:
+            end = min(end, template.last + 1)
+        if template.unit == "WEEKLY":
+            step = 7 * template.period
+            first = template.first
+            if first < start:
+                first += -(-(start - first) // step) * step
+            yield from range(first, end, step)
+            return
+        month = month_index(datetime.date.fromordinal(template.first))
+        while True:
+            day = month_date(month, template.anchor_day).toordinal()
+            if day >= end:
+                return
+            if day >= start:
+                yield day
+            month += template.period
+
+    def _due(self, template: _Template, day: datetime.date) -> datetime.date:
+        days = template.due_days
+        if template.due_type in ("DAYSAFTERBILLDATE", "DAYSAFTERINVOICEDATE"):
+            return day + datetime.timedelta(days=days)
+        month = month_index(day)
+        if template.due_type in ("DAYSAFTERBILLMONTH", "DAYSAFTERINVOICEMONTH"):
+            month_end = month_date(month, 31)
+            return month_end + datetime.timedelta(days=days)
+        if template.due_type == "OFCURRENTMONTH":
+            return month_date(month, days)
+        if template.due_type == "OFFOLLOWINGMONTH":
+            return month_date(month + 1, days)
+        return day
+
+    def occurrences(
+        self,
+        start: datetime.date,
+        end: datetime.date,
+        *,
+        type_: str = "ACCREC",
+    ) -> typing.List[Occurrence]:
+        """Returns the invoices of type `type_` dated in [start, end), by date"""
+        found = []
+        for template in self._templates.values():
+            if template.type_ != type_:
+                continue
+            for ordinal in self._dates(template, start.toordinal(), end.toordinal()):
+                day = datetime.date.fromordinal(ordinal)
+                found.append(
+                    Occurrence(
+                        repeating_invoice_id=template.repeating_invoice_id,
+                        contact_id=template.contact_id,
+                        date=day,
+                        due_date=self._due(template, day),
+                        total=template.total,
+                        currency=template.currency,
+                    )
+                )
+        found.sort(key=lambda o: (o.date, o.repeating_invoice_id))
+        return found
+
+    def forecast(
+        self,
+        start: datetime.date,
+        *,
+        months: int = 12,
+        by: GroupBy = "contact",
+        type_: str = "ACCREC",
+        currency: typing.Optional[str] = None,
+    ) -> typing.Dict[str, typing.List[int]]:
+        """
+        Returns the line amounts in cents per group and calendar month,
+        from the month of `start`, one value per month. Lines without
+        tracking are grouped under "" when grouping by tracking.
+
+        Only templates in `currency` are included when it is given;
+        otherwise `ValueError` is raised if the window holds templates in
+        more than one currency.
+        """
+        if by not in ("contact", "account", "tracking"):
+            raise ValueError(f"unknown grouping {by!r}")
+        first_month = month_index(start)
+        window_start = start.replace(day=1).toordinal()
+        window_end = month_date(first_month + months, 1).toordinal()
+        # month of each day of the window, so weekly schedules are bucketed
+        # by lookup instead of date arithmetic
+        month_of: typing.List[int] = []
+        for month in range(months):
+            year, month0 = divmod(first_month + month, 12)
+            days = calendar.monthrange(year, month0 + 1)[1]
+            month_of.extend([month] * days)
+        totals: typing.Dict[str, typing.List[int]] = {}
+        currencies: typing.Set[str] = set()
+        for template in self._templates.values():
+            if template.type_ != type_:
+                continue
+            if currency is not None and template.currency != currency:
+                continue
+            counts = [0] * months
+            for ordinal in self._dates(template, window_start, window_end):
+                counts[month_of[ordinal - window_start]] += 1
+            if not any(counts):
+                continue
+            currencies.add(template.currency)
+            for line in template.lines:
+                if by == "contact":
+                    keys: typing.Iterable[str] = (template.contact_id,)
+                elif by == "account":
+                    keys = (line.account_code,)
+                else:
+                    keys = line.tracking or ("",)
+                for key in keys:
+                    row = totals.get(key)
+                    if row is None:
+                        row = totals[key] = [0] * months
+                    for month, count in enumerate(counts):
+                        if count:
+                            row[month] += line.amount * count
+        if len(currencies) > 1:
+            raise ValueError(
+                f"templates in {', '.join(sorted(currencies))}; "
+                "pass currency to forecast one of them"
+            )
+        return totals
+
+    def summary(
+        self,
+        start: datetime.date,
+        *,
+        months: int = 12,
+        by: GroupBy = "contact",
+        type_: str = "ACCREC",
+        currency: typing.Optional[str] = None,
+        decode: DecodeMode = "model",
+    ) -> models.ReportWithRows:
+        """
+        Returns `forecast()` as a report: one column per month, a row per
+        group and a totals row.
+        """
+        totals = self.forecast(
+            start, months=months, by=by, type_=type_, currency=currency
+        )
+        names: typing.Dict[str, str] = {
+            t.contact_id: t.contact_name for t in self._templates.values()
+        }
+
+        def group_label(key: str) -> str:
+            if by == "contact":
+                return names.get(key) or key or "Unassigned"
+            return key or "Unassigned"
+
+        first_month = month_index(start)
+        labels = [f"{month_date(first_month + m, 1):%b %Y}" for m in range(months)]
+        rows = [_reports.header([by.capitalize(), *labels, "Total"])]
+        grand = [0] * months
+        for key in sorted(totals, key=lambda k: group_label(k).lower()):
+            values = totals[key]
+            label = group_label(key)
+            attributes = [_reports.attribute(f"{by}ID" if by == "contact" else by, key)]
+            rows.append(
+                _reports.row(
+                    [
+                        _reports.cell(label, attributes),
+                        *(
+                            _reports.cell(format_cents(v))
+                            for v in [*values, sum(values)]
+                        ),
+                    ]
+                )
+            )
+            grand = [a + b for a, b in zip(grand, values)]
+        if by != "tracking":
+            # lines with several tracking categories are counted once per
+            # category, so tracking groups do not add up to a total
+            rows.append(
+                _reports.row(
+                    [
+                        _reports.cell("Total"),
+                        *(_reports.cell(format_cents(v)) for v in [*grand, sum(grand)]),
+                    ],
+                    row_type="SummaryRow",
+                )
+            )
+        return _reports.report(
+            report_id="RepeatingInvoiceForecast",
+            name="Repeating Invoice Forecast",
+            titles=[
+                "Repeating Invoice Forecast",
+                f"From {format_report_date(start.replace(day=1))}",
+            ],
+            date=format_report_date(start),
+            rows=rows,
+            decode=decode,
+        )
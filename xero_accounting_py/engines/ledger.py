@@ -0,0 +1,366 @@
+"""
+Account balances maintained incrementally from the journal feed.
+"""
+
+import bisect
+import datetime
+import random
+import typing
+
+from xero_accounting_py.core.rate_limit import RateLimiter
+from xero_accounting_py.core.request import DecodeMode
+from xero_accounting_py.engines import _reports
+from xero_accounting_py.engines._fetch import call, fetch_journals
+from xero_accounting_py.engines._money import cents, format_cents, parse_cents
+from xero_accounting_py.engines.accounts import PROFIT_AND_LOSS, SECTIONS
+from xero_accounting_py.engines.dates import format_report_date, parse_date
+from xero_accounting_py.resources.accounting import AsyncAccountingClient
+from xero_accounting_py.types import models
+
+
+# (account_id, tracking_option_id); "" as the option holds the account total
+_Key = typing.Tuple[str, str]
+
+
+class Account(typing.NamedTuple):
+    account_id: str
+    code: str
+    name: str
+    account_type: str
+
+
+class Discrepancy(typing.NamedTuple):
+    """An account whose local balance differs from the API trial balance, in cents"""
+
+    account_id: str
+    name: str
+    local: int
+    remote: int
+
+
+def _amount(value: int) -> str:
+    return format_cents(value) if value else ""
+
+
+class Ledger:
+    """
+    Running balances per account, and per account and tracking option,
+    indexed by date.
+
+    Journals are applied in `JournalNumber` order and `offset` records the
+    last one applied, so `sync()` only fetches new journals. Because journal
+    numbers are sequential, `sync()` requests `window` consecutive offsets
+    concurrently instead of walking the feed one page at a time.
+
+    Each balance is kept as net movements per day (debits positive, in
+    cents). A sorted running-total index is rebuilt lazily for the accounts
+    that changed, so balances and trial balances as at any date are answered
+    locally with a binary search.
+
+    Usage:
+        ledger = Ledger()
+        await ledger.sync(client.accounting, xero_tenant_id=tenant_id)
+        report = ledger.trial_balance(datetime.date(2024, 6, 30))
+    """
+
+    def __init__(self) -> None:
+        self.offset = 0
+        self.accounts: typing.Dict[str, Account] = {}
+        self._movements: typing.Dict[_Key, typing.Dict[int, int]] = {}
+        # lazily rebuilt (sorted day ordinals, running totals) per key
+        self._index: typing.Dict[
+            _Key, typing.Tuple[typing.List[int], typing.List[int]]
+        ] = {}
+
+    async def sync(
+        self,
+        accounting: AsyncAccountingClient,
+        *,
+        xero_tenant_id: str,
+        limiter: typing.Optional[RateLimiter] = None,
+        window: int = 5,
+    ) -> int:
+        """Fetches and applies the journals after `offset`, returning how many were applied"""
+        applied = 0
+        async for journals in fetch_journals(
+            accounting.journals.list,
+            limiter=limiter or RateLimiter(),
+            offset=self.offset,
+            window=window,
+            xero_tenant_id=xero_tenant_id,
+        ):
+            applied += self.apply(journals)
+        return applied
+
+    def apply(self, journals: typing.Iterable[models.Journal]) -> int:
+        """Applies journals numbered after `offset`, returning how many were applied"""
+        applied = 0
+        for journal in sorted(
+            (j for j in journals if (j.journal_number or 0) > self.offset),
+            key=lambda j: j.journal_number or 0,
+        ):
+            if (journal.journal_number or 0) <= self.offset:
+                continue  # duplicate from overlapping pages
+            self.offset = journal.journal_number or 0
+            applied += 1
+            day = parse_date(journal.journal_date)
+            if day is None:
+                continue
+            ordinal = day.toordinal()
+            for line in journal.journal_lines or []:
+                if not line.account_id:
+                    continue
+                self.accounts[line.account_id] = Account(
+                    account_id=line.account_id,
+                    code=line.account_code or "",
+                    name=line.account_name or "",
+                    account_type=line.account_type or "",
+                )
+                amount = cents(line.net_amount)
+                keys = [(line.account_id, "")]
+                keys.extend(
+                    (line.account_id, tracking.tracking_option_id)
+                    for tracking in line.tracking_categories or []
+                    if tracking.tracking_option_id
+                )
+                for key in keys:
+                    days = self._movements.setdefault(key, {})
+                    days[ordinal] = days.get(ordinal, 0) + amount
+                    self._index.pop(key, None)
+        return applied
+
+    def balance(
+        self,
+        account_id: str,
+        as_at: datetime.date,
+        *,
+        since: typing.Optional[datetime.date] = None,
+        tracking_option_id: str = "",
+    ) -> int:
+        """
+        Returns the balance of an account as at `as_at` in cents (debit
+        positive), or its movement from `since` when given.
+        """
+        key = (account_id, tracking_option_id)
+        total = self._running(key, as_at.toordinal())
+        if since is not None:
+            total -= self._running(key, since.toordinal() - 1)
+        return total
+
+    def balances(
+        self,
+        as_at: datetime.date,
+        *,
+        since: typing.Optional[datetime.date] = None,
+        tracking_option_id: str = "",
+    ) -> typing.Dict[str, int]:
+        """Returns the non-zero balances of all accounts, see `balance()`"""
+        result = {}
+        for account_id in self.accounts:
+            value = self.balance(
+                account_id, as_at, since=since, tracking_option_id=tracking_option_id
+            )
+            if value:
+                result[account_id] = value
+        return result
+
+    def _running(self, key: _Key, ordinal: int) -> int:
+        index = self._index.get(key)
+        if index is None:
+            days = self._movements.get(key)
+            if not days:
+                return 0
+            ordinals = sorted(days)
+            totals = []
+            running = 0
+            for day in ordinals:
+                running += days[day]
+                totals.append(running)
+            index = self._index[key] = (ordinals, totals)
+        ordinals, totals = index
+        position = bisect.bisect_right(ordinals, ordinal)
+        return totals[position - 1] if position else 0
+
+    def year_to_date(
+        self,
+        as_at: datetime.date,
+        *,
+        year_start: typing.Optional[datetime.date] = None,
+        retained_earnings_account_id: typing.Optional[str] = None,
+    ) -> typing.Dict[str, int]:
+        """
+        Returns the balances a trial balance reports as at `as_at`.
+
+        With `year_start`, revenue and expense accounts only carry the
+        movement since the start of the financial year; their earlier
+        movements are folded into `retained_earnings_account_id` (or the
+        "" key when not given).
+        """
+        if year_start is None:
+            return self.balances(as_at)
+        # every account, as a profit and loss account that nets to zero by
+        # `as_at` may still carry earlier movements into retained earnings
+        balances = {
+            account_id: self.balance(account_id, as_at) for account_id in self.accounts
+        }
+        retained = 0
+        for account_id, account in self.accounts.items():
+            if SECTIONS.get(account.account_type) in PROFIT_AND_LOSS:
+                prior = self.balance(
+                    account_id, year_start - datetime.timedelta(days=1)
+                )
+                retained += prior
+                balances[account_id] -= prior
+        target = retained_earnings_account_id or ""
+        balances[target] = balances.get(target, 0) + retained
+        return {account_id: value for account_id, value in balances.items() if value}
+
+    def trial_balance(
+        self,
+        as_at: datetime.date,
+        *,
+        year_start: typing.Optional[datetime.date] = None,
+        retained_earnings_account_id: typing.Optional[str] = None,
+        decode: DecodeMode = "model",
+    ) -> models.ReportWithRows:
+        """
+        Returns the trial balance as at `as_at`, shaped like
+        `get_trial_balance`: movements for the month of `as_at` in the
+        Debit/Credit columns and balances (see `year_to_date()`) in the YTD
+        columns, grouped into Revenue, Expenses, Assets, Liabilities and
+        Equity sections.
+        """
+        month_start = as_at.replace(day=1)
+        ytd = self.year_to_date(
+            as_at,
+            year_start=year_start,
+            retained_earnings_account_id=retained_earnings_account_id,
+        )
+        sections: typing.Dict[str, typing.List[_reports.Json]] = {
+            title: []
+            for title in ("Revenue", "Expenses", "Assets", "Liabilities", "Equity")
+        }
+        totals = [0, 0, 0, 0]
+        accounts = sorted(
+            ytd,
+            key=lambda a: (self.accounts[a].code, a) if a in self.accounts else ("", a),
+        )
+        for account_id in accounts:
+            account = self.accounts.get(account_id)
+            if account is None:
+                label, title = "Retained Earnings", "Equity"
+                month = 0
+            else:
+                label = (
+                    f"{account.name} ({account.code})" if account.code else account.name
+                )
+                title = SECTIONS.get(account.account_type, "Equity")
+                month = self.balance(account_id, as_at, since=month_start)
+            balance = ytd[account_id]
+            values = [max(month, 0), max(-month, 0), max(balance, 0), max(-balance, 0)]
+            totals = [a + b for a, b in zip(totals, values)]
+            attributes = (
+                [_reports.attribute("account", account_id)] if account else None
+            )
+            sections[title].append(
+                _reports.row(
+                    [_reports.cell(label, attributes)]
+                    + [_reports.cell(_amount(v), attributes) for v in values]
+                )
+            )
+        rows = [
+            _reports.header(["Account", "Debit", "Credit", "YTD Debit", "YTD Credit"])
+        ]
+        rows.extend(_reports.section(r, title=t) for t, r in sections.items() if r)
+        rows.append(
+            _reports.section(
+                [
+                    _reports.row(
+                        [_reports.cell("Total")]
+                        + [_reports.cell(f"{v / 100:.2f}") for v in totals],
+                        row_type="SummaryRow",
+                    )
+                ]
+            )
+        )
+        return _reports.report(
+            report_id="TrialBalance",
+            name="Trial Balance",
+            titles=["Trial Balance", f"As at {format_report_date(as_at)}"],
+            date=format_report_date(as_at),
+            rows=rows,
+            decode=decode,
+        )
+
+    async def reconcile(
+        self,
+        accounting: AsyncAccountingClient,
+        *,
+        xero_tenant_id: str,
+        date: typing.Optional[datetime.date] = None,
+        year_start: typing.Optional[datetime.date] = None,
+        retained_earnings_account_id: typing.Optional[str] = None,
+        limiter: typing.Optional[RateLimiter] = None,
+        rng: typing.Optional[random.Random] = None,
+    ) -> typing.Tuple[datetime.date, typing.List[Discrepancy]]:
+        """
+        Compares local YTD balances with the API trial balance.
+
+        When `date` is omitted, one of the dates journals were posted on is
+        sampled. Returns the date checked and the accounts that differ;
+        pass the organisation's `year_start` so revenue and expense
+        accounts are compared on the same basis as the API.
+        """
+        if date is None:
+            days = sorted({d for days in self._movements.values() for d in days})
+            if not days:
+                raise ValueError("no journals have been applied")
+            date = datetime.date.fromordinal((rng or random.Random()).choice(days))
+        report = await call(
+            limiter or RateLimiter(),
+            accounting.reports.get_trial_balance,
+            xero_tenant_id=xero_tenant_id,
+            date=date.isoformat(),
+        )
+        remote: typing.Dict[str, typing.Tuple[str, int]] = {}
+        for trial_balance in report.reports or []:
+            for section in trial_balance.rows or []:
+                for row in section.rows or []:
+                    cells = row.cells or []
+                    if row.row_type != "Row" or len(cells) < 5:
+                        continue
+                    account_id = next(
+                        (
+                            a.value
+                            for a in cells[0].attributes or []
+                            if a.id == "account" and a.value
+                        ),
+                        None,
+                    )
+                    if account_id is not None:
+                        remote[account_id] = (
+                            cells[0].value or "",
+                            parse_cents(cells[3].value) - parse_cents(cells[4].value),
+                        )
+        local = self.year_to_date(
+            date,
+            year_start=year_start,
+            retained_earnings_account_id=retained_earnings_account_id,
+        )
+        discrepancies = []
+        for account_id in sorted(set(local) | set(remote)):
+            if not account_id:
+                continue
+            name, remote_balance = remote.get(account_id, ("", 0))
+            local_balance = local.get(account_id, 0)
+            if local_balance != remote_balance:
+                account = self.accounts.get(account_id)
+                discrepancies.append(
+                    Discrepancy(
+                        account_id=account_id,
+                        name=name or (account.name if account else ""),
+                        local=local_balance,
+                        remote=remote_balance,
+                    )
+                )
+        return date, discrepancies
@@ -0,0 +1,239 @@
+"""
+Cached organisation settings, and the report periods they imply.
+"""
+
+import asyncio
+import calendar
+import datetime
+import time
+import typing
+
+from xero_accounting_py.core.rate_limit import RateLimiter
+from xero_accounting_py.engines._fetch import call
+from xero_accounting_py.engines.dates import month_date, month_index, parse_date
+from xero_accounting_py.resources.accounting import AsyncAccountingClient
+from xero_accounting_py.types import models
+
+
+class OrganisationProfile(typing.NamedTuple):
+    """The settings of an organisation that report windows depend on"""
+
+    organisation_id: str
+    name: str
+    base_currency: str
+    financial_year_end_day: int
+    financial_year_end_month: int
+    period_lock_date: typing.Optional[datetime.date]
+    end_of_year_lock_date: typing.Optional[datetime.date]
+    timezone: str  # as the API names it, e.g. "NEWZEALANDSTANDARDTIME"
+
+    @classmethod
+    def from_organisation(
+        cls, organisation: models.Organisation
+    ) -> "OrganisationProfile":
+        return cls(
+            organisation_id=organisation.organisation_id or "",
+            name=organisation.name or "",
+            base_currency=str(organisation.base_currency or ""),
+            # organisations without a financial year end report on calendar years
+            financial_year_end_day=organisation.financial_year_end_day or 31,
+            financial_year_end_month=organisation.financial_year_end_month or 12,
+            period_lock_date=parse_date(organisation.period_lock_date),
+            end_of_year_lock_date=parse_date(organisation.end_of_year_lock_date),
+            timezone=str(organisation.timezone or ""),
+        )
+
+    @property
+    def lock_date(self) -> typing.Optional[datetime.date]:
+        """The last date no user can post to, if any"""
+        dates = [d for d in (self.period_lock_date, self.end_of_year_lock_date) if d]
+        return max(dates) if dates else None
+
+
+class OrganisationProfiles:
+    """
+    Caches the organisation profile of each tenant for `ttl` seconds.
+
+    Concurrent `get()`s for a tenant share one `organisation.list` call,
+    and failures are not cached, so the next `get()` retries.
+
+    Usage:
+        profiles = OrganisationProfiles()
+        profile = await profiles.get(client.accounting, xero_tenant_id=tenant_id)
+        planner = PeriodPlanner(profile)
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float = 3600.0,
+        clock: typing.Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.clock = clock
+        self._memo: typing.Dict[
+            str, typing.Tuple[float, "asyncio.Future[OrganisationProfile]"]
+        ] = {}
+
+    async def get(
+        self,
+        accounting: AsyncAccountingClient,
+        *,
+        xero_tenant_id: str,
+        limiter: typing.Optional[RateLimiter] = None,
+    ) -> OrganisationProfile:
+        """Returns the tenant's profile, fetching it when not cached"""
+        memo = self._memo.get(xero_tenant_id)
+        future: "asyncio.Future[OrganisationProfile]"
+        if memo is None or memo[0] <= self.clock():
+            future = asyncio.ensure_future(
+                self._fetch(accounting, xero_tenant_id, limiter or RateLimiter())
+            )
+            self._memo[xero_tenant_id] = (self.clock() + self.ttl, future)
+        else:
+            future = memo[1]
+        try:
+            # a cancelled caller does not cancel the fetch other callers share
+            return await asyncio.shield(future)
+        except Exception:
+            if self._memo.get(xero_tenant_id, (0.0, None))[1] is future:
+                del self._memo[xero_tenant_id]
+            raise
+
+    async def _fetch(
+        self,
+        accounting: AsyncAccountingClient,
+        xero_tenant_id: str,
+        limiter: RateLimiter,
+    ) -> OrganisationProfile:
+        response = await call(
+            limiter, accounting.organisation.list, xero_tenant_id=xero_tenant_id
+        )
+        organisations = response.organisations or []
+        if not organisations:
+            raise ValueError(f"no organisation for tenant {xero_tenant_id!r}")
+        return OrganisationProfile.from_organisation(organisations[0])
+
+    def invalidate(self, xero_tenant_id: typing.Optional[str] = None) -> None:
+        """Forgets the profile of a tenant, or of every tenant"""
+        if xero_tenant_id is None:
+            self._memo.clear()
+        else:
+            self._memo.pop(xero_tenant_id, None)
+
+
+class Period(typing.NamedTuple):
+    """A report window, inclusive of both dates"""
+
+    label: str
+    from_date: datetime.date
+    to_date: datetime.date
+    locked: bool  # ends on or before the lock date, so it can no longer change
+
+    @property
+    def query(self) -> typing.Dict[str, str]:
+        """The window as `get_profit_and_loss` parameters"""
+        return {
+            "from_date": self.from_date.isoformat(),
+            "to_date": self.to_date.isoformat(),
+        }
+
+
+class PeriodPlanner:
+    """
+    Plans report windows from an organisation's financial year and lock
+    dates.
+
+    Financial years end on the organisation's year end day and month, so
+    quarters and year to date follow its financial year rather than the
+    calendar. Periods ending on or before the later of the period and end
+    of year lock dates are marked locked: their reports can no longer
+    change, and `refresh()` leaves them out once they have been fetched.
+
+    Dates are the organisation's calendar dates; pass "today" in the
+    organisation's `timezone` when planning up to the current day.
+
+    Usage:
+        planner = PeriodPlanner(profile)
+        periods = planner.quarters(datetime.date(2024, 9, 30))
+        for period in planner.refresh(periods, fetched):
+            await client.accounting.reports.get_profit_and_loss(
+                xero_tenant_id=tenant_id, **period.query
+            )
+    """
+
+    def __init__(self, profile: OrganisationProfile):
+        self.profile = profile
+
+    def _year_end(self, year: int) -> datetime.date:
+        month = self.profile.financial_year_end_month
+        day = min(
+            self.profile.financial_year_end_day, calendar.monthrange(year, month)[1]
+        )
+        return datetime.date(year, month, day)
+
+    def _period(
+        self, label: str, from_date: datetime.date, to_date: datetime.date
+    ) -> Period:
+        lock_date = self.profile.lock_date
+        locked = lock_date is not None and to_date <= lock_date
+        return Period(label, from_date, to_date, locked)
+
+    def year(self, day: datetime.date) -> Period:
+        """Returns the financial year containing `day`"""
+        end = self._year_end(day.year)
+        if day > end:
+            end = self._year_end(day.year + 1)
+        start = self._year_end(end.year - 1) + datetime.timedelta(days=1)
+        return self._period(f"FY{end.year}", start, end)
+
+    def quarters(self, day: datetime.date) -> typing.List[Period]:
+        """Returns the four quarters of the financial year containing `day`"""
+        year = self.year(day)
+        first, day_of_month = month_index(year.from_date), year.from_date.day
+        periods = []
+        for quarter in range(4):
+            start = month_date(first + 3 * quarter, day_of_month)
+            end = (
+                year.to_date
+                if quarter == 3
+                else month_date(first + 3 * quarter + 3, day_of_month)
+                - datetime.timedelta(days=1)
+            )
+            periods.append(self._period(f"Q{quarter + 1} {year.label}", start, end))
+        return periods
+
+    def year_to_date(self, day: datetime.date) -> Period:
+        """Returns the financial year to date, up to and including `day`"""
+        year = self.year(day)
+        return self._period(f"YTD {year.label}", year.from_date, day)
+
+    def months(self, start: datetime.date, end: datetime.date) -> typing.List[Period]:
+        """Returns the calendar months from the month of `start` to that of `end`"""
+        periods = []
+        month = start.replace(day=1)
+        while month <= end:
+            following = month_date(month_index(month) + 1, 1)
+            periods.append(
+                self._period(
+                    f"{month:%Y-%m}", month, following - datetime.timedelta(days=1)
+                )
+            )
+            month = following
+        return periods
+
+    def refresh(
+        self,
+        periods: typing.Iterable[Period],
+        fetched: typing.Container[typing.Tuple[datetime.date, datetime.date]] = (),
+    ) -> typing.List[Period]:
+        """
+        Returns the periods whose reports must be requested: every unlocked
+        period, and locked ones whose (from_date, to_date) is not in
+        `fetched`.
+        """
+        return [
+            period
+            for period in periods
+            if not period.locked or (period.from_date, period.to_date) not in fetched
+        ]
@@ -0,0 +1,244 @@
+"""
+Local validation of invoices, manual journals and bank transactions before
+they are sent.
+"""
+
+import typing
+
+import typing_extensions
+
+from xero_accounting_py.core.rate_limit import RateLimiter
+from xero_accounting_py.engines._fetch import call
+from xero_accounting_py.engines._money import cents
+from xero_accounting_py.engines.reference import ReferenceData
+from xero_accounting_py.resources.accounting import AsyncAccountingClient
+from xero_accounting_py.types import params
+
+PreflightKind = typing_extensions.Literal[
+    "invoices", "manual_journals", "bank_transactions"
+]
+
+# validates a record, appending to the errors, and returns it resolved
+_Validate = typing.Callable[[typing.Any, typing.List[str]], typing.Any]
+
+# statuses the API accepts with incomplete line items
+_DRAFTS = {"DRAFT", "SUBMITTED"}
+
+
+class Rejection(typing.NamedTuple):
+    """A record that failed validation, and why"""
+
+    position: int  # of the record in the batch
+    record: typing.Any
+    errors: typing.List[str]
+
+
+class Checked(typing.NamedTuple):
+    """Records that passed validation, resolved, and those that did not"""
+
+    valid: typing.List[typing.Any]
+    rejected: typing.List[Rejection]
+
+
+def _missing(record: typing.Any, typed_dict: typing.Any) -> typing.List[str]:
+    return [
+        f"{key.rstrip('_')} is required"
+        for key in sorted(typed_dict.__required_keys__)
+        if record.get(key) in (None, "", [])
+    ]
+
+
+class Preflight:
+    """
+    Rejects invalid write payloads locally so only records that will pass
+    are sent.
+
+    Records are `params.*` dicts. Each is checked for the keys its
+    TypedDict marks as required, and its line items are resolved with
+    `ReferenceData`, so unknown or archived account codes, tax types and
+    tracking options are caught without a round trip. On top of that:
+
+    - invoices and bank transactions need a contact, and line items a
+      description and account unless the record is a draft. Updates to an
+      existing invoice, which carry its `invoice_id`, keep their contact
+    - manual journals need at least two lines that balance to the cent
+    - bank transactions must use an active bank account, in the account's
+      currency
+    - currencies must be enabled for the organisation
+
+    `check()` splits a batch into resolved valid records and rejections;
+    `send()` then creates the valid ones in a single call.
+
+    Usage:
+        preflight = Preflight(reference)
+        response, rejected = await preflight.send(
+            client.accounting, "manual_journals", journals, xero_tenant_id=tenant_id
+        )
+    """
+
+    def __init__(self, reference: ReferenceData):
+        self.reference = reference
+
+    def check(
+        self, kind: PreflightKind, records: typing.Iterable[typing.Any]
+    ) -> Checked:
+        """Validates and resolves a batch of records of one kind"""
+        validators: typing.Dict[str, _Validate] = {
+            "invoices": self._invoice,
+            "manual_journals": self._manual_journal,
+            "bank_transactions": self._bank_transaction,
+        }
+        validate = validators[kind]
+        valid = []
+        rejected = []
+        for index, record in enumerate(records):
+            errors: typing.List[str] = []
+            resolved = validate(record, errors)
+            if errors:
+                rejected.append(Rejection(index, record, errors))
+            else:
+                valid.append(resolved)
+        return Checked(valid, rejected)
+
+    async def send(
+        self,
+        accounting: AsyncAccountingClient,
+        kind: PreflightKind,
+        records: typing.Iterable[typing.Any],
+        *,
+        xero_tenant_id: str,
+        limiter: typing.Optional[RateLimiter] = None,
+    ) -> typing.Tuple[typing.Any, typing.List[Rejection]]:
+        """
+        Sends the records that pass `check()` and returns the response, or
+        None if every record was rejected, with the rejections.
+        """
+        checked = self.check(kind, records)
+        if not checked.valid:
+            return None, checked.rejected
+        send: typing.Callable[..., typing.Awaitable[typing.Any]]
+        if kind == "invoices":
+            send = accounting.invoices.update_or_create
+        elif kind == "manual_journals":
+            send = accounting.manual_journals.create
+        else:
+            send = accounting.bank_transactions.create
+        response = await call(
+            limiter or RateLimiter(),
+            send,
+            xero_tenant_id=xero_tenant_id,
+            summarize_errors=False,
+            **{kind: checked.valid},
+        )
+        return response, checked.rejected
+
+    def _currency(self, record: typing.Any, errors: typing.List[str]) -> None:
+        currency = record.get("currency_code")
+        currencies = self.reference.currencies
+        if currency and currencies and currency not in currencies:
+            errors.append(f"currency {currency} is not enabled")
+
+    def _lines(
+        self,
+        lines: typing.List[typing.Any],
+        errors: typing.List[str],
+        *,
+        label: str,
+        complete: bool,
+        sales: bool = True,
+    ) -> typing.List[typing.Any]:
+        resolution = self.reference.resolve(lines, sales=sales)
+        for error in resolution.errors:
+            errors.append(f"{label}[{error.line}]: {error.message}")
+        if complete:
+            for index, line in enumerate(resolution.line_items):
+                if not line.get("description"):
+                    errors.append(f"{label}[{index}]: description is required")
+                if not line.get("account_code") and not line.get("account_id"):
+                    errors.append(f"{label}[{index}]: account is required")
+        return resolution.line_items
+
+    def _invoice(
+        self, record: params.Invoice, errors: typing.List[str]
+    ) -> params.Invoice:
+        errors.extend(_missing(record, params.Invoice))
+        contact = record.get("contact") or {}
+        if (
+            not record.get("invoice_id")
+            and not contact.get("contact_id")
+            and not contact.get("name")
+        ):
+            errors.append("contact is required")
+        self._currency(record, errors)
+        resolved = typing.cast(params.Invoice, dict(record))
+        if "line_items" in record:
+            resolved["line_items"] = self._lines(
+                record["line_items"],
+                errors,
+                label="line_items",
+                complete=record.get("status") not in _DRAFTS,
+                sales=record.get("type_") != "ACCPAY",
+            )
+        return resolved
+
+    def _manual_journal(
+        self, record: params.ManualJournal, errors: typing.List[str]
+    ) -> params.ManualJournal:
+        errors.extend(_missing(record, params.ManualJournal))
+        lines = record.get("journal_lines") or []
+        resolved = typing.cast(params.ManualJournal, dict(record))
+        if record.get("status") in _DRAFTS and not lines:
+            return resolved
+        if len(lines) < 2:
+            errors.append("at least two journal lines are required")
+        balance = sum(cents(line.get("line_amount")) for line in lines)
+        if balance:
+            errors.append(f"journal lines are out of balance by {balance / 100:.2f}")
+        resolved["journal_lines"] = self._lines(
+            typing.cast(typing.List[typing.Any], lines),
+            errors,
+            label="journal_lines",
+            complete=False,
+        )
+        for index, line in enumerate(resolved["journal_lines"]):
+            if not line.get("account_code") and not line.get("account_id"):
+                errors.append(f"journal_lines[{index}]: account is required")
+        return resolved
+
+    def _bank_transaction(
+        self, record: params.BankTransaction, errors: typing.List[str]
+    ) -> params.BankTransaction:
+        errors.extend(_missing(record, params.BankTransaction))
+        contact = record.get("contact") or {}
+        if not contact.get("contact_id") and not contact.get("name"):
+            errors.append("contact is required")
+        self._currency(record, errors)
+        resolved = typing.cast(params.BankTransaction, dict(record))
+        bank = record.get("bank_account") or {}
+        account = None
+        if bank.get("account_id"):
+            account = self.reference.accounts.get(bank["account_id"])
+        elif bank.get("code"):
+            account = self.reference.account(bank["code"])
+        if bank and account is None:
+            errors.append("unknown bank account")
+        elif account is not None:
+            if account.type_ != "BANK" or account.status != "ACTIVE":
+                errors.append(
+                    f"account {account.code or account.name!r} is not an active bank account"
+                )
+            currency = record.get("currency_code")
+            if currency and account.currency_code and currency != account.currency_code:
+                errors.append(
+                    f"currency {currency} does not match the bank account's "
+                    f"{account.currency_code}"
+                )
+        if "line_items" in record:
+            resolved["line_items"] = self._lines(
+                record["line_items"],
+                errors,
+                label="line_items",
+                complete=record.get("status") not in _DRAFTS,
+                sales=str(record.get("type_", "")).startswith("RECEIVE"),
+            )
+        return resolved
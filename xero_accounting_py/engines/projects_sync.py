@@ -0,0 +1,257 @@
+"""
+Bulk, incremental sync of project time entries and tasks.
+"""
+
+import asyncio
+import datetime
+import math
+import typing
+
+from make_api_request import type_utils
+from xero_accounting_py.core.paginate import page_count, paginate
+from xero_accounting_py.core.rate_limit import RateLimiter
+from xero_accounting_py.core.request import model_options
+from xero_accounting_py.engines._fetch import Fetch, gather
+from xero_accounting_py.engines.dates import format_utc, parse_utc
+from xero_accounting_py.resources.projects import AsyncProjectsClient
+from xero_accounting_py.types import models
+
+_Emit = typing.Callable[[typing.List[typing.Any]], typing.Awaitable[None]]
+_Window = typing.Tuple[
+    typing.Optional[datetime.datetime], typing.Optional[datetime.datetime]
+]
+
+# windows are never split below this span, however many pages they hold
+_MIN_WINDOW = datetime.timedelta(minutes=1)
+# lower bound for splitting projects synced without `start` or a watermark
+EPOCH = datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def _split(
+    after: datetime.datetime,
+    before: typing.Optional[datetime.datetime],
+    now: datetime.datetime,
+    count: int,
+) -> typing.List[_Window]:
+    """
+    Splits `[after, before]` into `count` equal windows.
+
+    An open upper bound is split up to `now` and the last window is left open,
+    so entries dated in the future are still fetched.
+    """
+    end = before or max(now, after)
+    step = (end - after) / count
+    windows: typing.List[_Window] = []
+    for n in range(count):
+        upper = after + step * (n + 1) if n < count - 1 else before
+        windows.append((after + step * n, upper))
+    return windows
+
+
+class ProjectsSync:
+    """
+    Syncs the time entries and tasks of every project in a tenant.
+
+    Projects are enumerated page by page. For each project, time entries and
+    tasks are fetched concurrently: after the first page reveals
+    `pagination.page_count`, the remaining pages are requested at once. A
+    project whose time entries span more than `window_pages` pages has its
+    date range split into equal windows that are fetched (and, if still too
+    large, split) concurrently. Without `start` or a watermark, windows
+    are split from `epoch`, and the earliest one is left open so older
+    entries are still fetched. Every request goes through `limiter`, which
+    defaults to Xero's per-tenant limits.
+
+    Time entries are yielded from `time_entries()` as their pages arrive, in
+    no particular order across projects. Once a project has been fully
+    fetched, `watermarks[project_id]` is set to the latest `dateUtc` seen.
+    Pass the watermarks of a previous run as `since` to fetch only the
+    entries dated on or after them; because the boundary is inclusive, and
+    because an entry can be edited without its date changing, consumers
+    should upsert by `time_entry_id`.
+
+    Usage:
+        sync = ProjectsSync(client.projects, xero_tenant_id=tenant_id, since=saved)
+        async for entry in sync.time_entries():
+            store.upsert(entry)
+        saved = sync.watermarks
+    """
+
+    def __init__(
+        self,
+        projects: AsyncProjectsClient,
+        *,
+        xero_tenant_id: str,
+        limiter: typing.Optional[RateLimiter] = None,
+        since: typing.Optional[typing.Mapping[str, datetime.datetime]] = None,
+        start: typing.Optional[datetime.datetime] = None,
+        until: typing.Optional[datetime.datetime] = None,
+        epoch: datetime.datetime = EPOCH,
+        states: typing.Optional[str] = None,
+        page_size: int = 500,
+        window_pages: int = 10,
+        include_tasks: bool = True,
+    ):
+        if not 1 <= page_size <= 500:
+            raise ValueError("page_size must be between 1 and 500")
+        if window_pages < 1:
+            raise ValueError("window_pages must be at least 1")
+        self._projects = projects
+        self.xero_tenant_id = xero_tenant_id
+        self.limiter = limiter or RateLimiter()
+        self.start = start
+        self.until = until
+        self.epoch = epoch
+        self.states = states
+        self.page_size = page_size
+        self.window_pages = window_pages
+        self.include_tasks = include_tasks
+        self.projects: typing.List[models.Project] = []
+        self.tasks: typing.Dict[str, typing.List[models.Task]] = {}
+        self.watermarks: typing.Dict[str, datetime.datetime] = dict(since or {})
+
+    async def time_entries(self) -> typing.AsyncIterator[models.TimeEntry]:
+        """Runs the sync, yielding time entries as they are fetched"""
+        queue: "asyncio.Queue[typing.Any]" = asyncio.Queue(maxsize=64)
+        done = object()
+
+        async def produce() -> None:
+            try:
+                await self._sync(queue)
+            except BaseException as exc:
+                await queue.put(exc)
+                raise
+            await queue.put(done)
+
+        producer = asyncio.ensure_future(produce())
+        try:
+            while True:
+                batch = await queue.get()
+                if batch is done:
+                    break
+                if isinstance(batch, BaseException):
+                    raise batch
+                for entry in batch:
+                    yield entry
+        finally:
+            if not producer.done():
+                producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+
+    async def _sync(self, queue: "asyncio.Queue[typing.Any]") -> None:
+        now = datetime.datetime.now(datetime.timezone.utc)
+        self.projects = []
+
+        async def add_projects(items: typing.List[models.Project]) -> None:
+            self.projects.extend(items)
+
+        await self._fetch_pages(
+            self._projects.list,
+            add_projects,
+            states=self.states if self.states is not None else type_utils.NOT_GIVEN,
+        )
+        await gather(
+            *(
+                self._sync_project(project.project_id, queue, now)
+                for project in self.projects
+                if project.project_id
+            )
+        )
+
+    async def _sync_project(
+        self,
+        project_id: str,
+        queue: "asyncio.Queue[typing.Any]",
+        now: datetime.datetime,
+    ) -> None:
+        seen: typing.Set[str] = set()
+        latest: typing.Optional[datetime.datetime] = None
+        tasks: typing.List[models.Task] = []
+
+        async def emit(items: typing.List[models.TimeEntry]) -> None:
+            nonlocal latest
+            fresh = []
+            for entry in items:
+                # inclusive window bounds can return an entry twice
+                if entry.time_entry_id is not None:
+                    if entry.time_entry_id in seen:
+                        continue
+                    seen.add(entry.time_entry_id)
+                if entry.date_utc:
+                    dated = parse_utc(entry.date_utc)
+                    if latest is None or dated > latest:
+                        latest = dated
+                fresh.append(entry)
+            if fresh:
+                await queue.put(fresh)
+
+        async def add_tasks(items: typing.List[models.Task]) -> None:
+            tasks.extend(items)
+
+        after = self.watermarks.get(project_id, self.start)
+        jobs = [self._sync_window(project_id, after, self.until, now, emit)]
+        if self.include_tasks:
+            jobs.append(
+                self._fetch_pages(
+                    self._projects.tasks.list, add_tasks, project_id=project_id
+                )
+            )
+        await gather(*jobs)
+        if self.include_tasks:
+            self.tasks[project_id] = tasks
+        if latest is not None:
+            self.watermarks[project_id] = latest
+
+    async def _sync_window(
+        self,
+        project_id: str,
+        after: typing.Optional[datetime.datetime],
+        before: typing.Optional[datetime.datetime],
+        now: datetime.datetime,
+        emit: _Emit,
+    ) -> None:
+        query: typing.Dict[str, typing.Any] = {"project_id": project_id}
+        if after is not None:
+            query["date_after_utc"] = format_utc(after)
+        if before is not None:
+            query["date_before_utc"] = format_utc(before)
+        pages = self._pages(self._projects.time.list, **query)
+        first = await pages.__anext__()
+        count = page_count(first)
+        lower = self.epoch if after is None else after
+        if (
+            count > self.window_pages
+            and (before or max(now, lower)) - lower >= _MIN_WINDOW * 2
+        ):
+            # the first page is dropped: its entries belong to arbitrary windows
+            await pages.aclose()
+            windows = _split(lower, before, now, math.ceil(count / self.window_pages))
+            if after is None:
+                windows[0] = (None, windows[0][1])
+            await gather(
+                *(self._sync_window(project_id, a, b, now, emit) for a, b in windows)
+            )
+            return
+        await emit(first.items or [])
+        async for page in pages:
+            await emit(page.items or [])
+
+    async def _fetch_pages(
+        self, fetch: Fetch, emit: _Emit, **query: typing.Any
+    ) -> None:
+        async for page in self._pages(fetch, **query):
+            await emit(page.items or [])
+
+    def _pages(
+        self, fetch: Fetch, **query: typing.Any
+    ) -> typing.AsyncGenerator[typing.Any, None]:
+        query["request_options"] = model_options(query.get("request_options"))
+        return paginate(
+            fetch,
+            window=self.limiter.max_concurrent,
+            ordered=False,
+            limiter=self.limiter,
+            xero_tenant_id=self.xero_tenant_id,
+            page_size=self.page_size,
+            **query,
+        )
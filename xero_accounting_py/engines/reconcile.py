@@ -0,0 +1,324 @@
+"""
+Indexed matching of bank statement lines to transactions, payments and
+invoices.
+"""
+
+import bisect
+import datetime
+import re
+import typing
+
+import typing_extensions
+
+from xero_accounting_py.core.rate_limit import RateLimiter
+from xero_accounting_py.engines._fetch import fetch_pages, gather
+from xero_accounting_py.engines._money import cents
+from xero_accounting_py.engines.dates import parse_date
+from xero_accounting_py.resources.accounting import AsyncAccountingClient
+from xero_accounting_py.types import models
+
+CandidateKind = typing_extensions.Literal["bank_transaction", "payment", "invoice"]
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+# payment types that put money into the bank account
+_MONEY_IN = {
+    "ACCRECPAYMENT",
+    "APCREDITPAYMENT",
+    "APOVERPAYMENTPAYMENT",
+    "APPREPAYMENTPAYMENT",
+}
+
+
+def tokens(*values: typing.Optional[str]) -> typing.FrozenSet[str]:
+    """
+    Normalizes free text into match tokens: lowercase alphanumeric runs of
+    at least three characters, or any run of digits without leading zeros.
+    """
+    found = set()
+    for value in values:
+        for token in _TOKEN.findall((value or "").lower()):
+            if token.isdigit():
+                found.add(token.lstrip("0") or "0")
+            elif len(token) >= 3:
+                found.add(token)
+    return frozenset(found)
+
+
+class StatementLine(typing.NamedTuple):
+    """A bank statement line to reconcile"""
+
+    line_id: str
+    date: datetime.date
+    amount: int  # cents, positive for money in
+    reference: str = ""
+    payee: str = ""
+
+
+class Candidate(typing.NamedTuple):
+    """A record a statement line can be reconciled against"""
+
+    kind: CandidateKind
+    record_id: str
+    date: int  # ordinal
+    amount: int  # cents, positive for money in
+    contact_id: str
+    tokens: typing.FrozenSet[str]
+
+
+class Match(typing.NamedTuple):
+    """A proposed reconciliation of one statement line"""
+
+    line: StatementLine
+    candidate: Candidate
+    score: float
+
+
+class ReconciliationMatcher:
+    """
+    Proposes matches between bank statement lines and unreconciled records.
+
+    Candidates are the unreconciled bank transactions and payments of a
+    bank account and the open invoices of the tenant, fetched with
+    `load()` (every list page concurrently) or fed with `update()`. They
+    are indexed by amount in cents, each amount's candidates sorted by
+    date, and by reference, number and contact name tokens, so a statement
+    line only looks at candidates with its exact amount, or sharing a
+    token, within `date_window` days. Invoices are dated by their due date.
+
+    Candidates are scored from 0 to 1: half for the amount (a quarter for
+    a partial payment of an invoice), up to 0.2 for date proximity and up
+    to 0.3 for the share of the line's tokens found on the candidate.
+    `propose()` assigns each line and candidate at most once, best scores
+    first, and drops pairs below `min_score`. Tokens on more than
+    `max_postings` candidates, like a common payee name, are not used to
+    find candidates but still count towards scores.
+
+    Usage:
+        matcher = ReconciliationMatcher()
+        await matcher.load(
+            client.accounting, xero_tenant_id=tenant_id, bank_account_id=account_id
+        )
+        matches = matcher.propose(lines)
+    """
+
+    def __init__(
+        self,
+        *,
+        date_window: int = 7,
+        min_score: float = 0.6,
+        max_postings: int = 50,
+    ):
+        self.date_window = date_window
+        self.min_score = min_score
+        self.max_postings = max_postings
+        self.candidates: typing.Dict[typing.Tuple[CandidateKind, str], Candidate] = {}
+        self._by_amount: typing.Optional[
+            typing.Dict[int, typing.Tuple[typing.List[int], typing.List[Candidate]]]
+        ] = None
+        self._by_token: typing.Dict[str, typing.List[Candidate]] = {}
+
+    async def load(
+        self,
+        accounting: AsyncAccountingClient,
+        *,
+        xero_tenant_id: str,
+        bank_account_id: typing.Optional[str] = None,
+        limiter: typing.Optional[RateLimiter] = None,
+        page_size: int = 1000,
+    ) -> None:
+        """Fetches the unreconciled records and open invoices of the tenant"""
+        query: typing.Dict[str, typing.Any] = {
+            "xero_tenant_id": xero_tenant_id,
+            "page_size": page_size,
+            "limiter": limiter or RateLimiter(),
+        }
+        where = 'IsReconciled==false&&Status=="AUTHORISED"'
+        if bank_account_id is not None:
+            bank_where = f'{where}&&BankAccount.AccountID==Guid("{bank_account_id}")'
+            payment_where = f'{where}&&Account.AccountID==Guid("{bank_account_id}")'
+        else:
+            bank_where = payment_where = where
+        bank_transactions, payments, invoices = await gather(
+            fetch_pages(accounting.bank_transactions.list, where=bank_where, **query),
+            fetch_pages(accounting.payments.list, where=payment_where, **query),
+            fetch_pages(accounting.invoices.list, statuses=["AUTHORISED"], **query),
+        )
+        self.update(
+            bank_transactions=[
+                t for page in bank_transactions for t in page.bank_transactions or []
+            ],
+            payments=[p for page in payments for p in page.payments or []],
+            invoices=[i for page in invoices for i in page.invoices or []],
+        )
+
+    def update(
+        self,
+        *,
+        bank_transactions: typing.Iterable[models.BankTransaction] = (),
+        payments: typing.Iterable[models.Payment] = (),
+        invoices: typing.Iterable[models.Invoice] = (),
+    ) -> None:
+        """Adds or replaces candidates, dropping reconciled or closed records"""
+        for transaction in bank_transactions:
+            sign = 1 if transaction.type_.startswith("RECEIVE") else -1
+            self._put(
+                "bank_transaction",
+                transaction.bank_transaction_id,
+                transaction.date,
+                sign * cents(transaction.total),
+                transaction.contact,
+                open_=transaction.status == "AUTHORISED"
+                and not transaction.is_reconciled,
+                text=(transaction.reference,),
+            )
+        for payment in payments:
+            sign = 1 if payment.payment_type in _MONEY_IN else -1
+            invoice = payment.invoice
+            self._put(
+                "payment",
+                payment.payment_id,
+                payment.date,
+                # bank_amount is in the bank account's currency
+                sign * cents(payment.bank_amount or payment.amount),
+                invoice.contact if invoice else None,
+                open_=payment.status == "AUTHORISED" and not payment.is_reconciled,
+                text=(payment.reference, invoice.invoice_number if invoice else None),
+            )
+        for invoice in invoices:
+            sign = 1 if invoice.type_ == "ACCREC" else -1
+            amount_due = cents(invoice.amount_due)
+            self._put(
+                "invoice",
+                invoice.invoice_id,
+                invoice.due_date or invoice.date,
+                sign * amount_due,
+                invoice.contact,
+                open_=invoice.status == "AUTHORISED" and amount_due > 0,
+                text=(invoice.invoice_number, invoice.reference),
+            )
+        self._by_amount = None
+
+    def _put(
+        self,
+        kind: CandidateKind,
+        record_id: typing.Optional[str],
+        date: typing.Optional[str],
+        amount: int,
+        contact: typing.Optional[models.Contact],
+        *,
+        open_: bool,
+        text: typing.Tuple[typing.Optional[str], ...],
+    ) -> None:
+        parsed = parse_date(date)
+        if record_id is None:
+            return
+        if not open_ or parsed is None or not amount:
+            self.candidates.pop((kind, record_id), None)
+            return
+        self.candidates[(kind, record_id)] = Candidate(
+            kind=kind,
+            record_id=record_id,
+            date=parsed.toordinal(),
+            amount=amount,
+            contact_id=(contact and contact.contact_id) or "",
+            tokens=tokens(*text, contact.name if contact else None),
+        )
+
+    def _index(
+        self,
+    ) -> typing.Dict[int, typing.Tuple[typing.List[int], typing.List[Candidate]]]:
+        if self._by_amount is None:
+            by_amount: typing.Dict[int, typing.List[Candidate]] = {}
+            by_token: typing.Dict[str, typing.List[Candidate]] = {}
+            for candidate in self.candidates.values():
+                by_amount.setdefault(candidate.amount, []).append(candidate)
+                for token in candidate.tokens:
+                    by_token.setdefault(token, []).append(candidate)
+            self._by_amount = {}
+            for amount, candidates in by_amount.items():
+                candidates.sort(key=lambda c: c.date)
+                self._by_amount[amount] = ([c.date for c in candidates], candidates)
+            self._by_token = {
+                token: candidates
+                for token, candidates in by_token.items()
+                if len(candidates) <= self.max_postings
+            }
+        return self._by_amount
+
+    def score(self, line: StatementLine, candidate: Candidate) -> float:
+        """Scores how well `candidate` explains `line`, from 0 to 1"""
+        return self._score(line, tokens(line.reference, line.payee), candidate)
+
+    def _score(
+        self,
+        line: StatementLine,
+        line_tokens: typing.FrozenSet[str],
+        candidate: Candidate,
+    ) -> float:
+        if candidate.amount == line.amount:
+            amount = 1.0
+        elif (
+            candidate.kind == "invoice"
+            and (candidate.amount > 0) == (line.amount > 0)
+            and abs(line.amount) < abs(candidate.amount)
+        ):
+            amount = 0.5
+        else:
+            amount = 0.0
+        days = abs(candidate.date - line.date.toordinal())
+        date = max(0.0, 1.0 - days / (self.date_window + 1))
+        reference = (
+            len(line_tokens & candidate.tokens) / len(line_tokens)
+            if line_tokens
+            else 0.0
+        )
+        return 0.5 * amount + 0.2 * date + 0.3 * reference
+
+    def candidates_for(self, line: StatementLine) -> typing.List[Candidate]:
+        """Returns the candidates within the date window of `line`"""
+        return self._candidates(line, tokens(line.reference, line.payee))
+
+    def _candidates(
+        self, line: StatementLine, line_tokens: typing.FrozenSet[str]
+    ) -> typing.List[Candidate]:
+        by_amount = self._index()
+        ordinal = line.date.toordinal()
+        low, high = ordinal - self.date_window, ordinal + self.date_window
+        found: typing.Dict[typing.Tuple[str, str], Candidate] = {}
+        bucket = by_amount.get(line.amount)
+        if bucket is not None:
+            dates, candidates = bucket
+            for candidate in candidates[
+                bisect.bisect_left(dates, low) : bisect.bisect_right(dates, high)
+            ]:
+                found[(candidate.kind, candidate.record_id)] = candidate
+        for token in line_tokens:
+            for candidate in self._by_token.get(token, ()):
+                if low <= candidate.date <= high:
+                    found[(candidate.kind, candidate.record_id)] = candidate
+        return list(found.values())
+
+    def propose(self, lines: typing.Iterable[StatementLine]) -> typing.List[Match]:
+        """
+        Returns the proposed reconciliation set, at most one match per line
+        and per candidate, best scores first.
+        """
+        scored = []
+        for line in lines:
+            line_tokens = tokens(line.reference, line.payee)
+            for candidate in self._candidates(line, line_tokens):
+                score = self._score(line, line_tokens, candidate)
+                if score >= self.min_score:
+                    scored.append(Match(line, candidate, score))
+        scored.sort(key=lambda m: (-m.score, m.line.line_id, m.candidate.record_id))
+        used_lines: typing.Set[str] = set()
+        used_candidates: typing.Set[typing.Tuple[str, str]] = set()
+        matches = []
+        for match in scored:
+            key = (match.candidate.kind, match.candidate.record_id)
+            if match.line.line_id in used_lines or key in used_candidates:
+                continue
+            used_lines.add(match.line.line_id)
+            used_candidates.add(key)
+            matches.append(match)
+        return matches
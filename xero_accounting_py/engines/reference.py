@@ -0,0 +1,298 @@
+"""
+Local indexes of a tenant's accounts, tax rates, tracking categories and
+items for resolving line items before they are sent.
+"""
+
+import datetime
+import typing
+
+from xero_accounting_py.core.rate_limit import RateLimiter
+from xero_accounting_py.engines._fetch import call, gather
+from xero_accounting_py.engines.dates import parse_utc, where_updated_since
+from xero_accounting_py.resources.accounting import AsyncAccountingClient
+from xero_accounting_py.types import models, params
+
+
+class ResolutionError(typing.NamedTuple):
+    """A line item field that could not be resolved"""
+
+    line: int  # position of the line item in the batch
+    field: str
+    message: str
+
+
+class Resolution(typing.NamedTuple):
+    """Resolved line items, in input order, and every problem found"""
+
+    line_items: typing.List[params.LineItem]
+    errors: typing.List[ResolutionError]
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+def _key(value: str) -> str:
+    return value.strip().casefold()
+
+
+class ReferenceData:
+    """
+    Resolves human-entered references in line items against local indexes
+    of one tenant's reference data.
+
+    `sync()` loads the accounts, tax rates, tracking categories, items and
+    enabled currencies concurrently into hash indexes. Later calls only
+    fetch accounts and items updated since the previous sync; the other
+    lists, which have no update timestamp, are fetched in full.
+
+    `resolve()` checks a whole batch of `params.LineItem`s locally and
+    returns them with ids filled in, so a batch can be rejected before any
+    write is sent:
+
+    - `account_code` (or `account_id`) must be an active account and is
+      completed with the other one
+    - `tax_type` may be a tax type or a tax rate name, and must be active
+    - tracking is given by category `name` and `option` names, matched
+      case-insensitively and completed with their ids
+    - `item_code` must exist; the item's sales (or purchase, with
+      `sales=False`) account, tax type, price and description fill in
+      fields the line item leaves out
+
+    Usage:
+        reference = ReferenceData()
+        await reference.sync(client.accounting, xero_tenant_id=tenant_id)
+        resolution = reference.resolve(line_items)
+        if not resolution.ok:
+            raise ValueError(resolution.errors)
+    """
+
+    def __init__(self) -> None:
+        self.updated_since: typing.Optional[datetime.datetime] = None
+        self.accounts: typing.Dict[str, models.Account] = {}  # by account id
+        self._account_codes: typing.Dict[str, str] = {}
+        self.tax_rates: typing.Dict[str, models.TaxRate] = {}  # by tax type
+        self._tax_names: typing.Dict[str, str] = {}
+        # category name -> (category, option name -> option)
+        self.tracking: typing.Dict[
+            str,
+            typing.Tuple[
+                models.TrackingCategory, typing.Dict[str, models.TrackingOption]
+            ],
+        ] = {}
+        self.items: typing.Dict[str, models.Item] = {}  # by code
+        self._item_codes: typing.Dict[str, str] = {}
+        self.currencies: typing.Set[str] = set()
+
+    async def sync(
+        self,
+        accounting: AsyncAccountingClient,
+        *,
+        xero_tenant_id: str,
+        limiter: typing.Optional[RateLimiter] = None,
+    ) -> None:
+        """Fetches the reference data changed since the last sync"""
+        limiter = limiter or RateLimiter()
+        changed: typing.Dict[str, typing.Any] = {}
+        if self.updated_since is not None:
+            changed["where"] = where_updated_since(self.updated_since)
+        accounts, tax_rates, tracking, items, currencies = await gather(
+            call(
+                limiter,
+                accounting.accounts.list,
+                xero_tenant_id=xero_tenant_id,
+                **changed,
+            ),
+            call(limiter, accounting.tax_rates.list, xero_tenant_id=xero_tenant_id),
+            call(
+                limiter,
+                accounting.tracking_categories.list,
+                xero_tenant_id=xero_tenant_id,
+                include_archived=True,
+            ),
+            call(
+                limiter,
+                accounting.items.list,
+                xero_tenant_id=xero_tenant_id,
+                **changed,
+            ),
+            call(limiter, accounting.currencies.list, xero_tenant_id=xero_tenant_id),
+        )
+        self.tax_rates.clear()
+        self._tax_names.clear()
+        self.tracking.clear()
+        self.currencies.clear()
+        self.update(
+            accounts=accounts.accounts or [],
+            tax_rates=tax_rates.tax_rates or [],
+            tracking_categories=tracking.tracking_categories or [],
+            items=items.items or [],
+            currencies=currencies.currencies or [],
+        )
+
+    def update(
+        self,
+        *,
+        accounts: typing.Iterable[models.Account] = (),
+        tax_rates: typing.Iterable[models.TaxRate] = (),
+        tracking_categories: typing.Iterable[models.TrackingCategory] = (),
+        items: typing.Iterable[models.Item] = (),
+        currencies: typing.Iterable[models.Currency] = (),
+    ) -> None:
+        """Adds or replaces reference records in the indexes"""
+        for account in accounts:
+            if account.account_id is None:
+                continue
+            self._seen(account.updated_date_utc)
+            previous_account = self.accounts.get(account.account_id)
+            if previous_account is not None and previous_account.code:
+                self._account_codes.pop(_key(previous_account.code), None)
+            self.accounts[account.account_id] = account
+            if account.code:
+                self._account_codes[_key(account.code)] = account.account_id
+        for tax_rate in tax_rates:
+            if tax_rate.tax_type is None:
+                continue
+            self.tax_rates[tax_rate.tax_type] = tax_rate
+            if tax_rate.name:
+                self._tax_names[_key(tax_rate.name)] = tax_rate.tax_type
+        for category in tracking_categories:
+            if not category.name:
+                continue
+            self.tracking[_key(category.name)] = (
+                category,
+                {_key(o.name): o for o in category.options or [] if o.name},
+            )
+        for item in items:
+            self._seen(item.updated_date_utc)
+            if item.item_id is not None:
+                previous_code = self._item_codes.pop(item.item_id, None)
+                if previous_code is not None:
+                    self.items.pop(previous_code, None)
+            if item.code:
+                self.items[_key(item.code)] = item
+                if item.item_id is not None:
+                    self._item_codes[item.item_id] = _key(item.code)
+        self.currencies.update(str(c.code) for c in currencies if c.code)
+
+    def _seen(self, updated_date_utc: typing.Optional[str]) -> None:
+        if updated_date_utc:
+            updated = parse_utc(updated_date_utc)
+            if self.updated_since is None or updated > self.updated_since:
+                self.updated_since = updated
+
+    def account(self, code: str) -> typing.Optional[models.Account]:
+        """Returns the account with `code`, ignoring case"""
+        account_id = self._account_codes.get(_key(code))
+        return None if account_id is None else self.accounts.get(account_id)
+
+    def tax_rate(self, tax_type_or_name: str) -> typing.Optional[models.TaxRate]:
+        """Returns the tax rate with a tax type or, failing that, a name"""
+        tax_rate = self.tax_rates.get(tax_type_or_name.strip())
+        if tax_rate is None:
+            tax_type = self._tax_names.get(_key(tax_type_or_name))
+            tax_rate = None if tax_type is None else self.tax_rates.get(tax_type)
+        return tax_rate
+
+    def resolve(
+        self, line_items: typing.Iterable[params.LineItem], *, sales: bool = True
+    ) -> Resolution:
+        """Resolves a batch of line items, collecting every problem"""
+        resolved: typing.List[params.LineItem] = []
+        errors: typing.List[ResolutionError] = []
+        for index, line_item in enumerate(line_items):
+            resolved.append(self._resolve(index, line_item, sales, errors))
+        return Resolution(resolved, errors)
+
+    def _resolve(
+        self,
+        index: int,
+        line_item: params.LineItem,
+        sales: bool,
+        errors: typing.List[ResolutionError],
+    ) -> params.LineItem:
+        result = typing.cast(params.LineItem, dict(line_item))
+
+        def error(field: str, message: str) -> None:
+            errors.append(ResolutionError(index, field, message))
+
+        item_code = line_item.get("item_code")
+        if item_code:
+            item = self.items.get(_key(item_code))
+            if item is None:
+                error("item_code", f"unknown item code {item_code!r}")
+            else:
+                result["item_code"] = item.code or item_code
+                details = item.sales_details if sales else item.purchase_details
+                if details is not None:
+                    if (
+                        "account_code" not in result
+                        and "account_id" not in result
+                        and details.account_code
+                    ):
+                        result["account_code"] = details.account_code
+                    if "tax_type" not in result and details.tax_type:
+                        result["tax_type"] = details.tax_type
+                    if "unit_amount" not in result and details.unit_price is not None:
+                        result["unit_amount"] = details.unit_price
+                description = item.description if sales else item.purchase_description
+                if "description" not in result and description:
+                    result["description"] = description
+
+        account: typing.Optional[models.Account] = None
+        if result.get("account_code"):
+            account = self.account(result["account_code"])
+            if account is None:
+                error(
+                    "account_code", f"unknown account code {result['account_code']!r}"
+                )
+        elif result.get("account_id"):
+            account = self.accounts.get(result["account_id"])
+            if account is None:
+                error("account_id", f"unknown account id {result['account_id']!r}")
+        if account is not None:
+            if account.status != "ACTIVE":
+                error("account_code", f"account {account.code!r} is archived")
+            if account.code:
+                result["account_code"] = account.code
+            if account.account_id:
+                result["account_id"] = account.account_id
+
+        if result.get("tax_type"):
+            tax_rate = self.tax_rate(result["tax_type"])
+            if tax_rate is None or tax_rate.tax_type is None:
+                error("tax_type", f"unknown tax type {result['tax_type']!r}")
+            else:
+                if tax_rate.status not in (None, "ACTIVE"):
+                    error("tax_type", f"tax rate {tax_rate.name!r} is not active")
+                result["tax_type"] = tax_rate.tax_type
+
+        tracking = []
+        for tracking_index, entry in enumerate(line_item.get("tracking") or []):
+            field = f"tracking[{tracking_index}]"
+            category_name = entry.get("name") or ""
+            indexed = self.tracking.get(_key(category_name))
+            if indexed is None:
+                error(field, f"unknown tracking category {category_name!r}")
+                continue
+            category, options = indexed
+            option = options.get(_key(entry.get("option") or ""))
+            if option is None:
+                error(
+                    field,
+                    f"unknown option {entry.get('option')!r} of {category.name!r}",
+                )
+                continue
+            if category.status != "ACTIVE" or option.status not in (None, "ACTIVE"):
+                error(field, f"{category.name}: {option.name} is archived")
+            tracking.append(
+                {
+                    "name": category.name or "",
+                    "option": option.name or "",
+                    "tracking_category_id": category.tracking_category_id or "",
+                    "tracking_option_id": option.tracking_option_id or "",
+                }
+            )
+        if "tracking" in line_item:
+            result["tracking"] = typing.cast(typing.Any, tracking)
+        return result
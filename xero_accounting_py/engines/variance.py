@@ -0,0 +1,325 @@
+"""
+Budget against actual variances, from budgets and the journal ledger.
+"""
+
+import datetime
+import typing
+
+from xero_accounting_py.core.rate_limit import RateLimiter
+from xero_accounting_py.core.request import DecodeMode
+from xero_accounting_py.engines import _reports
+from xero_accounting_py.engines._fetch import call, gather
+from xero_accounting_py.engines._money import cents, format_cents
+from xero_accounting_py.engines.accounts import PROFIT_AND_LOSS, SECTIONS
+from xero_accounting_py.engines.dates import format_report_date, month_date, month_index
+from xero_accounting_py.engines.ledger import Ledger
+from xero_accounting_py.resources.accounting import AsyncAccountingClient
+from xero_accounting_py.types import models
+
+# sections whose balances are credits; they are reported positive, like budgets
+_CREDIT_SECTIONS = {"Revenue", "Liabilities", "Equity"}
+
+
+class VarianceTable(typing.NamedTuple):
+    """Budgeted and actual amounts of one budget per account and month, in cents"""
+
+    budget_id: str
+    months: typing.List[datetime.date]  # first day of each month
+    account_ids: typing.List[str]
+    budget: typing.List[typing.List[int]]  # a row per account, a value per month
+    actual: typing.List[typing.List[int]]
+
+    @property
+    def variance(self) -> typing.List[typing.List[int]]:
+        """Actual less budget, per account and month"""
+        return [
+            [a - b for a, b in zip(actual, budget)]
+            for actual, budget in zip(self.actual, self.budget)
+        ]
+
+
+class _Budget(typing.NamedTuple):
+    budget_id: str
+    description: str
+    tracking_option_id: str  # "" for overall budgets
+    lines: typing.Dict[str, typing.Dict[int, int]]  # account id -> month -> cents
+    codes: typing.Dict[str, str]  # account id -> code
+
+
+def _period(value: typing.Optional[str]) -> typing.Optional[int]:
+    """Returns the month index of a budget period like "2024-07" """
+    try:
+        year, month = (value or "").split("-")[:2]
+        return month_index(datetime.date(int(year), int(month), 1))
+    except ValueError:
+        return None
+
+
+class VarianceEngine:
+    """
+    Compares every budget of a tenant with the actuals of its journals.
+
+    `load()` fetches the budgets and their lines for a date range, one call
+    per budget, concurrently with an incremental sync of `ledger`; budgets
+    can also be fed with `update()`. Once loaded, `refresh()` only applies
+    the journals posted since, so variances stay current without fetching
+    budgets or reports again.
+
+    `variances()` aligns each budget with the ledger by account and calendar
+    month into dense tables. Tracking budgets are compared with the actuals
+    of their tracking option (the first, when a budget has two). Actuals
+    are read once per account and option for all budgets, from the month
+    boundary balances of the ledger. Revenue, liability and equity actuals
+    are credits and reported positive, like their budgets, so a positive
+    variance is income over budget or spending over budget. Profit and loss
+    accounts with actuals but no budget line are included with a zero
+    budget.
+
+    Usage:
+        engine = VarianceEngine()
+        await engine.load(
+            client.accounting,
+            xero_tenant_id=tenant_id,
+            date_from=datetime.date(2024, 7, 1),
+            date_to=datetime.date(2025, 6, 30),
+        )
+        tables = engine.variances(datetime.date(2024, 7, 1))
+        await engine.refresh(client.accounting, xero_tenant_id=tenant_id)
+    """
+
+    def __init__(self, ledger: typing.Optional[Ledger] = None):
+        self.ledger = ledger or Ledger()
+        self.budgets: typing.Dict[str, _Budget] = {}
+
+    async def load(
+        self,
+        accounting: AsyncAccountingClient,
+        *,
+        xero_tenant_id: str,
+        date_from: datetime.date,
+        date_to: datetime.date,
+        limiter: typing.Optional[RateLimiter] = None,
+    ) -> None:
+        """Fetches the budgets' lines between two dates and syncs the ledger"""
+        limiter = limiter or RateLimiter()
+
+        async def budgets() -> typing.List[models.Budget]:
+            listed = await call(
+                limiter, accounting.budgets.list, xero_tenant_id=xero_tenant_id
+            )
+            responses = await gather(
+                *(
+                    call(
+                        limiter,
+                        accounting.budgets.get,
+                        budget_id=budget.budget_id,
+                        xero_tenant_id=xero_tenant_id,
+                        date_from=date_from.isoformat(),
+                        date_to=date_to.isoformat(),
+                    )
+                    for budget in listed.budgets or []
+                    if budget.budget_id
+                )
+            )
+            return [b for response in responses for b in response.budgets or []]
+
+        fetched, _ = await gather(
+            budgets(),
+            self.ledger.sync(
+                accounting, xero_tenant_id=xero_tenant_id, limiter=limiter
+            ),
+        )
+        self.update(fetched)
+
+    async def refresh(
+        self,
+        accounting: AsyncAccountingClient,
+        *,
+        xero_tenant_id: str,
+        limiter: typing.Optional[RateLimiter] = None,
+    ) -> int:
+        """Applies the journals posted since the last sync, returning how many"""
+        return await self.ledger.sync(
+            accounting, xero_tenant_id=xero_tenant_id, limiter=limiter
+        )
+
+    def update(self, budgets: typing.Iterable[models.Budget]) -> None:
+        """Adds or replaces budgets"""
+        for budget in budgets:
+            if budget.budget_id is None:
+                continue
+            option = next(
+                (
+                    t.tracking_option_id
+                    for t in budget.tracking or []
+                    if t.tracking_option_id
+                ),
+                "",
+            )
+            lines: typing.Dict[str, typing.Dict[int, int]] = {}
+            codes: typing.Dict[str, str] = {}
+            for line in budget.budget_lines or []:
+                if not line.account_id:
+                    continue
+                codes[line.account_id] = line.account_code or ""
+                months = lines.setdefault(line.account_id, {})
+                for balance in line.budget_balances or []:
+                    month = _period(balance.period)
+                    if month is not None:
+                        months[month] = months.get(month, 0) + cents(balance.amount)
+            self.budgets[budget.budget_id] = _Budget(
+                budget_id=budget.budget_id,
+                description=budget.description or "",
+                tracking_option_id=option,
+                lines=lines,
+                codes=codes,
+            )
+
+    def _section(self, account_id: str) -> str:
+        account = self.ledger.accounts.get(account_id)
+        return SECTIONS.get(account.account_type, "") if account else ""
+
+    def variances(
+        self,
+        start: datetime.date,
+        *,
+        months: int = 12,
+        budget_ids: typing.Optional[typing.Iterable[str]] = None,
+    ) -> typing.Dict[str, VarianceTable]:
+        """
+        Returns a table per budget for the calendar months from the month
+        of `start`, with accounts ordered by code.
+        """
+        first = month_index(start)
+        # the day before each month, and the last day of the last month
+        bounds = [
+            month_date(first + month, 1) - datetime.timedelta(days=1)
+            for month in range(months + 1)
+        ]
+        actuals: typing.Dict[typing.Tuple[str, str], typing.List[int]] = {}
+
+        def actual(account_id: str, option: str) -> typing.List[int]:
+            row = actuals.get((account_id, option))
+            if row is None:
+                sign = -1 if self._section(account_id) in _CREDIT_SECTIONS else 1
+                balances = [
+                    self.ledger.balance(account_id, day, tracking_option_id=option)
+                    for day in bounds
+                ]
+                row = actuals[(account_id, option)] = [
+                    sign * (after - before)
+                    for before, after in zip(balances, balances[1:])
+                ]
+            return row
+
+        selected = self.budgets if budget_ids is None else budget_ids
+        tables = {}
+        for budget_id in selected:
+            budget = self.budgets[budget_id]
+            accounts = set(budget.lines)
+            accounts.update(
+                account_id
+                for account_id in self.ledger.accounts
+                if self._section(account_id) in PROFIT_AND_LOSS
+                and any(actual(account_id, budget.tracking_option_id))
+            )
+            ordered = sorted(accounts, key=lambda a: (self._code(budget, a), a))
+            tables[budget_id] = VarianceTable(
+                budget_id=budget_id,
+                months=[month_date(first + month, 1) for month in range(months)],
+                account_ids=ordered,
+                budget=[
+                    [
+                        budget.lines.get(account_id, {}).get(first + month, 0)
+                        for month in range(months)
+                    ]
+                    for account_id in ordered
+                ],
+                actual=[
+                    list(actual(account_id, budget.tracking_option_id))
+                    for account_id in ordered
+                ],
+            )
+        return tables
+
+    def _code(self, budget: _Budget, account_id: str) -> str:
+        account = self.ledger.accounts.get(account_id)
+        return (account and account.code) or budget.codes.get(account_id, "")
+
+    def report(
+        self,
+        budget_id: str,
+        start: datetime.date,
+        *,
+        months: int = 12,
+        decode: DecodeMode = "model",
+    ) -> models.ReportWithRows:
+        """
+        Returns the budget variance of one budget over `months` months as a
+        report: a section per account class, with budget, actual, variance
+        and variance percentage columns and a total per section.
+        """
+        table = self.variances(start, months=months, budget_ids=[budget_id])[budget_id]
+        budget = self.budgets[budget_id]
+        sections: typing.Dict[str, typing.List[_reports.Json]] = {
+            title: []
+            for title in (
+                "Revenue",
+                "Expenses",
+                "Assets",
+                "Liabilities",
+                "Equity",
+                "Other",
+            )
+        }
+        totals = {title: [0, 0] for title in sections}
+        for account_id, budgeted, actual in zip(
+            table.account_ids, table.budget, table.actual
+        ):
+            account = self.ledger.accounts.get(account_id)
+            code = self._code(budget, account_id)
+            name = account.name if account else ""
+            label = f"{name} ({code})" if name and code else name or code or account_id
+            title = self._section(account_id) or "Other"
+            values = [sum(budgeted), sum(actual)]
+            totals[title] = [a + b for a, b in zip(totals[title], values)]
+            attributes = [_reports.attribute("account", account_id)]
+            sections[title].append(
+                _reports.row(
+                    [_reports.cell(label, attributes)]
+                    + [_reports.cell(v, attributes) for v in _columns(*values)]
+                )
+            )
+        rows = [
+            _reports.header(["Account", "Budget", "Actual", "Variance", "Variance %"])
+        ]
+        for title, section_rows in sections.items():
+            if not section_rows:
+                continue
+            section_rows.append(
+                _reports.row(
+                    [_reports.cell(f"Total {title}")]
+                    + [_reports.cell(v) for v in _columns(*totals[title])],
+                    row_type="SummaryRow",
+                )
+            )
+            rows.append(_reports.section(section_rows, title=title))
+        end = month_date(month_index(start) + months, 1) - datetime.timedelta(days=1)
+        return _reports.report(
+            report_id="BudgetVariance",
+            name="Budget Variance",
+            titles=[
+                "Budget Variance",
+                budget.description,
+                f"{format_report_date(table.months[0])} to {format_report_date(end)}",
+            ],
+            date=format_report_date(end),
+            rows=rows,
+            decode=decode,
+        )
+
+
+def _columns(budget: int, actual: int) -> typing.List[str]:
+    variance = actual - budget
+    percent = f"{variance / abs(budget) * 100:.1f}" if budget else ""
+    return [format_cents(budget), format_cents(actual), format_cents(variance), percent]
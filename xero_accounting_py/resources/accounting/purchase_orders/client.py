@@ -8,9 +8,9 @@ from make_api_request import (
     SyncBaseClient,
     default_request_options,
     encode_query_param,
-    to_encodable,
     type_utils,
 )
+from xero_accounting_py.core import to_encodable
 from xero_accounting_py.resources.accounting.purchase_orders.attachments import (
     AsyncAttachmentsClient,
     AttachmentsClient,
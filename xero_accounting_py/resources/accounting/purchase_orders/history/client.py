@@ -5,9 +5,9 @@ from make_api_request import (
     RequestOptions,
     SyncBaseClient,
     default_request_options,
-    to_encodable,
     type_utils,
 )
+from xero_accounting_py.core import to_encodable
 from xero_accounting_py.types import models, params
 
 